@@ -194,7 +194,7 @@ from comtypes._memberspec import (  # noqa
 ################################################################
 # IUnknown, the root of all evil...
 from comtypes._post_coinit import _shutdown
-from comtypes._post_coinit.unknwn import IUnknown  # noqa
+from comtypes._post_coinit.unknwn import IUnknown, enable_qi_cache  # noqa
 
 atexit.register(_shutdown)
 
@@ -244,6 +244,7 @@ from comtypes._post_coinit.misc import (  # noqa
     _SOLE_AUTHENTICATION_LIST,
     SOLE_AUTHENTICATION_LIST,
     CoCreateInstanceEx,
+    CoCreateInstanceMultiQI,
 )
 
 
@@ -277,8 +278,8 @@ __known_symbols__ = [
     "CLSCTX_RESERVED3", "CLSCTX_RESERVED4", "CLSCTX_RESERVED5",
     "CLSCTX_SERVER", "_COAUTHIDENTITY", "COAUTHIDENTITY", "_COAUTHINFO",
     "COAUTHINFO", "CoClass", "CoCreateInstance", "CoCreateInstanceEx",
-    "_CoGetClassObject", "CoGetClassObject", "CoGetObject",
-    "COINIT_APARTMENTTHREADED", "COINIT_DISABLE_OLE1DDE",
+    "CoCreateInstanceMultiQI", "_CoGetClassObject", "CoGetClassObject",
+    "CoGetObject", "COINIT_APARTMENTTHREADED", "COINIT_DISABLE_OLE1DDE",
     "COINIT_MULTITHREADED", "COINIT_SPEED_OVER_MEMORY", "CoInitialize",
     "CoInitializeEx", "COMError", "COMMETHOD", "COMObject", "_COSERVERINFO",
     "COSERVERINFO", "CoUninitialize", "dispid", "DISPMETHOD", "DISPPROPERTY",
@@ -1,5 +1,7 @@
 import logging
 import queue
+import sys
+import weakref
 from _ctypes import COMError, CopyComPointer
 from collections.abc import Callable, Sequence
 from ctypes import (
@@ -7,11 +9,13 @@ from ctypes import (
     FormatError,
     OleDLL,
     WinDLL,
+    addressof,
     byref,
     c_long,
     c_void_p,
     c_wchar_p,
     pointer,
+    string_at,
 )
 from ctypes.wintypes import INT, LONG, LPVOID, UINT, ULONG, WORD
 from typing import TYPE_CHECKING, Any, ClassVar, Optional, TypeVar
@@ -19,11 +23,20 @@ from typing import Union as _UnionT
 
 import comtypes
 from comtypes import GUID, IPersist, IUnknown, _CoUninitialize, hresult
+from comtypes._dispinfo import get_dispnames, get_ids_of_names, get_typeinfo
 from comtypes._memberspec import DISPATCH_METHOD as DISPATCH_METHOD
 from comtypes._memberspec import DISPATCH_PROPERTYGET as DISPATCH_PROPERTYGET
 from comtypes._memberspec import DISPATCH_PROPERTYPUT as DISPATCH_PROPERTYPUT
 from comtypes._memberspec import DISPATCH_PROPERTYPUTREF as DISPATCH_PROPERTYPUTREF
-from comtypes._vtbl import _MethodFinder, create_dispimpl, create_vtbl_mapping
+from comtypes._vtbl import (
+    DispParamsError,
+    _MethodFinder,
+    compile_dispparams,
+    create_dispimpl,
+    create_vtbl_mapping,
+    get_vtbl_template,
+    register_this,
+)
 from comtypes.automation import DISPID, DISPPARAMS, EXCEPINFO, VARIANT
 from comtypes.errorinfo import ISupportErrorInfo
 from comtypes.typeinfo import (
@@ -37,6 +50,8 @@ if TYPE_CHECKING:
     from ctypes import _CArgObject, _Pointer
 
     from comtypes import hints  # type: ignore
+    from comtypes.server.leaks import LeakTracker
+    from comtypes.server.metrics import MethodMetrics
 
 logger = logging.getLogger(__name__)
 _debug = logger.debug
@@ -195,6 +210,12 @@ class InprocServer:
 
 _T_IUnknown = TypeVar("_T_IUnknown", bound=IUnknown)
 
+# Maps COMObject subclasses to {binary interface id: slot} dictionaries, the
+# slots are the indexes of the interface pointers of the instances.
+_iid_slots: "weakref.WeakKeyDictionary[type, dict[bytes, int]]" = (
+    weakref.WeakKeyDictionary()
+)
+
 
 class COMObject:
     _com_interfaces_: ClassVar[list[type[IUnknown]]]
@@ -202,8 +223,16 @@ class COMObject:
     _instances_: ClassVar[dict["COMObject", None]] = {}
     _reg_clsid_: ClassVar[GUID]
     _reg_typelib_: ClassVar[tuple[str, int, int]]
+    # Assign a 'comtypes.server.metrics.MethodMetrics' instance to record
+    # the calls of the COM methods.
+    _com_metrics_: ClassVar[Optional["MethodMetrics"]] = None
+    # Assign a 'comtypes.server.leaks.LeakTracker' instance to record where
+    # the instances are created.
+    _com_leak_tracker_: ClassVar[Optional["LeakTracker"]] = None
     __typelib: "hints.ITypeLib"
     _com_pointers_: dict[GUID, "hints.LP_LP_Vtbl"]
+    __iid_slots: dict[bytes, int]
+    __interface_pointers: list["hints.LP_LP_Vtbl"]
     _dispimpl_: dict[tuple[comtypes.dispid, int], Callable[..., Any]]
 
     def __new__(cls, *args: Any, **kw: Any) -> "hints.Self":
@@ -214,6 +243,8 @@ class COMObject:
             return self  # type: ignore
         if hasattr(self, "_com_interfaces_"):
             self.__prepare_comobject()
+            if cls._com_leak_tracker_ is not None:
+                cls._com_leak_tracker_.track(self, sys._getframe(1))
         return self  # type: ignore
 
     def __prepare_comobject(self) -> None:
@@ -256,14 +287,40 @@ class COMObject:
                 interfaces += (IPersist,)
         for itf in interfaces[::-1]:
             self.__make_interface_pointer(itf)
+        # IUnknown_QueryInterface looks up the interface pointers by the
+        # raw bytes of the requested iid, which are hashed and compared
+        # without calling into Python code.  The slots only depend on the
+        # class, so they are computed for the first instance.
+        cls = type(self)
+        iid_slots = _iid_slots.get(cls)
+        if iid_slots is None:
+            iid_slots = {bytes(iid): i for i, iid in enumerate(self._com_pointers_)}
+            _iid_slots[cls] = iid_slots
+        self.__iid_slots = iid_slots
+        self.__interface_pointers = list(self._com_pointers_.values())
 
     def __make_interface_pointer(self, itf: type[IUnknown]) -> None:
-        finder = self._get_method_finder_(itf)
-        iids, vtbl = create_vtbl_mapping(itf, finder)
-        for iid in iids:
-            self._com_pointers_[iid] = pointer(pointer(vtbl))
-        if hasattr(itf, "_disp_methods_"):
-            self._dispimpl_ = create_dispimpl(itf, finder)
+        cls = type(self)
+        template = None
+        # The virtual function tables are built once per class and interface,
+        # unless the subclass customizes how the methods are found.
+        if cls._get_method_finder_ is COMObject._get_method_finder_:
+            template = get_vtbl_template(cls, itf)
+        if template is None:
+            iids, vtbl = create_vtbl_mapping(itf, self._get_method_finder_(itf))
+            for iid in iids:
+                self._com_pointers_[iid] = pointer(pointer(vtbl))
+        else:
+            iids, vtbl = template
+            for iid in iids:
+                lpvtbl = pointer(vtbl)
+                # the address of 'lpvtbl' is the 'this' pointer of the calls.
+                register_this(addressof(lpvtbl), self)
+                self._com_pointers_[iid] = pointer(lpvtbl)
+        # Classes may share a _dispimpl_ for all instances, like the event
+        # sinks of comtypes.client.GetEvents.
+        if hasattr(itf, "_disp_methods_") and "_dispimpl_" not in vars(cls):
+            self._dispimpl_ = create_dispimpl(itf, self._get_method_finder_(itf))
 
     def _get_method_finder_(self, itf: type[IUnknown]) -> _MethodFinder:
         # This method can be overridden to customize how methods are found.
@@ -350,6 +407,8 @@ class COMObject:
             self.__unkeep__(self)
             # Hm, why isn't this cleaned up by the cycle gc?
             self._com_pointers_ = {}
+            self.__iid_slots = {}
+            self.__interface_pointers = []
         return result
 
     def IUnknown_QueryInterface(
@@ -358,16 +417,21 @@ class COMObject:
         riid: "_Pointer[GUID]",
         ppvObj: _UnionT[c_void_p, "_CArgObject"],
         _debug=_debug,
+        _isEnabledFor=logger.isEnabledFor,
     ) -> int:
-        # XXX This is probably too slow.
-        # riid[0].hashcode() alone takes 33 us!
-        iid = riid[0]
-        ptr = self._com_pointers_.get(iid, None)
-        if ptr is not None:
+        if not riid:
+            return hresult.E_POINTER
+        # The slots contain all interfaces of the class, so interfaces that
+        # are not implemented (clients probe for IMarshal, IProvideClassInfo
+        # and so on) are rejected by the same lookup.
+        slot = self.__iid_slots.get(string_at(riid, 16))
+        if slot is not None:
+            if _isEnabledFor(logging.DEBUG):
+                _debug("%r.QueryInterface(%s) -> S_OK", self, riid[0])
             # CopyComPointer(src, dst) calls AddRef!
-            _debug("%r.QueryInterface(%s) -> S_OK", self, iid)
-            return CopyComPointer(ptr, ppvObj)
-        _debug("%r.QueryInterface(%s) -> E_NOINTERFACE", self, iid)
+            return CopyComPointer(self.__interface_pointers[slot], ppvObj)
+        if _isEnabledFor(logging.DEBUG):
+            _debug("%r.QueryInterface(%s) -> E_NOINTERFACE", self, riid[0])
         return hresult.E_NOINTERFACE
 
     def QueryInterface(self, interface: type[_T_IUnknown]) -> _T_IUnknown:
@@ -393,7 +457,7 @@ class COMObject:
     def ISupportErrorInfo_InterfaceSupportsErrorInfo(
         self, this: Any, riid: "_Pointer[GUID]"
     ) -> int:
-        if riid[0] in self._com_pointers_:
+        if riid and string_at(riid, 16) in self.__iid_slots:
             return hresult.S_OK
         return hresult.S_FALSE
 
@@ -423,13 +487,15 @@ class COMObject:
         iid = self._com_interfaces_[0]._iid_
         return self.__typelib.GetTypeInfoOfGuid(iid)
 
+    # Without a type library, the names and the type information are
+    # generated from the members of a dispinterface declared in Python.
     def IDispatch_GetTypeInfoCount(self):
         try:
             self.__typelib
         except AttributeError:
-            return 0
-        else:
-            return 1
+            if get_dispnames(self._com_interfaces_[0]) is None:
+                return 0
+        return 1
 
     def IDispatch_GetTypeInfo(self, this, itinfo, lcid, ptinfo):
         if itinfo != 0:
@@ -438,16 +504,24 @@ class COMObject:
             ptinfo[0] = self.__typeinfo
             return hresult.S_OK
         except AttributeError:
+            pass
+        interface = self._com_interfaces_[0]
+        if get_dispnames(interface) is None:
             return hresult.E_NOTIMPL
+        ptinfo[0] = get_typeinfo(interface)
+        return hresult.S_OK
 
     def IDispatch_GetIDsOfNames(self, this, riid, rgszNames, cNames, lcid, rgDispId):
-        # This call uses windll instead of oledll so that a failed
-        # call to DispGetIDsOfNames will return a HRESULT instead of
-        # raising an error.
         try:
             tinfo = self.__typeinfo
         except AttributeError:
-            return hresult.E_NOTIMPL
+            names = get_dispnames(self._com_interfaces_[0])
+            if names is None:
+                return hresult.E_NOTIMPL
+            return get_ids_of_names(names, rgszNames, cNames, rgDispId)
+        # This call uses windll instead of oledll so that a failed
+        # call to DispGetIDsOfNames will return a HRESULT instead of
+        # raising an error.
         return _DispGetIDsOfNames(tinfo, rgszNames, cNames, rgDispId)
 
     def IDispatch_Invoke(
@@ -499,46 +573,30 @@ class COMObject:
         # Unpack the parameters: It would be great if we could use the
         # DispGetParam function - but we cannot since it requires that
         # we pass a VARTYPE for each argument and we do not know that.
-        #
-        # Seems that n arguments have dispids (0, 1, ..., n-1).
-        # Unnamed arguments are packed into the DISPPARAMS array in
-        # reverse order (starting with the highest dispid), named
-        # arguments are packed in the order specified by the
-        # rgdispidNamedArgs array.
-        #
-        params = pDispParams[0]
+        # Instead, the unpacker compiled for the implementation converts
+        # the VARIANTs into the Python arguments.
+        unpack = getattr(mth, "unpack_dispparams", None)
+        if unpack is None:
+            # a _dispimpl_ entry that was created without unpacker.
+            unpack = compile_dispparams(None, wFlags)
+        try:
+            args = unpack(pDispParams[0])
+        except DispParamsError as err:
+            (hr, argerr) = err.args
+            if argerr is not None and puArgErr:
+                puArgErr[0] = argerr
+            return hr
 
         if wFlags & (DISPATCH_PROPERTYPUT | DISPATCH_PROPERTYPUTREF):
-            # How are the parameters unpacked for propertyput
-            # operations with additional parameters?  Can propput
-            # have additional args?
-            args = [
-                params.rgvarg[i].value for i in reversed(list(range(params.cNamedArgs)))
-            ]
             # MSDN: pVarResult is ignored if DISPATCH_PROPERTYPUT or
             # DISPATCH_PROPERTYPUTREF is specified.
             return mth(this, *args)
-
-        else:  # wFlags & (DISPATCH_METHOD | DISPATCH_PROPERTYGET)
-            # the positions of named arguments
-            #
-            # 2to3 has problems to translate 'range(...)[::-1]'
-            # correctly, so use 'list(range)[::-1]' instead (will be
-            # fixed in Python 3.1, probably):
-            named_indexes = [
-                params.rgdispidNamedArgs[i] for i in range(params.cNamedArgs)
-            ]
-            # the positions of unnamed arguments
-            num_unnamed = params.cArgs - params.cNamedArgs
-            unnamed_indexes = list(reversed(list(range(num_unnamed))))
-            # It seems that this code calculates the indexes of the
-            # parameters in the params.rgvarg array correctly.
-            indexes = named_indexes + unnamed_indexes
-            args = [params.rgvarg[i].value for i in indexes]
-
-            if pVarResult and getattr(mth, "has_outargs", False):
-                args.append(pVarResult)
-            return mth(this, *args)
+        # The implementation stores the result directly into pVarResult.
+        # If the caller is not interested in the result, it needs a place
+        # to store it anyway.
+        if getattr(mth, "has_outargs", False):
+            args.append(pVarResult if pVarResult else [None])
+        return mth(this, *args)
 
     ################################################################
     # IPersist interface
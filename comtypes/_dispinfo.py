@@ -0,0 +1,217 @@
+"""Name lookup and type information for dispinterfaces that are declared in
+Python with DISPMETHOD and DISPPROPERTY, so that COMObject instances can
+implement IDispatch without a registered type library.
+"""
+
+import weakref
+from collections.abc import Iterator
+from ctypes import byref
+from typing import TYPE_CHECKING, Any, Optional
+
+from comtypes import IUnknown, hresult
+from comtypes._memberspec import (
+    _NOTHING,
+    PARAMFLAG_FIN,
+    PARAMFLAG_FOPT,
+    _encode_idl,
+    _unpack_argspec,
+)
+from comtypes.automation import (
+    BSTR,
+    DISPID_UNKNOWN,
+    VT_DISPATCH,
+    VT_UNKNOWN,
+    VT_VARIANT,
+    VT_VOID,
+    IDispatch,
+    _ctype_to_vartype,
+)
+from comtypes.typeinfo import (
+    CC_STDCALL,
+    ELEMDESC,
+    FUNC_DISPATCH,
+    FUNCDESC,
+    INVOKE_FUNC,
+    INVOKE_PROPERTYGET,
+    INVOKE_PROPERTYPUT,
+    INVOKE_PROPERTYPUTREF,
+    TKIND_DISPATCH,
+    CreateTypeLib,
+    ITypeInfo,
+    LoadTypeLibEx,
+)
+
+if TYPE_CHECKING:
+    from ctypes import _Pointer
+
+    from comtypes._memberspec import _DispMemberSpec
+
+# The DISPID of a member, and the positions of its parameters, by lower case
+# names.
+_DispNames = dict[str, tuple[int, dict[str, int]]]
+# The (vartype, paramflags, name) of the parameters of a function.
+_FuncParams = list[tuple[int, int, Optional[str]]]
+
+_dispnames: "weakref.WeakKeyDictionary[type, _DispNames]" = weakref.WeakKeyDictionary()
+_typeinfos: "weakref.WeakKeyDictionary[type, ITypeInfo]" = weakref.WeakKeyDictionary()
+
+
+def _disp_members(itf: type[IUnknown]) -> list["_DispMemberSpec"]:
+    # The members of the dispinterface and of the dispinterfaces it derives
+    # from, base members first.
+    members = []
+    for interface in itf.__mro__[-2::-1]:
+        members.extend(interface.__dict__.get("_disp_methods_", ()))
+    return members
+
+
+def get_dispnames(itf: type[IUnknown]) -> Optional[_DispNames]:
+    """Return the map of lower case names to DISPIDs for the members of
+    `itf`, or None if it is not a dispinterface.
+    """
+    try:
+        return _dispnames[itf]
+    except KeyError:
+        pass
+    if not hasattr(itf, "_disp_methods_"):
+        return None
+    names: _DispNames = {}
+    for m in _disp_members(itf):
+        params = {}
+        for i, spec in enumerate(m.argspec):
+            _, _, name, _ = _unpack_argspec(*spec)
+            if name:
+                params[name.lower()] = i
+        # 'propget' and 'propput' methods share the name and the DISPID.
+        names.setdefault(m.name.lower(), (m.memid, params))
+    _dispnames[itf] = names
+    return names
+
+
+def get_ids_of_names(
+    names: _DispNames,
+    rgszNames: "_Pointer[Any]",
+    cNames: int,
+    rgDispId: "_Pointer[Any]",
+) -> int:
+    """Implementation of IDispatch::GetIDsOfNames with the map returned by
+    `get_dispnames`.  The first name is the member name, the other ones are
+    the names of its parameters.
+    """
+    if cNames < 1:
+        return hresult.S_OK
+    name = rgszNames[0]
+    member = names.get(name.lower()) if name else None
+    if member is None:
+        memid, params, hr = DISPID_UNKNOWN, {}, hresult.DISP_E_UNKNOWNNAME
+    else:
+        (memid, params), hr = member, hresult.S_OK
+    rgDispId[0] = memid
+    for i in range(1, cNames):
+        name = rgszNames[i]
+        index = params.get(name.lower()) if name else None
+        if index is None:
+            rgDispId[i] = DISPID_UNKNOWN
+            hr = hresult.DISP_E_UNKNOWNNAME
+        else:
+            rgDispId[i] = index
+    return hr
+
+
+def _vartype(typ: Any) -> int:
+    try:
+        return _ctype_to_vartype[typ]
+    except (KeyError, TypeError):
+        pass
+    itf = getattr(typ, "_type_", None)
+    if isinstance(itf, type) and issubclass(itf, IDispatch):
+        return VT_DISPATCH
+    if isinstance(itf, type) and issubclass(itf, IUnknown):
+        return VT_UNKNOWN
+    if typ is str:
+        return _ctype_to_vartype[BSTR]
+    # Python types like 'int' in the declarations are passed as VARIANTs.
+    return VT_VARIANT
+
+
+def _add_funcdesc(
+    ctinfo: Any,
+    index: int,
+    memid: int,
+    invkind: int,
+    name: str,
+    params: _FuncParams,
+    restype: Any,
+) -> None:
+    elemdescs = (ELEMDESC * len(params))()
+    for elemdesc, (vt, flags, _) in zip(elemdescs, params):
+        elemdesc.tdesc.vt = vt
+        elemdesc._.paramdesc.wParamFlags = flags
+    fd = FUNCDESC()
+    fd.memid = memid
+    fd.lprgelemdescParam = elemdescs
+    fd.funckind = FUNC_DISPATCH
+    fd.invkind = invkind
+    fd.callconv = CC_STDCALL
+    fd.cParams = len(params)
+    fd.cParamsOpt = len([p for p in params if p[1] & PARAMFLAG_FOPT])
+    fd.elemdescFunc.tdesc.vt = VT_VOID if restype is None else _vartype(restype)
+    ctinfo.AddFuncDesc(index, byref(fd))
+    if invkind in (INVOKE_PROPERTYPUT, INVOKE_PROPERTYPUTREF):
+        # the new value of a property has no name.
+        params = params[:-1]
+    names = [name] + [pname or f"arg{i}" for i, (_, _, pname) in enumerate(params)]
+    ctinfo.SetFuncAndParamNames(index, *names)
+
+
+def _iter_funcs(m: "_DispMemberSpec") -> Iterator[tuple[int, _FuncParams, Any]]:
+    # Yields (invkind, params, restype) of the functions of a member.
+    params = []
+    for spec in m.argspec:
+        idl, typ, name, defval = _unpack_argspec(*spec)
+        flags = _encode_idl(idl) or PARAMFLAG_FIN
+        if defval is not _NOTHING:
+            flags |= PARAMFLAG_FOPT
+        params.append((_vartype(typ), flags, name))
+    if m.what == "DISPPROPERTY":
+        yield INVOKE_PROPERTYGET, params, m.restype
+        if "readonly" not in m.idlflags:
+            value = (_vartype(m.restype), PARAMFLAG_FIN, None)
+            yield INVOKE_PROPERTYPUT, params + [value], None
+    elif "propget" in m.idlflags:
+        yield INVOKE_PROPERTYGET, params, m.restype
+    elif "propput" in m.idlflags:
+        yield INVOKE_PROPERTYPUT, params, None
+    elif "propputref" in m.idlflags:
+        yield INVOKE_PROPERTYPUTREF, params, None
+    else:
+        yield INVOKE_FUNC, params, m.restype
+
+
+def get_typeinfo(itf: type[IUnknown]) -> ITypeInfo:
+    """Return type information for the dispinterface `itf`, which is
+    created in memory with ICreateTypeInfo on first use.
+    """
+    try:
+        return _typeinfos[itf]
+    except KeyError:
+        pass
+    ctlib = CreateTypeLib(f"{itf.__name__}.tlb")  # never saved
+    ctinfo = ctlib.CreateTypeInfo(itf.__name__, TKIND_DISPATCH)
+    ctinfo.SetGuid(byref(itf._iid_))
+    # dispinterfaces derive from IDispatch.
+    stdole = LoadTypeLibEx("stdole2.tlb")
+    href = ctinfo.AddRefTypeInfo(stdole.GetTypeInfoOfGuid(IDispatch._iid_))
+    ctinfo.AddImplType(0, href)
+    index = 0
+    for m in _disp_members(itf):
+        for invkind, params, restype in _iter_funcs(m):
+            _add_funcdesc(ctinfo, index, m.memid, invkind, m.name, params, restype)
+            index += 1
+    ctinfo.LayOut()
+    tinfo = ctinfo.QueryInterface(ITypeInfo)
+    _typeinfos[itf] = tinfo
+    return tinfo
+
+
+__all__ = ["get_dispnames", "get_ids_of_names", "get_typeinfo"]
@@ -219,20 +219,96 @@ def COMMETHOD(idlflags, restype, methodname, *argspec) -> _ComMemberSpec:
 def _prepare_parameter(value: Any, atyp: type["_CDataType"]) -> "_CDataType":
     # parameter was passed, call `from_param()` to
     # convert it to a `ctypes` type.
-    if getattr(value, "_type_", None) is atyp:
-        # Array of or pointer to type `atyp` was passed,
-        # pointer to `atyp` expected.
-        v = value
-    elif type(atyp) is _PyCSimpleType:  # type: ignore
+    return _parameter_converter(atyp)(value)
+
+
+def _parameter_converter(
+    atyp: type["_CDataType"],
+) -> Callable[[Any], "_CDataType"]:
+    """Returns a function that converts a passed [in, out] parameter value to
+    `atyp`.  The decisions that only depend on `atyp` are made once here
+    instead of on every call.
+    """
+    if type(atyp) is _PyCSimpleType:  # type: ignore
         # The `from_param` method of simple types
         # (`c_int`, `c_double`, ...) returns a `byref` object which
         # we cannot use since later it will be wrapped in a pointer.
         # Simply call the constructor with the argument in that case.
-        v = atyp(value)
-    else:
-        v = atyp.from_param(value)
+
+        def convert_simple(value: Any) -> "_CDataType":
+            if getattr(value, "_type_", None) is atyp:
+                # Array of or pointer to type `atyp` was passed,
+                # pointer to `atyp` expected.
+                return value
+            return atyp(value)
+
+        return convert_simple
+
+    from_param = atyp.from_param
+
+    def convert(value: Any) -> "_CDataType":
+        if getattr(value, "_type_", None) is atyp:
+            # Array of or pointer to type `atyp` was passed,
+            # pointer to `atyp` expected.
+            return value
+        v = from_param(value)
         assert not isinstance(v, _CArgObject)  # type: ignore
-    return v
+        return v
+
+    return convert
+
+
+class _InOutParam(NamedTuple):
+    """Precompiled handling of an [in, out] parameter."""
+
+    # index in the positional arguments, if it is passed positionally
+    param_index: int
+    name: Optional[str]
+    # index in the output
+    outnum: int
+    # the pointed-to type
+    atyp: type["_CDataType"]
+    convert: Callable[[Any], "_CDataType"]
+
+
+def _compile_inout_params(
+    argtypes: tuple[type["_CDataType"], ...],
+    paramflags: tuple["hints.ParamFlagType", ...],
+) -> tuple[list[_InOutParam], int]:
+    """Matches the direction flags to the positional and keyword arguments
+    once per method.  Returns the [in, out] parameters and the total number
+    of 'out' and 'inout' arguments.
+    """
+    inouts = []
+    outnum = 0
+    # `param_index` first counts through the positional and then
+    # through the keyword arguments.
+    param_index = 0
+    for i, info in enumerate(paramflags):
+        direction = info[0]
+        dir_in = bool(direction & PARAMFLAG_FIN)
+        dir_out = bool(direction & PARAMFLAG_FOUT)
+        if not (dir_in or dir_out):
+            # The original code here did not check for this special case and
+            # effectively treated `(dir_in, dir_out) == (False, False)` and
+            # `(dir_in, dir_out) == (True, False)` the same.
+            # In order not to break legacy code we do the same.
+            # One example of a function that has neither `dir_in` nor `dir_out`
+            # set is `IMFAttributes.GetString`.
+            dir_in = True
+        if dir_in and dir_out:
+            # This is an [in, out] parameter.
+            #
+            # [in, out] parameters are passed as pointers,
+            # this is the pointed-to type:
+            atyp: type["_CDataType"] = getattr(argtypes[i], "_type_")
+            convert = _parameter_converter(atyp)
+            inouts.append(_InOutParam(param_index, info[1], outnum, atyp, convert))
+        if dir_out:
+            outnum += 1
+        if dir_in:
+            param_index += 1
+    return inouts, outnum
 
 
 def _fix_inout_args(
@@ -250,60 +326,32 @@ def _fix_inout_args(
     #
     # TODO: The workaround should be disabled when a ctypes
     # version is used where the bug is fixed.
+    inouts, num_outs = _compile_inout_params(argtypes, paramflags)
+    single_inout = num_outs == 1 and len(inouts) == 1
 
     def call_with_inout(self, *args, **kw):
         args = list(args)
-        # Indexed by order in the output
-        outargs: dict[int, "_CDataType"] = {}
-        outnum = 0
-        param_index = 0
-        # Go through all expected arguments and match them to the provided arguments.
-        # `param_index` first counts through the positional and then
-        # through the keyword arguments.
-        for i, info in enumerate(paramflags):
-            direction = info[0]
-            dir_in = bool(direction & PARAMFLAG_FIN)
-            dir_out = bool(direction & PARAMFLAG_FOUT)
-            is_positional = param_index < len(args)
-            if not (dir_in or dir_out):
-                # The original code here did not check for this special case and
-                # effectively treated `(dir_in, dir_out) == (False, False)` and
-                # `(dir_in, dir_out) == (True, False)` the same.
-                # In order not to break legacy code we do the same.
-                # One example of a function that has neither `dir_in` nor `dir_out`
-                # set is `IMFAttributes.GetString`.
-                dir_in = True
-            if dir_in and dir_out:
-                # This is an [in, out] parameter.
-                #
-                # Determine name and required type of the parameter.
-                name = info[1]
-                # [in, out] parameters are passed as pointers,
-                # this is the pointed-to type:
-                atyp: type["_CDataType"] = getattr(argtypes[i], "_type_")
-
-                # Get the actual parameter, either as positional or
-                # keyword arg.
-
-                if is_positional:
-                    v = _prepare_parameter(args[param_index], atyp)
-                    args[param_index] = v
-                elif name in kw:
-                    v = _prepare_parameter(kw[name], atyp)
+        nargs = len(args)
+        # Pairs of (order in the output, value)
+        outargs: list[tuple[int, "_CDataType"]] = []
+        # Get the actual [in, out] parameters, either as positional or
+        # keyword arg.
+        for param_index, name, outnum, atyp, convert in inouts:
+            if param_index < nargs:
+                v = convert(args[param_index])
+                args[param_index] = v
+            elif name in kw:
+                v = convert(kw[name])
+                kw[name] = v
+            else:
+                # no parameter was passed, make an empty one of the required type
+                # and pass it as a keyword argument
+                v = atyp()
+                if name is not None:
                     kw[name] = v
                 else:
-                    # no parameter was passed, make an empty one of the required type
-                    # and pass it as a keyword argument
-                    v = atyp()
-                    if name is not None:
-                        kw[name] = v
-                    else:
-                        raise TypeError("Unnamed inout parameters cannot be omitted")
-                outargs[outnum] = v
-            if dir_out:
-                outnum += 1
-            if dir_in:
-                param_index += 1
+                    raise TypeError("Unnamed inout parameters cannot be omitted")
+            outargs.append((outnum, v))
 
         rescode = func(self, *args, **kw)
         # If there is only a single output value, then do not expect it to
@@ -311,8 +359,8 @@ def _fix_inout_args(
 
         # Our interpretation of this code
         # (jonschz, junkmd, see https://github.com/enthought/comtypes/pull/473):
-        # - `outnum` counts the total number of 'out' and 'inout' arguments.
-        # - `outargs` is a dict consisting of the supplied 'inout' arguments.
+        # - `num_outs` counts the total number of 'out' and 'inout' arguments.
+        # - `outargs` consists of the supplied 'inout' arguments.
         # - The call to `func()` returns the 'out' and 'inout' arguments.
         #   Furthermore, it changes the variables in 'outargs' as a "side effect"
         # - In a perfect world, it should be fine to just return `rescode`.
@@ -320,14 +368,14 @@ def _fix_inout_args(
         #   Instead, they replace the 'inout' variables in `rescode` by those in
         #   'outargs', and call `__ctypes_from_outparam__()` on them.
 
-        if outnum == 1:  # rescode is not iterable
+        if num_outs == 1:  # rescode is not iterable
             # In this case, it is little faster than creating list with
             # `rescode = [rescode]` and getting item with index from the list.
-            if len(outargs) == 1:
+            if single_inout:
                 rescode = rescode.__ctypes_from_outparam__()
             return rescode
         rescode = list(rescode)
-        for outnum, o in outargs.items():
+        for outnum, o in outargs:
             rescode[outnum] = o.__ctypes_from_outparam__()
         return rescode
 
@@ -459,48 +507,173 @@ class DispPropertyGenerator(PropertyGenerator):
         return m.name, None, len(m.argspec) - 1
 
 
+class _LazyComMethod:
+    """Recorded slot of a COM method whose ctypes functions are created on demand.
+
+    Creating the prototype and the raw and high level function pointers for
+    every member of every interface is expensive, and most of them are never
+    called.  Instances of this class keep the member spec and build the
+    functions only when `raw_func` or `func` is called for the first time.
+
+    An instance can stand in for the high level function itself (e.g. as the
+    accessor of a property), calling it forwards to `func()`.
+    """
+
+    __slots__ = ("_spec", "_vidx", "_iid", "_proto", "_raw_func", "_func")
+
+    def __init__(
+        self, m: _ComMemberSpec, vidx: int, iid: Optional["comtypes.GUID"]
+    ) -> None:
+        self._spec = m
+        self._vidx = vidx
+        self._iid = iid
+        self._proto: Optional[type["ctypes._FuncPointer"]] = None
+        self._raw_func: Optional[Callable[..., Any]] = None
+        self._func: Optional[Callable[..., Any]] = None
+
+    def _get_proto(self) -> type["ctypes._FuncPointer"]:
+        if self._proto is None:
+            self._proto = ctypes.WINFUNCTYPE(self._spec.restype, *self._spec.argtypes)
+        return self._proto
+
+    def raw_func(self) -> Callable[..., Any]:
+        """Returns the low level function calling the COM method."""
+        if self._raw_func is None:
+            m = self._spec
+            self._raw_func = self._get_proto()(self._vidx, m.name, None, self._iid)
+        return self._raw_func
+
+    def func(self) -> Callable[..., Any]:
+        """Returns the high level function calling the COM method."""
+        if self._func is None:
+            m = self._spec
+            proto = self._get_proto()
+            func = _fix_args(m, proto(self._vidx, m.name, m.paramflags, self._iid))
+            func.__doc__ = m.doc
+            func.__name__ = m.name  # for pyhelp
+            self._func = func
+        return self._func
+
+    def __call__(self, *args: Any, **kw: Any) -> Any:
+        return self.func()(*args, **kw)
+
+
+def _resolve_func(func: _PropFunc) -> _PropFunc:
+    if isinstance(func, _LazyComMethod):
+        return func.func()
+    return func
+
+
+def _fix_args(m: _ComMemberSpec, func: Callable[..., Any]) -> Callable[..., Any]:
+    """This is a workaround. See `_fix_inout_args` docstring and comments."""
+    if m.paramflags:
+        dirflags = [(p[0] & (PARAMFLAG_FIN | PARAMFLAG_FOUT)) for p in m.paramflags]
+        if (PARAMFLAG_FIN | PARAMFLAG_FOUT) in dirflags:
+            return _fix_inout_args(func, m.argtypes, m.paramflags)
+    return func
+
+
+def _replace_in_owner(owner: type, name: str, old: Any, new: Any) -> None:
+    # Replaces the lazy descriptor in the class that really holds it, which
+    # may be a base class of `owner`.
+    for klass in owner.__mro__:
+        if klass.__dict__.get(name) is old:
+            setattr(klass, name, new)
+            return
+
+
+class lazy_instancemethod:
+    """Descriptor that is installed in place of an `instancemethod` of a COM
+    method.  On first access the function is created, wrapped and cached on
+    the class, so that subsequent lookups do not go through this object.
+    """
+
+    __slots__ = ("_name", "_build")
+
+    def __init__(self, name: str, build: Callable[[], Callable[..., Any]]) -> None:
+        self._name = name
+        self._build = build
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        from comtypes._post_coinit.instancemethod import instancemethod
+
+        if owner is None:
+            owner = type(instance)
+        mth = instancemethod(self._build(), None, owner)
+        _replace_in_owner(owner, self._name, self, mth)
+        return mth.__get__(instance, owner)
+
+    def __repr__(self) -> str:
+        return f"<lazy_instancemethod {self._name!r} at {id(self):x}>"
+
+
+class lazy_property:
+    """Data descriptor that is installed in place of a property of a COM
+    interface.  On first access the accessor functions are created, and the
+    real `property` or `named_property` replaces this object on the class.
+    """
+
+    __slots__ = ("_name", "_prop")
+
+    def __init__(self, name: str, prop: _UnionT[property, "named_property"]) -> None:
+        self._name = name
+        self._prop = prop
+
+    def _materialize(self, owner: type) -> _UnionT[property, "named_property"]:
+        prop = self._prop
+        fget, fset = _resolve_func(prop.fget), _resolve_func(prop.fset)
+        if isinstance(prop, named_property):
+            real = named_property(prop.name, fget, fset, prop.__doc__)
+        else:
+            real = property(fget, fset, None, prop.__doc__)
+        _replace_in_owner(owner, self._name, self, real)
+        return real
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        if owner is None:
+            owner = type(instance)
+        return self._materialize(owner).__get__(instance, owner)
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        self._materialize(type(instance)).__set__(instance, value)  # type: ignore
+
+    def __delete__(self, instance: Any) -> None:
+        self._materialize(type(instance)).__delete__(instance)  # type: ignore
+
+    def __repr__(self) -> str:
+        return f"<lazy_property {self._name!r} at {id(self):x}>"
+
+
 class ComMemberGenerator:
     def __init__(self, cls_name: str, vtbl_offset: int, iid: "comtypes.GUID") -> None:
         self._vtbl_offset = vtbl_offset
         self._iid = iid
         self._props = ComPropertyGenerator(cls_name)
-        # sequence of (name: str, func: Callable, raw_func: Callable, is_prop: bool)
-        self._mths: list[tuple[str, Callable[..., Any], Callable[..., Any], bool]] = []
+        # sequence of (name: str, mth: _LazyComMethod, is_prop: bool)
+        self._mths: list[tuple[str, _LazyComMethod, bool]] = []
         self._member_index = 0
 
     def add(self, m: _ComMemberSpec) -> None:
-        proto = ctypes.WINFUNCTYPE(m.restype, *m.argtypes)
-        # a low level unbound method calling the com method.
-        # attach it with a private name (__com_AddRef, for example),
-        # so that custom method implementations can call it.
+        # The ctypes functions are not created here, but on first access of
+        # the descriptors which are installed in the interface class.
+        # the low level unbound method will be attached with a private name
+        # (__com_AddRef, for example), so that custom method implementations
+        # can call it.
         vidx = self._member_index + self._vtbl_offset
         # If the method returns a HRESULT, we pass the interface iid,
         # so that we can request error info for the interface.
         iid = self._iid if m.restype == ctypes.HRESULT else None
-        raw_func = proto(vidx, m.name, None, iid)  # low level
-        func = self._fix_args(m, proto(vidx, m.name, m.paramflags, iid))  # high level
-        func.__doc__ = m.doc
-        func.__name__ = m.name  # for pyhelp
+        mth = _LazyComMethod(m, vidx, iid)
         is_prop = m.is_prop()
         if is_prop:
-            self._props.add(m, func)
-        self._mths.append((m.name, func, raw_func, is_prop))
+            self._props.add(m, mth)
+        self._mths.append((m.name, mth, is_prop))
         self._member_index += 1
 
-    def _fix_args(
-        self, m: _ComMemberSpec, func: Callable[..., Any]
-    ) -> Callable[..., Any]:
-        """This is a workaround. See `_fix_inout_args` docstring and comments."""
-        if m.paramflags:
-            dirflags = [(p[0] & (PARAMFLAG_FIN | PARAMFLAG_FOUT)) for p in m.paramflags]
-            if (PARAMFLAG_FIN | PARAMFLAG_FOUT) in dirflags:
-                return _fix_inout_args(func, m.argtypes, m.paramflags)
-        return func
-
-    def methods(self):
+    def methods(self) -> Iterator[tuple[str, _LazyComMethod, bool]]:
         return iter(self._mths)
 
-    def properties(self):
+    def properties(self) -> Iterator[tuple[str, _UnionT[property, "named_property"]]]:
         return iter(self._props)
 
 
@@ -592,9 +765,16 @@ class DispMemberGenerator:
 ################################################################
 # helper classes for COM propget / propput
 # Should they be implemented in C for speed?
+#
+# A bound object is created on every access like `obj.Cells[1, 2]`, so it
+# has `__slots__` and its item access checks the index type first.  It is
+# not cached per instance: the cache would either keep the COM pointer alive
+# (and delay its `Release()`) or create a reference cycle with it.
 
 
 class bound_named_property:
+    __slots__ = ("name", "instance", "fget", "fset")
+
     def __init__(self, name, fget, fset, instance):
         self.name = name
         self.instance = instance
@@ -602,14 +782,15 @@ class bound_named_property:
         self.fset = fset
 
     def __getitem__(self, index):
-        if self.fget is None:
+        fget = self.fget
+        if fget is None:
             raise TypeError("unsubscriptable object")
         if isinstance(index, tuple):
-            return self.fget(self.instance, *index)
-        elif index == comtypes._all_slice:
-            return self.fget(self.instance)
+            return fget(self.instance, *index)
+        elif type(index) is slice and index == comtypes._all_slice:
+            return fget(self.instance)
         else:
-            return self.fget(self.instance, index)
+            return fget(self.instance, index)
 
     def __call__(self, *args):
         if self.fget is None:
@@ -617,14 +798,15 @@ class bound_named_property:
         return self.fget(self.instance, *args)
 
     def __setitem__(self, index, value):
-        if self.fset is None:
+        fset = self.fset
+        if fset is None:
             raise TypeError("object does not support item assignment")
         if isinstance(index, tuple):
-            self.fset(self.instance, *(index + (value,)))
-        elif index == comtypes._all_slice:
-            self.fset(self.instance, value)
+            fset(self.instance, *index, value)
+        elif type(index) is slice and index == comtypes._all_slice:
+            fset(self.instance, value)
         else:
-            self.fset(self.instance, index, value)
+            fset(self.instance, index, value)
 
     def __repr__(self):
         return f"<bound_named_property {self.name!r} at {id(self):x}>"
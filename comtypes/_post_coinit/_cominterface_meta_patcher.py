@@ -21,14 +21,24 @@ def case_insensitive(p: type) -> None:
             raise AttributeError(name)
 
         # __setattr__ is pretty heavy-weight, because it is called for
-        # EVERY attribute assignment.  Settings a non-com attribute
-        # through this function takes 8.6 usec, while without this
-        # function it takes 0.7 sec - 12 times slower.
+        # EVERY attribute assignment.  To keep it cheap, the spellings
+        # of COM members are cached in __map_spelling__, so that the lower
+        # casing and the __map_case__ lookup happen only once per spelling.
+        # Other names are not cached, so the cache cannot grow without
+        # bound.  The metaclass clears the cache when __map_case__ changes.
         #
         # How much faster would this be if implemented in C?
-        def __setattr__(self, name, value):
+        def __setattr__(self, name, value, _setattr=object.__setattr__):
             """Implement case insensitive access to methods and properties"""
-            object.__setattr__(self, self.__map_case__.get(name.lower(), name), value)
+            try:
+                fixed_name = self.__map_spelling__[name]
+            except KeyError:
+                fixed_name = self.__map_case__.get(name.lower())
+                if fixed_name is None:
+                    fixed_name = name
+                else:
+                    self.__map_spelling__[name] = fixed_name
+            _setattr(self, fixed_name, value)
 
 
 def reference_fix(pp: type) -> None:
@@ -2,14 +2,20 @@
 
 import logging
 import sys
+import threading
 from ctypes import HRESULT, POINTER, byref, c_ulong, c_void_p
 from typing import TYPE_CHECKING, Any, ClassVar, Optional, TypeVar
 
 import comtypes
 from comtypes import GUID, _CoUninitialize
-from comtypes._memberspec import STDMETHOD, ComMemberGenerator, DispMemberGenerator
+from comtypes._memberspec import (
+    STDMETHOD,
+    ComMemberGenerator,
+    DispMemberGenerator,
+    lazy_instancemethod,
+    lazy_property,
+)
 from comtypes._post_coinit import _cominterface_meta_patcher as _meta_patch
-from comtypes._post_coinit.instancemethod import instancemethod
 
 if TYPE_CHECKING:
     from typing import Literal
@@ -20,11 +26,18 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Maps thread idents to the `comtypes.releasequeue.ReleaseQueue` instances
+# that defer the Release() calls of the pointers owned by the threads.
+_release_queues: dict[int, Any] = {}
+
 
 def _shutdown(
     func=_CoUninitialize,
     _debug=logger.debug,
 ) -> None:
+    # Deferred Release() calls must happen before CoUninitialize.
+    for queue in list(_release_queues.values()):
+        queue._shutdown()
     # Sometimes, CoUninitialize, running at Python shutdown,
     # raises an exception.  We suppress this when __debug__ is
     # False.
@@ -183,6 +196,9 @@ class _cominterface_meta(type):
             d = {}
             d.update(getattr(self, "__map_case__", {}))
             self.__map_case__ = d
+            # The __map_spelling__ dictionary caches the spellings of COM
+            # members used in attribute assignments.
+            self.__map_spelling__ = {}
 
     def _make_dispmethods(self, methods: list["_DispMemberSpec"]) -> None:
         if self._case_insensitive_:
@@ -205,6 +221,8 @@ class _cominterface_meta(type):
             # COM is case insensitive
             if self._case_insensitive_:
                 self.__map_case__[name.lower()] = name
+        if self._case_insensitive_:
+            self.__map_spelling__.clear()
 
     def __get_baseinterface_methodcount(self) -> int:
         "Return the number of com methods in the base interfaces"
@@ -232,15 +250,16 @@ class _cominterface_meta(type):
         # create private low level, and public high level methods
         for m in methods:
             member_gen.add(m)
-        for name, func, raw_func, is_prop in member_gen.methods():
-            raw_mth = instancemethod(raw_func, None, self)
-            setattr(self, f"_{self.__name__}__com_{name}", raw_mth)
-            mth = instancemethod(func, None, self)
+        # The methods and properties are installed as lazy descriptors; the
+        # ctypes functions are created and cached on the class on first access.
+        for name, mth, is_prop in member_gen.methods():
+            raw_name = f"_{self.__name__}__com_{name}"
+            setattr(self, raw_name, lazy_instancemethod(raw_name, mth.raw_func))
             if not is_prop:
                 # We install the method in the class, except when it's a property.
                 # And we make sure we don't overwrite a property that's already present.
                 mthname = name if not hasattr(self, name) else f"_{name}"
-                setattr(self, mthname, mth)
+                setattr(self, mthname, lazy_instancemethod(mthname, mth.func))
             # For a method, this is the real name.
             # For a property, this is the name WITHOUT the _set_ or _get_ prefix.
             if self._case_insensitive_:
@@ -251,10 +270,12 @@ class _cominterface_meta(type):
         for name, accessor in member_gen.properties():
             # Again, we should not overwrite class attributes that are already present.
             propname = name if not hasattr(self, name) else f"_{name}"
-            setattr(self, propname, accessor)
+            setattr(self, propname, lazy_property(propname, accessor))
             # COM is case insensitive
             if self._case_insensitive_:
                 self.__map_case__[name.lower()] = name
+        if self._case_insensitive_:
+            self.__map_spelling__.clear()
 
 
 ################################################################
@@ -273,7 +294,7 @@ class _compointer_base(c_void_p, metaclass=_compointer_meta):
     if TYPE_CHECKING:
         __com_interface__: ClassVar[type["IUnknown"]]
 
-    def __del__(self, _debug=logger.debug) -> None:
+    def __del__(self, _debug=logger.debug, _queues=_release_queues) -> None:
         "Release the COM refcount we own."
         if self:
             # comtypes calls CoUninitialize() when the atexit handlers
@@ -284,10 +305,17 @@ class _compointer_base(c_void_p, metaclass=_compointer_meta):
             # _com_shutting_down flag.
             #
             if not type(self)._com_shutting_down:
+                if _queues:
+                    queue = _queues.get(self.__dict__.get("__owner_thread"))
+                    if queue is not None:
+                        queue.defer(self)
+                        return
                 _debug("Release %s", self)
                 self.Release()  # type: ignore
 
     def __eq__(self, other) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, _compointer_base):
             return False
         # get the value property of the c_void_p baseclass, this is the pointer value
@@ -323,6 +351,10 @@ class _compointer_base(c_void_p, metaclass=_compointer_meta):
         which is QueryInterface()d."""
         if value is None:
             return None
+        # Fast path for the most common case; this also avoids the
+        # `__eq__` call of the comparison below.
+        if type(value) is cls:
+            return value
         # CLF: 2013-01-18
         # A default value of 0, meaning null, can pass through to here.
         if value == 0:
@@ -347,6 +379,25 @@ class _compointer_base(c_void_p, metaclass=_compointer_meta):
         return value.QueryInterface(cls.__com_interface__)  # type: ignore
 
 
+def _init_owned(self, *args: Any, _get_ident=threading.get_ident) -> None:
+    c_void_p.__init__(self, *args)
+    # The thread, and so the apartment, that owns the pointer; its release
+    # is deferred to the queue of that thread, whichever thread finalizes it.
+    self.__dict__["__owner_thread"] = _get_ident()
+
+
+def _record_owners(enabled: bool) -> None:
+    # Called by `comtypes.releasequeue` when the first queue is installed,
+    # and when the last one is uninstalled, so that creating pointers costs
+    # nothing more at other times.  Pointers that ctypes creates without
+    # calling their class, as results of foreign functions or with
+    # `from_address`, have no owner.
+    if enabled:
+        _compointer_base.__init__ = _init_owned  # type: ignore
+    elif "__init__" in vars(_compointer_base):
+        del _compointer_base.__init__
+
+
 ################################################################
 # IUnknown, the root of all evil...
 
@@ -400,13 +451,21 @@ class IUnknown(_IUnknown_Base, metaclass=_cominterface_meta):
         self, interface: type[_T_IUnknown], iid: Optional[GUID] = None
     ) -> _T_IUnknown:
         """QueryInterface(interface) -> instance"""
-        p = POINTER(interface)()
         if iid is None:
             iid = interface._iid_
+        cache = self.__dict__.get("__qi_cache")
+        if cache is not None:
+            key = (bytes(iid), interface)
+            p = cache.get(key)
+            if p:
+                return p  # type: ignore
+        p = POINTER(interface)()
         self.__com_QueryInterface(byref(iid), byref(p))  # type: ignore
         clsid = self.__dict__.get("__clsid")
         if clsid is not None:
             p.__dict__["__clsid"] = clsid
+        if cache is not None:
+            cache[key] = p
         return p  # type: ignore
 
     # these are only so that they get a docstring.
@@ -420,4 +479,17 @@ class IUnknown(_IUnknown_Base, metaclass=_cominterface_meta):
         return self.__com_Release()  # type: ignore
 
 
+def enable_qi_cache(ptr: "IUnknown") -> None:
+    """Cache the results of `ptr.QueryInterface` per interface.
+
+    Repeated queries for the same interface return the same, already
+    AddRef'd, pointer instance instead of calling into the object again.
+    COM requires the set of interfaces of an object to be static, so this
+    is safe unless the object breaks that rule; the cached pointers must
+    not be released explicitly.  They hold their own references, which are
+    released when `ptr` is garbage collected.
+    """
+    ptr.__dict__.setdefault("__qi_cache", {})
+
+
 ################################################################
@@ -1,4 +1,8 @@
+import functools
+import inspect
 import logging
+import types
+import weakref
 from _ctypes import COMError
 from collections.abc import Callable, Iterator, Sequence
 from ctypes import WINFUNCTYPE, Structure, c_void_p
@@ -12,8 +16,11 @@ from comtypes._memberspec import (
     DISPATCH_PROPERTYGET,
     DISPATCH_PROPERTYPUT,
     DISPATCH_PROPERTYPUTREF,
+    PARAMFLAG_FIN,
+    PARAMFLAG_FOPT,
     _encode_idl,
 )
+from comtypes.automation import DISPID_PROPERTYPUT, DISPPARAMS, VT_ERROR
 from comtypes.errorinfo import ReportError, ReportException
 
 if TYPE_CHECKING:
@@ -74,12 +81,16 @@ def catch_errors(
     paramflags: Optional[tuple["hints.ParamFlagType", ...]],
     interface: type[IUnknown],
     mthname: str,
+    lookup: Optional[Callable[[int], "hints.COMObject"]] = None,
 ) -> Callable[..., Any]:
     clsid = getattr(obj, "_reg_clsid_", None)
 
     def call_with_this(*args, **kw):
         try:
-            result = mth(*args, **kw)
+            if lookup is None:
+                result = mth(*args, **kw)
+            else:
+                result = mth(lookup(args[0]), *args, **kw)
         except comtypes.ReturnHRESULT as err:
             (hr, text) = err.args
             return ReportError(text, iid=interface._iid_, clsid=clsid, hresult=hr)
@@ -123,12 +134,15 @@ def hack(
     paramflags: Optional[tuple["hints.ParamFlagType", ...]],
     interface: type[IUnknown],
     mthname: str,
+    lookup: Optional[Callable[[int], "hints.COMObject"]] = None,
 ) -> Callable[..., Any]:
+    # When `lookup` is given, `mth` is a plain function that is called with
+    # the instance `lookup` returns for the `this` pointer.
     if paramflags is None:
-        return catch_errors(inst, mth, paramflags, interface, mthname)
+        return catch_errors(inst, mth, paramflags, interface, mthname, lookup)
     code = mth.__code__
     if code.co_varnames[1:2] == ("this",):
-        return catch_errors(inst, mth, paramflags, interface, mthname)
+        return catch_errors(inst, mth, paramflags, interface, mthname, lookup)
     dirflags = [f[0] for f in paramflags]
     # An argument is an input arg either if flags are NOT set in the
     # idl file, or if the flags contain 'in'. In other words, the
@@ -163,7 +177,10 @@ def hack(
         for a in args_in_idx:
             inargs.append(args[a])
         try:
-            result = mth(*inargs)
+            if lookup is None:
+                result = mth(*inargs)
+            else:
+                result = mth(lookup(this), *inargs)
             if args_out == 1:
                 args[args_out_idx[0]][0] = result
             elif args_out != 0:
@@ -218,6 +235,19 @@ def hack(
     return call_without_this
 
 
+def _with_metrics(
+    obj: "hints.COMObject",
+    impl: Callable[..., Any],
+    interface: type[IUnknown],
+    mthname: str,
+) -> Callable[..., Any]:
+    # Calls are only timed for classes that opt in with '_com_metrics_'.
+    metrics = getattr(obj, "_com_metrics_", None)
+    if metrics is None:
+        return impl
+    return metrics.wrap(impl, interface.__name__, mthname)
+
+
 class _MethodFinder:
     def __init__(self, inst: "hints.COMObject") -> None:
         self.inst = inst
@@ -233,8 +263,10 @@ class _MethodFinder:
     ) -> Callable[..., Any]:
         mth = self.find_impl(interface, mthname, paramflags, idlflags)
         if mth is None:
-            return _do_implement(interface.__name__, mthname)
-        return hack(self.inst, mth, paramflags, interface, mthname)
+            impl = _do_implement(interface.__name__, mthname)
+        else:
+            impl = hack(self.inst, mth, paramflags, interface, mthname)
+        return _with_metrics(self.inst, impl, interface, mthname)
 
     def find_method(self, fq_name: str, mthname: str) -> Callable[..., Any]:
         # Try to find a method, first with the fully qualified name
@@ -300,6 +332,93 @@ class _MethodFinder:
         return comtypes.instancemethod(get, self.inst, type(self.inst))
 
 
+class _InstanceBoundImpl(Exception):
+    """A method implementation cannot be shared by all instances."""
+
+
+class _ClassMethodFinder(_MethodFinder):
+    """Finds the method implementations on a COMObject subclass instead of
+    an instance, so that the virtual function tables can be shared by all
+    instances of the class.  The implementations are called with the
+    instance that `lookup` returns for the `this` pointer.
+    """
+
+    def __init__(
+        self,
+        cls: type["hints.COMObject"],
+        lookup: Callable[[int], "hints.COMObject"],
+    ) -> None:
+        self.inst = cls  # type: ignore
+        self.names = dict([(n.lower(), n) for n in dir(cls)])
+        self.lookup = lookup
+
+    def get_impl(
+        self,
+        interface: type[IUnknown],
+        mthname: str,
+        paramflags: Optional[tuple["hints.ParamFlagType", ...]],
+        idlflags: _UnionT["_ComIdlFlags", "_DispIdlFlags"],
+    ) -> Callable[..., Any]:
+        mth = self.find_impl(interface, mthname, paramflags, idlflags)
+        if mth is None:
+            impl = _do_implement(interface.__name__, mthname)
+        else:
+            impl = hack(self.inst, mth, paramflags, interface, mthname, self.lookup)
+        return _with_metrics(self.inst, impl, interface, mthname)
+
+    def find_method(self, fq_name: str, mthname: str) -> Callable[..., Any]:
+        for name in (fq_name, mthname):
+            try:
+                mth = inspect.getattr_static(self.inst, name)
+            except AttributeError:
+                continue
+            # staticmethods, classmethods and other descriptors cannot be
+            # called with the instance as first argument.
+            if not isinstance(mth, types.FunctionType):
+                raise _InstanceBoundImpl(name)
+            return mth
+        raise AttributeError(mthname)
+
+    def setter(self, propname: str) -> Callable[[Any, Any], Any]:
+        def set(self, value):
+            try:
+                setattr(self, propname, value)
+            except AttributeError:
+                raise E_NotImplemented()
+
+        return set
+
+    def getter(self, propname: str) -> Callable[[Any], Any]:
+        def get(self):
+            try:
+                return getattr(self, propname)
+            except AttributeError:
+                raise E_NotImplemented()
+
+        return get
+
+
+class _ThisRegistry:
+    """Maps the `this` pointers handed out with shared virtual function
+    tables to the COMObject instances that own them.
+    """
+
+    def __init__(self) -> None:
+        self._refs: dict[int, weakref.ref] = {}
+
+    def register(self, address: int, inst: "hints.COMObject") -> None:
+        discard = functools.partial(self._discard, address)
+        self._refs[address] = weakref.ref(inst, discard)
+
+    def _discard(self, address: int, ref: weakref.ref) -> None:
+        # The address may already be reused by another instance.
+        if self._refs.get(address) is ref:
+            del self._refs[address]
+
+    def lookup(self, this: int) -> "hints.COMObject":
+        return self._refs[this]()
+
+
 def _create_vtbl_type(
     fields: tuple[tuple[str, type["_FuncPointer"]], ...], itf: type[IUnknown]
 ) -> type[Structure]:
@@ -339,6 +458,56 @@ def create_vtbl_mapping(
     return (iids, vtbl)
 
 
+_this_registry = _ThisRegistry()
+
+_VtblTemplate = tuple[Sequence[GUID], Structure]
+_ClassVtbls = dict[type[IUnknown], Optional[_VtblTemplate]]
+
+# The {interface: (iids, vtbl)} dictionaries are stored on the COMObject
+# subclasses themselves, in this attribute.  The implementations in the
+# tables may refer to the class (methods that call super() do), so a cache
+# outside of the class would keep it alive.  The value for an interface is
+# None when the implementations must be resolved per instance.
+_VTBL_TEMPLATES = "_vtbl_templates_"
+
+
+def get_vtbl_template(
+    cls: type["hints.COMObject"],
+    itf: type[IUnknown],
+    finder: Optional[_ClassMethodFinder] = None,
+) -> Optional[_VtblTemplate]:
+    """Return the interface identifiers and the virtual function table that
+    all instances of `cls` share for `itf`, creating them on first use.
+
+    The table dispatches calls to the instance registered for the `this`
+    pointer with `register_this`.  None is returned if some implementation
+    cannot be resolved on the class itself.  `finder` resolves the
+    implementations when the table is created, by default on `cls`.
+    """
+    templates: Optional[_ClassVtbls] = vars(cls).get(_VTBL_TEMPLATES)
+    if templates is None:
+        templates = {}
+        setattr(cls, _VTBL_TEMPLATES, templates)
+    elif itf in templates:
+        return templates[itf]
+    if finder is None:
+        finder = _ClassMethodFinder(cls, _this_registry.lookup)
+    try:
+        template = create_vtbl_mapping(itf, finder)
+    except _InstanceBoundImpl as details:
+        _debug("%s: %s needs per instance vtables", cls.__name__, details)
+        template = None
+    templates[itf] = template
+    return template
+
+
+def register_this(address: int, inst: "hints.COMObject") -> None:
+    """Register `inst` as the receiver of calls through a shared virtual
+    function table whose `this` pointer is `address`.
+    """
+    _this_registry.register(address, inst)
+
+
 def _walk_itf_bases(itf: type[IUnknown]) -> Iterator[type[IUnknown]]:
     """Iterates over interface inheritance in reverse order to build the
     virtual function table, and leave out the 'object' base class.
@@ -388,11 +557,11 @@ def _make_dispmthentry(
         mthname = f"_setref_{m.name}"
     else:
         invkind = DISPATCH_METHOD
-        if m.restype:
-            argspec = m.argspec + ((["out"], m.restype, ""),)
-        else:
-            argspec = m.argspec
         mthname = m.name
+    if m.restype and invkind in (DISPATCH_METHOD, DISPATCH_PROPERTYGET):
+        argspec = m.argspec + ((["out"], m.restype, ""),)
+    else:
+        argspec = m.argspec
     yield from _make_dispentry(finder, itf, mthname, m.idlflags, argspec, invkind)
 
 
@@ -404,12 +573,18 @@ def _make_disppropentry(
         argspec = m.argspec + ((["out"], m.restype, ""),)
     else:
         argspec = m.argspec
+    # The accessors fall back to attribute access, like the ones of
+    # "propget" and "propput" methods.
+    idlflags = m.idlflags + ("propget",)
     yield from _make_dispentry(
-        finder, itf, f"_get_{m.name}", m.idlflags, argspec, DISPATCH_PROPERTYGET
+        finder, itf, f"_get_{m.name}", idlflags, argspec, DISPATCH_PROPERTYGET
     )
     if "readonly" not in m.idlflags:
+        # ... and the new value is the implicit "in" of the setter.
+        argspec = m.argspec + ((["in"], m.restype, "value"),)
+        idlflags = m.idlflags + ("propput",)
         yield from _make_dispentry(
-            finder, itf, f"_set_{m.name}", m.idlflags, argspec, DISPATCH_PROPERTYPUT
+            finder, itf, f"_set_{m.name}", idlflags, argspec, DISPATCH_PROPERTYPUT
         )
         # Add DISPATCH_PROPERTYPUTREF also?
 
@@ -428,8 +603,118 @@ def _make_dispentry(
     # XXX can the dispid be at a different index?  Check codegenerator.
     dispid = idlflags[0]
     impl = finder.get_impl(interface, mthname, paramflags, idlflags)  # type: ignore
+    impl.unpack_dispparams = compile_dispparams(paramflags, invkind)  # type: ignore
     yield ((dispid, invkind), impl)  # type: ignore
     # invkind is really a set of flags; we allow both DISPATCH_METHOD and
     # DISPATCH_PROPERTYGET (win32com uses this, maybe other languages too?)
     if invkind in (DISPATCH_METHOD, DISPATCH_PROPERTYGET):
         yield ((dispid, DISPATCH_METHOD | DISPATCH_PROPERTYGET), impl)  # type: ignore
+
+
+class DispParamsError(Exception):
+    """The DISPPARAMS of an IDispatch::Invoke call do not match the
+    parameters of the implementation.
+
+    The arguments are the HRESULT to return and the index of the offending
+    argument in the `rgvarg` array, or None.
+    """
+
+
+_MISSING = object()
+
+
+def compile_dispparams(
+    paramflags: Optional[Sequence[tuple[Any, ...]]], invkind: int
+) -> Callable[[DISPPARAMS], list[Any]]:
+    """Return a function that unpacks the DISPPARAMS of an IDispatch::Invoke
+    call into the positional arguments for an implementation with the
+    `paramflags` parameters.
+
+    Unnamed arguments are packed into `rgvarg` in reverse order, named
+    arguments are packed in the order of `rgdispidNamedArgs`; a named
+    argument's DISPID is the position of the parameter.  For property puts,
+    the new value is the DISPID_PROPERTYPUT named argument and is passed as
+    the last argument.  Omitted arguments are replaced by the default value
+    of the parameter, by None for optional parameters without default, or
+    the call fails with DISP_E_PARAMNOTOPTIONAL.
+
+    If `paramflags` is None, the parameters of the implementation are not
+    known; the arguments are passed as they are found.
+    """
+    is_put = invkind in (DISPATCH_PROPERTYPUT, DISPATCH_PROPERTYPUTREF)
+    defaults: Optional[list[Any]] = None
+    if paramflags is not None:
+        # The output parameters are appended by IDispatch_Invoke.
+        defaults = []
+        for p in paramflags:
+            if p[0] & PARAMFLAG_FIN or p[0] == 0:
+                if len(p) > 2:
+                    defaults.append(p[2])
+                elif p[0] & PARAMFLAG_FOPT:
+                    defaults.append(None)
+                else:
+                    defaults.append(_MISSING)
+
+    def unpack(params: DISPPARAMS) -> list[Any]:
+        rgvarg = params.rgvarg
+        cargs = params.cArgs
+        cnamed = params.cNamedArgs
+        num_unnamed = cargs - cnamed
+        if defaults is None:
+            nparams = cargs
+        else:
+            nparams = len(defaults)
+        if is_put:
+            if cnamed < 1 or params.rgdispidNamedArgs[0] != DISPID_PROPERTYPUT:
+                raise DispParamsError(hresult.DISP_E_PARAMNOTFOUND, None)
+            # the new value is always the last argument.
+            last = nparams - 1
+        elif not cnamed and num_unnamed == nparams:
+            # fast path: all arguments, none of them named.
+            args = []
+            missing = False
+            for i in range(cargs - 1, -1, -1):
+                var = rgvarg[i]
+                if var.vt == VT_ERROR and var._.VT_I4 == hresult.DISP_E_PARAMNOTFOUND:
+                    args.append(_MISSING)
+                    missing = True
+                else:
+                    args.append(var.value)
+            # The arguments are never compared with _MISSING by equality,
+            # which could call the __eq__ of arbitrary objects.
+            if missing:
+                return _apply_defaults(args, defaults)
+            return args
+        if num_unnamed > nparams - is_put:
+            raise DispParamsError(hresult.DISP_E_BADPARAMCOUNT, None)
+        variants: list[Any] = [_MISSING] * nparams
+        for pos in range(num_unnamed):
+            variants[pos] = rgvarg[cargs - 1 - pos]
+        for i in range(cnamed):
+            pos = params.rgdispidNamedArgs[i]
+            if is_put and i == 0:
+                pos = last
+            elif not 0 <= pos < nparams or (is_put and pos == last):
+                raise DispParamsError(hresult.DISP_E_PARAMNOTFOUND, i)
+            variants[pos] = rgvarg[i]
+        args = []
+        for var in variants:
+            if var is _MISSING or (
+                var.vt == VT_ERROR and var._.VT_I4 == hresult.DISP_E_PARAMNOTFOUND
+            ):
+                args.append(_MISSING)
+            else:
+                args.append(var.value)
+        return _apply_defaults(args, defaults)
+
+    return unpack
+
+
+def _apply_defaults(args: list[Any], defaults: Optional[list[Any]]) -> list[Any]:
+    for pos, value in enumerate(args):
+        if value is not _MISSING:
+            continue
+        if defaults is None or defaults[pos] is _MISSING:
+            raise DispParamsError(hresult.DISP_E_PARAMNOTOPTIONAL, None)
+        args[pos] = defaults[pos]
+    return args
@@ -3,6 +3,7 @@ import array
 import datetime
 import decimal
 from _ctypes import COMError, CopyComPointer
+from collections.abc import Sequence
 from ctypes import *
 from ctypes import Array as _CArrayType
 from ctypes import _Pointer
@@ -770,6 +771,21 @@ DISPID_DESTRUCTOR = -7
 DISPID_COLLECT = -8
 
 
+def _make_dispparams(invkind: int, args: Sequence[Any]) -> DISPPARAMS:
+    array = (VARIANT * len(args))()
+    for i, a in enumerate(args[::-1]):
+        array[i].value = a
+    dp = DISPPARAMS()
+    dp.cArgs = len(args)
+    dp.rgvarg = array
+    if invkind in (DISPATCH_PROPERTYPUT, DISPATCH_PROPERTYPUTREF):  # propput
+        dp.cNamedArgs = 1
+        dp.rgdispidNamedArgs = pointer(DISPID(DISPID_PROPERTYPUT))
+    else:
+        dp.cNamedArgs = 0
+    return dp
+
+
 class IDispatch(IUnknown):
     _disp_methods_: ClassVar[list["_DispMemberSpec"]]
 
@@ -850,20 +866,6 @@ class IDispatch(IUnknown):
         )
         return var._get_value(dynamic=True)
 
-    def __make_dp(self, _invkind: int, *args: Any) -> DISPPARAMS:
-        array = (VARIANT * len(args))()
-        for i, a in enumerate(args[::-1]):
-            array[i].value = a
-        dp = DISPPARAMS()
-        dp.cArgs = len(args)
-        dp.rgvarg = array
-        if _invkind in (DISPATCH_PROPERTYPUT, DISPATCH_PROPERTYPUTREF):  # propput
-            dp.cNamedArgs = 1
-            dp.rgdispidNamedArgs = pointer(DISPID(DISPID_PROPERTYPUT))
-        else:
-            dp.cNamedArgs = 0
-        return dp
-
     def Invoke(self, dispid: int, *args: Any, **kw: Any) -> Any:
         """Invoke a method or property."""
 
@@ -878,7 +880,14 @@ class IDispatch(IUnknown):
         _lcid = kw.pop("_lcid", 0)
         if kw:
             raise ValueError("named parameters not yet implemented")
-        dp = self.__make_dp(_invkind, *args)
+        dp = _make_dispparams(_invkind, args)
+        return self._invoke_dispparams(dispid, dp, _invkind, _lcid)
+
+    def _invoke_dispparams(
+        self, dispid: int, dp: DISPPARAMS, _invkind: int, _lcid: int
+    ) -> Any:
+        # Invoke with prepared DISPPARAMS; the same instance can be passed
+        # to several calls, when the arguments are the same.
         result = VARIANT()
         excepinfo = EXCEPINFO()
         argerr = c_uint()
@@ -917,6 +926,7 @@ class IDispatch(IUnknown):
                 # coerced.
                 #
                 # Hm, should we raise TypeError, or COMError?
+                args = tuple(dp.rgvarg[i].value for i in range(dp.cArgs))[::-1]
                 raise COMError(
                     hr, text, (f"TypeError: Parameter {argerr.value + 1}", args)
                 )
@@ -8,9 +8,15 @@ from comtypes.client import dynamic, lazybind  # noqa
 from comtypes.client._activeobj import RegisterActiveObject  # noqa
 from comtypes.client._code_cache import _find_gen_dir
 from comtypes.client._constants import Constants  # noqa
-from comtypes.client._events import GetEvents, PumpEvents, ShowEvents
+from comtypes.client._events import EventPump, GetEvents, PumpEvents, ShowEvents
 from comtypes.client._generate import GetModule
-from comtypes.client._managing import GetBestInterface, _manage, wrap_outparam  # noqa
+from comtypes.client._managing import (  # noqa
+    GetBestInterface,
+    _manage,
+    clear_interface_cache,
+    enable_identity_map,
+    wrap_outparam,
+)
 from comtypes.hresult import *  # noqa
 
 gen_dir = _find_gen_dir()
@@ -29,15 +35,19 @@ wrap = GetBestInterface
 ctypes.POINTER(automation.IDispatch).__ctypes_from_outparam__ = wrap_outparam  # type: ignore
 
 from comtypes.client._activeobj import GetActiveObject
+from comtypes.client._apartment import AsyncApartment
 from comtypes.client._create import (
+    ClassFactoryCache,
     CoGetObject,
     CreateObject,
     GetClassObject,
 )
+from comtypes.client._pool import ObjectPool
 
 # fmt: off
 __all__ = [
     "CreateObject", "GetActiveObject", "CoGetObject", "GetEvents",
-    "ShowEvents", "PumpEvents", "GetModule", "GetClassObject",
+    "ShowEvents", "PumpEvents", "EventPump", "GetModule", "GetClassObject",
+    "ClassFactoryCache", "ObjectPool", "AsyncApartment",
 ]
 # fmt: on
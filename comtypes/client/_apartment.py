@@ -0,0 +1,429 @@
+import asyncio
+import inspect
+import itertools
+import logging
+import queue
+import threading
+from _ctypes import COMError
+from collections.abc import Callable, Generator
+from ctypes import POINTER, WinDLL, WinError, byref
+from ctypes.wintypes import BOOL, DWORD, HWND, LPARAM, MSG, UINT, WPARAM
+from typing import Any, Optional
+
+import comtypes
+from comtypes import IUnknown, messageloop
+from comtypes.client import dynamic, lazybind
+from comtypes.client._create import CreateObject
+from comtypes.client._events import FindOutgoingInterface, GetEvents
+
+logger = logging.getLogger(__name__)
+
+_user32 = WinDLL("user32")
+
+_PostThreadMessage = _user32.PostThreadMessageW
+_PostThreadMessage.argtypes = [DWORD, UINT, WPARAM, LPARAM]
+_PostThreadMessage.restype = BOOL
+
+_PeekMessage = _user32.PeekMessageW
+_PeekMessage.argtypes = [POINTER(MSG), HWND, UINT, UINT, UINT]
+_PeekMessage.restype = BOOL
+
+_kernel32 = WinDLL("kernel32")
+
+_GetCurrentThreadId = _kernel32.GetCurrentThreadId
+_GetCurrentThreadId.argtypes = []
+_GetCurrentThreadId.restype = DWORD
+
+WM_QUIT = 0x0012
+WM_APP = 0x8000
+PM_NOREMOVE = 0x0000
+
+_WorkItem = tuple[Optional["asyncio.Future[Any]"], Callable[..., Any], tuple, dict]
+
+
+def _set_future(
+    fut: "asyncio.Future[Any]", result: Any, exc: Optional[BaseException]
+) -> None:
+    # The caller may have been cancelled in the meantime.  A proxy in the
+    # result is then released when it is collected.
+    if fut.done():
+        return
+    if exc is None:
+        fut.set_result(result)
+    else:
+        fut.set_exception(exc)
+
+
+def _call_method(obj: Any, name: str, *args: Any, **kw: Any) -> Any:
+    return getattr(obj, name)(*args, **kw)
+
+
+class AsyncApartment:
+    """Runs a single-threaded apartment in a dedicated thread, for use by
+    asyncio code.
+
+    The thread pumps the window messages of the apartment, so that events
+    and calls from other apartments are delivered, and runs the calls that
+    coroutines make with `run`:
+
+        async with AsyncApartment() as apartment:
+            xl = await apartment.create_object("Excel.Application")
+            await xl.Visible.set(True)
+            workbooks = await xl.Workbooks
+            await workbooks.Add()
+
+    COM objects that are returned from the apartment are wrapped in
+    `AsyncProxy` instances, and are only used and released by the
+    apartment thread.
+
+    `subscribe` delivers the events of an object to the event loop.
+    `shutdown` disconnects the subscriptions, releases the objects and
+    stops the thread; calls that were submitted before run first.
+    """
+
+    def __init__(self) -> None:
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._thread_id = 0
+        self._stopped: Optional["asyncio.Future[None]"] = None
+        self._closing = False
+        self._work: "queue.SimpleQueue[_WorkItem]" = queue.SimpleQueue()
+        self._keys = itertools.count()
+        # Only used by the apartment thread.
+        self._objects: dict[int, Any] = {}
+        self._connections: set[int] = set()
+        # Only used by the event loop.
+        self._tasks: set["asyncio.Task[Any]"] = set()
+
+    async def __aenter__(self) -> "AsyncApartment":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.shutdown()
+
+    async def start(self) -> None:
+        """Start the apartment thread."""
+        if self._thread is not None:
+            raise RuntimeError("the apartment has already been started")
+        self._loop = asyncio.get_running_loop()
+        ready = self._loop.create_future()
+        self._stopped = self._loop.create_future()
+        self._thread = threading.Thread(
+            target=self._main, args=(ready,), name="AsyncApartment", daemon=True
+        )
+        self._thread.start()
+        await ready
+
+    async def shutdown(self) -> None:
+        """Stop the apartment thread after the calls that are pending, and
+        cancel the event handlers that are still running.
+        """
+        if self._thread is None or self._stopped is None:
+            return
+        if not self._closing:
+            self._closing = True
+            if self._thread.is_alive():
+                self._post(WM_QUIT)
+        await asyncio.shield(self._stopped)
+        self._thread.join()
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kw: Any) -> Any:
+        """Call 'func(*args, **kw)' in the apartment thread, and return
+        the result.
+
+        Proxies in the arguments are replaced by their objects, and COM
+        objects in the result are returned as proxies.  If the caller is
+        cancelled before the call has started, it is skipped.
+        """
+        if self._loop is None or self._closing:
+            raise RuntimeError("the apartment is not running")
+        fut = self._loop.create_future()
+        self._submit(fut, func, args, kw)
+        return await fut
+
+    async def create_object(self, progid: Any, **kw: Any) -> Any:
+        """Create a COM object in the apartment, like `CreateObject`."""
+        return await self.run(CreateObject, progid, **kw)
+
+    async def subscribe(
+        self, source: Any, handler: Any, interface: Optional[type[IUnknown]] = None
+    ) -> "AsyncConnection":
+        """Receive the events of 'source' on the event loop, like
+        `GetEvents`.
+
+        'handler' is either an `asyncio.Queue`, which receives (name, args)
+        tuples, or an object with methods named after the events; the
+        methods may be coroutine functions.  The events are delivered
+        asynchronously, so the results of the handlers are not returned
+        to the source.
+        """
+        return await self.run(self._advise, source, handler, interface)
+
+    ################################################################
+    # event loop side
+
+    def _submit(
+        self,
+        fut: Optional["asyncio.Future[Any]"],
+        func: Callable[..., Any],
+        args: tuple,
+        kw: dict,
+    ) -> None:
+        self._work.put((fut, func, args, kw))
+        self._post(WM_APP)
+
+    def _post(self, message: int) -> None:
+        if not _PostThreadMessage(self._thread_id, message, 0, 0):
+            raise WinError()
+
+    def _release(self, key: int) -> None:
+        # Called when a proxy is collected, by any thread.
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return  # the objects have been released at shutdown
+        try:
+            self._submit(None, self._drop, (key,), {})
+        except OSError:
+            pass
+
+    def _dispatch_event(self, handler: Any, name: str, args: tuple) -> None:
+        if isinstance(handler, asyncio.Queue):
+            handler.put_nowait((name, args))
+            return
+        try:
+            method = getattr(handler, name)
+        except AttributeError:
+            logger.debug("%r has no handler for %s", handler, name)
+            return
+        result = method(*args)
+        if inspect.isawaitable(result):
+            assert self._loop is not None
+            task = self._loop.create_task(result)  # type: ignore
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    ################################################################
+    # apartment side
+
+    def _main(self, ready: "asyncio.Future[None]") -> None:
+        try:
+            comtypes.CoInitializeEx(comtypes.COINIT_APARTMENTTHREADED)
+        except OSError as details:
+            self._resolve(ready, exc=details)
+            self._resolve(self._stopped)
+            return
+        try:
+            msg = MSG()
+            # Create the message queue of the thread, so that messages can
+            # be posted to it.
+            _PeekMessage(byref(msg), None, WM_APP, WM_APP, PM_NOREMOVE)
+            self._thread_id = _GetCurrentThreadId()
+            loop = messageloop._MessageLoop()
+            loop.insert_filter(self._filter_message)
+            self._resolve(ready)
+            loop.run()
+        except BaseException as details:
+            self._resolve(ready, exc=details)
+            raise
+        finally:
+            self._run_pending()
+            self._close()
+            comtypes.CoUninitialize()
+            self._resolve(self._stopped)
+
+    def _filter_message(self, lpmsg: Any) -> list[bool]:
+        msg = lpmsg._obj
+        if msg.hWnd or msg.message != WM_APP:
+            return []
+        self._run_pending()
+        return [True]
+
+    def _run_pending(self) -> None:
+        while True:
+            try:
+                fut, func, args, kw = self._work.get_nowait()
+            except queue.Empty:
+                return
+            if fut is not None and fut.cancelled():
+                continue
+            try:
+                args = tuple(self._unwrap(a) for a in args)
+                kw = {k: self._unwrap(v) for k, v in kw.items()}
+                result = self._wrap(func(*args, **kw))
+            except Exception as details:
+                if fut is None:
+                    logger.exception("Error in %r", func)
+                else:
+                    self._resolve(fut, exc=details)
+            else:
+                if fut is not None:
+                    self._resolve(fut, result)
+            del fut, func, args, kw
+
+    def _resolve(
+        self,
+        fut: Optional["asyncio.Future[Any]"],
+        result: Any = None,
+        exc: Optional[BaseException] = None,
+    ) -> None:
+        assert self._loop is not None and fut is not None
+        try:
+            self._loop.call_soon_threadsafe(_set_future, fut, result, exc)
+        except RuntimeError:
+            logger.debug("The event loop is closed")
+
+    def _wrap(self, obj: Any) -> Any:
+        if isinstance(obj, (IUnknown, dynamic._Dispatch, lazybind.Dispatch)):
+            if isinstance(obj, IUnknown) and not obj:
+                return None
+            key = next(self._keys)
+            self._objects[key] = obj
+            return AsyncProxy(self, key)
+        if isinstance(obj, tuple):
+            return tuple(self._wrap(o) for o in obj)
+        if isinstance(obj, list):
+            return [self._wrap(o) for o in obj]
+        return obj
+
+    def _unwrap(self, obj: Any) -> Any:
+        if isinstance(obj, AsyncProxy):
+            if obj._apartment is not self:
+                raise ValueError("the object belongs to another apartment")
+            return self._objects[obj._key]
+        return obj
+
+    def _drop(self, key: int) -> None:
+        self._connections.discard(key)
+        self._objects.pop(key, None)
+
+    def _advise(
+        self, source: Any, handler: Any, interface: Optional[type[IUnknown]]
+    ) -> "AsyncConnection":
+        if interface is None:
+            interface = FindOutgoingInterface(source)
+        forwarder = _get_forwarder_class(interface)(self, handler)
+        key = next(self._keys)
+        self._objects[key] = GetEvents(source, forwarder, interface)
+        self._connections.add(key)
+        return AsyncConnection(self, key)
+
+    def _disconnect(self, key: int) -> None:
+        if key in self._connections:
+            self._connections.discard(key)
+            self._objects.pop(key).disconnect()
+
+    def _close(self) -> None:
+        for key in list(self._connections):
+            try:
+                self._disconnect(key)
+            except (COMError, OSError):
+                logger.warning("Could not disconnect", exc_info=True)
+        self._objects.clear()
+
+
+class AsyncProxy:
+    """A COM object in an `AsyncApartment`.
+
+    'await proxy.Method(*args)' calls a method, 'await proxy.Name' gets a
+    property, and 'await proxy.Name.set(value)' sets it, in the apartment
+    thread.  The object is released by the apartment when the proxy is
+    collected.
+    """
+
+    def __init__(self, apartment: AsyncApartment, key: int) -> None:
+        self._apartment = apartment
+        self._key = key
+
+    def __getattr__(self, name: str) -> "_AsyncMember":
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return _AsyncMember(self, name)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self._key} of {self._apartment!r}>"
+
+    def __del__(self) -> None:
+        self._apartment._release(self._key)
+
+
+class _AsyncMember:
+    __slots__ = ("_proxy", "_name")
+
+    def __init__(self, proxy: AsyncProxy, name: str) -> None:
+        self._proxy = proxy
+        self._name = name
+
+    def __call__(self, *args: Any, **kw: Any) -> Any:
+        apartment = self._proxy._apartment
+        return apartment.run(_call_method, self._proxy, self._name, *args, **kw)
+
+    def __await__(self) -> Generator[Any, None, Any]:
+        apartment = self._proxy._apartment
+        return apartment.run(getattr, self._proxy, self._name).__await__()
+
+    def set(self, value: Any) -> Any:
+        apartment = self._proxy._apartment
+        return apartment.run(setattr, self._proxy, self._name, value)
+
+
+class AsyncConnection:
+    """An event subscription of `AsyncApartment.subscribe`."""
+
+    def __init__(self, apartment: AsyncApartment, key: int) -> None:
+        self._apartment = apartment
+        self._key = key
+
+    async def disconnect(self) -> None:
+        """Stop receiving events."""
+        await self._apartment.run(self._apartment._disconnect, self._key)
+
+    def __del__(self) -> None:
+        self._apartment._release(self._key)
+
+
+class _EventForwarder:
+    # Event handler of the apartment thread, that delivers the events to
+    # the event loop.
+    def __init__(self, apartment: AsyncApartment, handler: Any) -> None:
+        self._apartment = apartment
+        self._handler = handler
+
+    def _forward(self, name: str, args: tuple) -> None:
+        apartment = self._apartment
+        args = tuple(apartment._wrap(a) for a in args)
+        assert apartment._loop is not None
+        apartment._loop.call_soon_threadsafe(
+            apartment._dispatch_event, self._handler, name, args
+        )
+
+
+def _make_forward(name: str) -> Callable[..., None]:
+    def forward(self, *args):
+        self._forward(name, args)
+
+    forward.__name__ = name
+    return forward
+
+
+_forwarder_classes: dict[type[IUnknown], type[_EventForwarder]] = {}
+
+
+def _get_forwarder_class(interface: type[IUnknown]) -> type[_EventForwarder]:
+    # One class per interface, so that the event sinks of all subscriptions
+    # share a Sink class.
+    try:
+        return _forwarder_classes[interface]
+    except KeyError:
+        pass
+    if hasattr(interface, "_disp_methods_"):
+        names = [m.name for m in interface._disp_methods_ if m.what == "DISPMETHOD"]
+    else:
+        names = [m.name for m in interface._methods_]
+    namespace = {name: _make_forward(name) for name in names}
+    cls = type(f"{interface.__name__}Forwarder", (_EventForwarder,), namespace)
+    return _forwarder_classes.setdefault(interface, cls)
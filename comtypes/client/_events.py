@@ -1,8 +1,12 @@
 import ctypes
+import inspect
 import logging
+import threading
 import traceback
+import types
+import weakref
 from _ctypes import COMError
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from ctypes import HRESULT, POINTER, WINFUNCTYPE, OleDLL, Structure, WinDLL, byref
 from ctypes.wintypes import (
     BOOL,
@@ -20,6 +24,14 @@ from typing import Union as _UnionT
 import comtypes
 from comtypes import COMObject, IUnknown, hresult
 from comtypes._comobject import _MethodFinder
+from comtypes._vtbl import (
+    _ClassMethodFinder,
+    _InstanceBoundImpl,
+    _this_registry,
+    compile_dispparams,
+    create_dispimpl,
+    get_vtbl_template,
+)
 from comtypes.automation import DISPATCH_METHOD, IDispatch
 from comtypes.client._generate import GetModule
 from comtypes.connectionpoints import IConnectionPoint, IConnectionPointContainer
@@ -110,8 +122,27 @@ class _AdviseConnection:
             pass
 
 
+# Maps CLSIDs to the default outgoing interfaces of their objects.
+_outgoing_interfaces: dict[str, type[IUnknown]] = {}
+
+
 def FindOutgoingInterface(source: IUnknown) -> type[IUnknown]:
     """XXX Describe the strategy that is used..."""
+    # The interface is cached for objects whose CLSID is known (__clsid
+    # has been set by comtypes.client).
+    clsid = source.__dict__.get("__clsid")
+    if clsid is None or clsid == "None":
+        return _find_outgoing_interface(source)
+    try:
+        return _outgoing_interfaces[clsid]
+    except KeyError:
+        pass
+    interface = _find_outgoing_interface(source)
+    _outgoing_interfaces[clsid] = interface
+    return interface
+
+
+def _find_outgoing_interface(source: IUnknown) -> type[IUnknown]:
     # If the COM object implements IProvideClassInfo2, it is easy to
     # find the default outgoing interface.
     try:
@@ -238,7 +269,130 @@ class _SinkMethodFinder(_MethodFinder):
                 return getattr(self.sink, mthname)
 
 
+def _forward_to_handler(name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    # A method of a Sink class that calls the handler method 'name' of
+    # the sink, with the signature convention of 'func'.  The method is
+    # looked up on every call, so that the Sink class does not keep the
+    # handler class alive.
+    if func.__code__.co_varnames[1:2] == ("this",):
+
+        def forward(self, this, *args, **kw):
+            handler = self._handler
+            return getattr(type(handler), name)(handler, this, *args, **kw)
+
+    else:
+
+        def forward(self, *args, **kw):
+            handler = self._handler
+            return getattr(type(handler), name)(handler, *args, **kw)
+
+    return report_errors(forward)
+
+
+class _SinkClassMethodFinder(_ClassMethodFinder):
+    """Special ClassMethodFinder for the shared Sink classes.  Looks for
+    methods on the Sink class first, then on the class of the handler,
+    and records the handler attributes it looked for.
+    """
+
+    def __init__(self, cls: type[COMObject], handler_cls: type) -> None:
+        super().__init__(cls, _this_registry.lookup)
+        self.handler_cls = handler_cls
+        self.handler_names: set[str] = set()
+
+    def find_method(self, fq_name: str, mthname: str) -> Callable[..., Any]:
+        try:
+            return super().find_method(fq_name, mthname)
+        except AttributeError:
+            pass
+        self.handler_names.update((fq_name, mthname))
+        for name in (fq_name, mthname):
+            try:
+                func = inspect.getattr_static(self.handler_cls, name)
+            except AttributeError:
+                continue
+            if not isinstance(func, types.FunctionType):
+                raise _InstanceBoundImpl(name)
+            return _forward_to_handler(name, func)
+        raise AttributeError(mthname)
+
+
+def _create_dispimpl(
+    interface: type[IUnknown], finder: _MethodFinder
+) -> dict[tuple[comtypes.dispid, int], Callable[..., Any]]:
+    # Since our Sink object doesn't have typeinfo, it needs a
+    # _dispimpl_ dictionary to dispatch events received via Invoke.
+    if hasattr(interface, "_disp_methods_"):
+        return create_dispimpl(interface, finder)
+    dispimpl = {}
+    for m in interface._methods_:
+        # Can dispid be at a different index? Should check code generator...
+        # ...but hand-written code should also work...
+        dispid = m.idlflags[0]
+        assert isinstance(dispid, comtypes.dispid)
+        impl = finder.get_impl(interface, m.name, m.paramflags, m.idlflags)
+        impl.unpack_dispparams = compile_dispparams(m.paramflags, DISPATCH_METHOD)
+        # XXX Wouldn't work for 'propget', 'propput', 'propputref'
+        # methods - are they allowed on event interfaces?
+        dispimpl[(dispid, DISPATCH_METHOD)] = impl
+    return dispimpl
+
+
+class _Sink(COMObject):
+    _handler_names_: frozenset[str]
+
+    def __init__(self, handler: Any) -> None:
+        self._handler = handler
+
+
+_SinkClasses = dict[type[IUnknown], Optional[type[_Sink]]]
+
+# The {interface: Sink class} dictionaries of the handler classes.  The
+# value for an interface is None when the handler methods must be found on
+# the handler instances.
+_sink_classes: "weakref.WeakKeyDictionary[type, _SinkClasses]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_sink_class(
+    interface: type[IUnknown], handler_cls: type
+) -> Optional[type[_Sink]]:
+    sink_classes = _sink_classes.get(handler_cls)
+    if sink_classes is None:
+        sink_classes = _sink_classes[handler_cls] = {}
+    elif interface in sink_classes:
+        return sink_classes[interface]
+    sink_cls: Optional[type[_Sink]] = None
+    # Handlers that create their methods on demand are left out.
+    if not hasattr(handler_cls, "__getattr__") and (
+        handler_cls.__getattribute__ is object.__getattribute__
+    ):
+        sink_cls = type("Sink", (_Sink,), {"_com_interfaces_": [interface]})
+        finder = _SinkClassMethodFinder(sink_cls, handler_cls)
+        try:
+            # The virtual function table is created once for the class.
+            if get_vtbl_template(sink_cls, interface, finder) is None:
+                sink_cls = None
+            elif issubclass(interface, IDispatch):
+                sink_cls._dispimpl_ = _create_dispimpl(interface, finder)
+        except _InstanceBoundImpl:
+            sink_cls = None
+        if sink_cls is not None:
+            sink_cls._handler_names_ = frozenset(finder.handler_names)
+    sink_classes[interface] = sink_cls
+    return sink_cls
+
+
 def CreateEventReceiver(interface: type[IUnknown], handler: Any) -> COMObject:
+    sink_cls = _get_sink_class(interface, type(handler))
+    # The attributes of the handler instance take precedence over the
+    # methods of its class.
+    if sink_cls is not None and sink_cls._handler_names_.isdisjoint(
+        getattr(handler, "__dict__", ())
+    ):
+        return sink_cls(handler)
+
     class Sink(COMObject):
         _com_interfaces_ = [interface]
 
@@ -249,20 +403,10 @@ def CreateEventReceiver(interface: type[IUnknown], handler: Any) -> COMObject:
 
     sink = Sink()
 
-    # Since our Sink object doesn't have typeinfo, it needs a
-    # _dispimpl_ dictionary to dispatch events received via Invoke.
     if issubclass(interface, IDispatch) and not hasattr(sink, "_dispimpl_"):
-        finder = sink._get_method_finder_(interface)
-        dispimpl = sink._dispimpl_ = {}
-        for m in interface._methods_:
-            # Can dispid be at a different index? Should check code generator...
-            # ...but hand-written code should also work...
-            dispid = m.idlflags[0]
-            assert isinstance(dispid, comtypes.dispid)
-            impl = finder.get_impl(interface, m.name, m.paramflags, m.idlflags)
-            # XXX Wouldn't work for 'propget', 'propput', 'propputref'
-            # methods - are they allowed on event interfaces?
-            dispimpl[(dispid, DISPATCH_METHOD)] = impl
+        sink._dispimpl_ = _create_dispimpl(
+            interface, sink._get_method_finder_(interface)
+        )
 
     return sink
 
@@ -312,11 +456,6 @@ def ShowEvents(
     return GetEvents(source, sink=EventDumper(), interface=interface)
 
 
-# This type is used inside 'PumpEvents', but if we create the type
-# afresh each time 'PumpEvents' is called we end up creating cyclic
-# garbage for each call.  So we define it here instead.
-_handles_type = ctypes.c_void_p * 1
-
 # The type of control signal received by the handler.
 CTRL_C_EVENT = 0
 CTRL_BREAK_EVENT = 1
@@ -333,60 +472,152 @@ COWAIT_INPUTAVAILABLE = 4
 COWAIT_DISPATCH_CALLS = 8
 COWAIT_DISPATCH_WINDOW_MESSAGES = 16
 
+INFINITE = 0xFFFFFFFF
 
-def PumpEvents(timeout: Any) -> None:
-    """This following code waits for 'timeout' seconds in the way
-    required for COM, internally doing the correct things depending
-    on the COM appartment of the current thread.  It is possible to
-    terminate the message loop by pressing CTRL+C, which will raise
-    a KeyboardInterrupt.
+
+class EventPump:
+    """Waits for COM events like 'PumpEvents', but creates its event
+    handles and its console control handler only once, so that it can
+    be driven repeatedly, in short slices, at low cost.
+
+    'handles' are additional waitable handles, owned by the caller,
+    that terminate a wait when they are signaled.  'wakeup' may be
+    called from any thread to terminate the current or the next wait.
+    'wait' is the function used to wait, with the signature of
+    CoWaitForMultipleHandles.
     """
-    # XXX Should there be a way to pass additional event handles which
-    # can terminate this function?
-
-    # XXX XXX XXX
-    #
-    # It may be that I misunderstood the CoWaitForMultipleHandles
-    # function.  Is a message loop required in a STA?  Seems so...
-    #
-    # MSDN says:
-    #
-    # If the caller resides in a single-thread apartment,
-    # CoWaitForMultipleHandles enters the COM modal loop, and the
-    # thread's message loop will continue to dispatch messages using
-    # the thread's message filter. If no message filter is registered
-    # for the thread, the default COM message processing is used.
-    #
-    # If the calling thread resides in a multithread apartment (MTA),
-    # CoWaitForMultipleHandles calls the Win32 function
-    # MsgWaitForMultipleObjects.
-
-    hevt = _CreateEventA(None, True, False, None)
-    handles = _handles_type(hevt)
-
-    # @ctypes.WINFUNCTYPE(BOOL, DWORD)
-    def HandlerRoutine(dwCtrlType):
-        if dwCtrlType == CTRL_C_EVENT:  # CTRL+C
-            _SetEvent(hevt)
-            return 1
-        return 0
-
-    _SetConsoleCtrlHandler(PHANDLER_ROUTINE(HandlerRoutine), 1)
 
-    try:
+    def __init__(
+        self,
+        handles: Sequence[int] = (),
+        flags: int = COWAIT_DEFAULT,
+        wait: Optional[Callable[..., Any]] = None,
+    ) -> None:
+        self.flags = flags
+        self._wait = _CoWaitForMultipleHandles if wait is None else wait
+        self._index = ctypes.c_ulong()
+        # Auto-reset events, so nothing has to be reset after a wait.
+        hinterrupt = self._hinterrupt = _CreateEventA(None, False, False, None)
+        self.wakeup_handle: int = _CreateEventA(None, False, False, None)
+        self._extra = list(handles)
+        self._update_handles()
+        # CTRL+C is only swallowed while pumping; at other times the
+        # next handler, usually the one raising KeyboardInterrupt, runs.
+        pumping = self._pumping = threading.Event()
+
+        # @ctypes.WINFUNCTYPE(BOOL, DWORD)
+        def HandlerRoutine(dwCtrlType):
+            if dwCtrlType == CTRL_C_EVENT and pumping.is_set():  # CTRL+C
+                _SetEvent(hinterrupt)
+                return 1
+            return 0
+
+        self._routine = PHANDLER_ROUTINE(HandlerRoutine)
+        _SetConsoleCtrlHandler(self._routine, 1)
+
+    def _update_handles(self) -> None:
+        handles = [self._hinterrupt, self.wakeup_handle] + self._extra
+        self._handles = (ctypes.c_void_p * len(handles))(*handles)
+
+    @property
+    def handles(self) -> list[int]:
+        """The additional handles that terminate a wait."""
+        return list(self._extra)
+
+    def add_handle(self, handle: int) -> None:
+        """Add a handle that terminates a wait when it is signaled."""
+        self._extra.append(handle)
+        self._update_handles()
+
+    def remove_handle(self, handle: int) -> None:
+        """Remove a handle added before."""
+        self._extra.remove(handle)
+        self._update_handles()
+
+    def wakeup(self) -> None:
+        """Terminate the current wait, or the next one if there is none.
+        This can be called from any thread."""
+        _SetEvent(self.wakeup_handle)
+
+    def pump(self, timeout: Optional[float]) -> Optional[int]:
+        """Wait up to 'timeout' seconds, or forever if it is None, in the
+        way required for COM.  Returns the handle that terminated the
+        wait, which is 'wakeup_handle' after a call to 'wakeup', or None
+        when the timeout expired.  Pressing CTRL+C raises a
+        KeyboardInterrupt.
+        """
+        # XXX XXX XXX
+        #
+        # It may be that I misunderstood the CoWaitForMultipleHandles
+        # function.  Is a message loop required in a STA?  Seems so...
+        #
+        # MSDN says:
+        #
+        # If the caller resides in a single-thread apartment,
+        # CoWaitForMultipleHandles enters the COM modal loop, and the
+        # thread's message loop will continue to dispatch messages using
+        # the thread's message filter. If no message filter is registered
+        # for the thread, the default COM message processing is used.
+        #
+        # If the calling thread resides in a multithread apartment (MTA),
+        # CoWaitForMultipleHandles calls the Win32 function
+        # MsgWaitForMultipleObjects.
+        handles = self._handles
+        if handles is None:
+            raise RuntimeError("the event pump is closed")
+        milliseconds = INFINITE if timeout is None else int(timeout * 1000)
+        self._pumping.set()
         try:
-            _CoWaitForMultipleHandles(
-                COWAIT_DEFAULT,
-                int(timeout * 1000),
-                len(handles),
-                handles,
-                byref(ctypes.c_ulong()),
+            self._wait(
+                self.flags, milliseconds, len(handles), handles, byref(self._index)
             )
         except OSError as details:
             if details.winerror != hresult.RPC_S_CALLPENDING:  # timeout expired
                 raise
-        else:
+            return None
+        finally:
+            self._pumping.clear()
+        index = self._index.value
+        if index == 0:
             raise KeyboardInterrupt
-    finally:
-        _CloseHandle(hevt)
-        _SetConsoleCtrlHandler(PHANDLER_ROUTINE(HandlerRoutine), 0)
+        return handles[index]
+
+    def close(self) -> None:
+        """Remove the console control handler and close the handles owned
+        by the pump."""
+        if self._handles is None:
+            return
+        self._handles = None
+        _SetConsoleCtrlHandler(self._routine, 0)
+        _CloseHandle(self._hinterrupt)
+        _CloseHandle(self.wakeup_handle)
+
+    def __enter__(self) -> "EventPump":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        if getattr(self, "_handles", None) is not None:
+            self.close()
+
+
+# 'PumpEvents' reuses one pump per thread.
+_pumps = threading.local()
+
+
+def PumpEvents(timeout: Any) -> None:
+    """This following code waits for 'timeout' seconds in the way
+    required for COM, internally doing the correct things depending
+    on the COM appartment of the current thread.  It is possible to
+    terminate the message loop by pressing CTRL+C, which will raise
+    a KeyboardInterrupt.
+
+    Use an 'EventPump' to wait for additional handles.
+    """
+    try:
+        pump = _pumps.pump
+    except AttributeError:
+        pump = _pumps.pump = EventPump()
+    pump.pump(timeout)
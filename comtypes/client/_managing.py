@@ -1,5 +1,8 @@
 import logging
+import threading
+import weakref
 from _ctypes import COMError
+from ctypes import c_void_p
 from typing import Any, Optional
 
 import comtypes
@@ -10,12 +13,68 @@ from comtypes.client._generate import GetModule
 logger = logging.getLogger(__name__)
 
 
+class _IdentityMap:
+    """Maps COM object identities to the wrappers that were returned for
+    them, as long as the wrappers are alive.
+
+    The identity of an object is the value of its IUnknown pointer.  A live
+    wrapper holds a reference to the object, so the value cannot be reused
+    by another object while the wrapper is in the map.  The keys contain
+    the thread, because interface pointers must not be shared between
+    apartments.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._wrappers: "weakref.WeakValueDictionary[tuple[int, int, Any], Any]" = (
+            weakref.WeakValueDictionary()
+        )
+
+    def key(self, punk: Any, kind: Any) -> Optional[tuple[int, int, Any]]:
+        try:
+            unk = punk.QueryInterface(IUnknown)
+        except COMError:
+            return None
+        return threading.get_ident(), c_void_p.from_buffer(unk).value, kind  # type: ignore
+
+    def get(self, key: tuple[int, int, Any]) -> Any:
+        return self._wrappers.get(key)
+
+    def add(self, key: tuple[int, int, Any], wrapper: Any) -> Any:
+        # Another thread may have added a wrapper in the meantime; the
+        # discarded one releases its reference when it is collected.
+        with self._lock:
+            return self._wrappers.setdefault(key, wrapper)
+
+
+_identity_map: Optional[_IdentityMap] = None
+
+
+def enable_identity_map(enabled: bool = True) -> None:
+    """Return the same wrapper each time a COM object is returned from
+    `GetBestInterface` or from a method call, while the wrapper is alive.
+
+    Attributes that are set on a wrapper are then kept for the object.
+    Finding the identity costs a QueryInterface call per returned object.
+    """
+    global _identity_map
+    _identity_map = _IdentityMap() if enabled else None
+
+
 def wrap_outparam(punk: Any) -> Any:
     logger.debug("wrap_outparam(%s)", punk)
     if not punk:
         return None
     if punk.__com_interface__ == automation.IDispatch:
         return GetBestInterface(punk)
+    identities = _identity_map
+    if identities is not None:
+        key = identities.key(punk, type(punk))
+        if key is not None:
+            wrapper = identities.get(key)
+            if wrapper is None:
+                wrapper = identities.add(key, punk)
+            return wrapper
     return punk
 
 
@@ -30,56 +89,161 @@ def GetBestInterface(punk: Any) -> Any:
     """
     if not punk:  # NULL COM pointer
         return punk  # or should we return None?
-    # find the typelib and the interface name
+    identities = _identity_map
+    if identities is not None:
+        # 'None' stands for the best interface, whichever it is.
+        key = identities.key(punk, None)
+        if key is not None:
+            wrapper = identities.get(key)
+            if wrapper is None:
+                wrapper = identities.add(key, _get_best_interface(punk))
+            return wrapper
+    return _get_best_interface(punk)
+
+
+_best_interfaces: dict[Any, Optional[type[IUnknown]]] = {}
+
+
+def clear_interface_cache() -> None:
+    """Forget the default interfaces that `GetBestInterface` has found.
+
+    The default interface is looked up once per coclass, or per dispatch
+    type for objects that do not provide their class info, and is then
+    only queried for on the other objects.  Objects for which no interface
+    was found, also when the query fails, are wrapped for dynamic
+    dispatch, or returned as they are.  Clear the cache when a type library
+    has been registered again while the process is running.
+    """
+    _best_interfaces.clear()
+
+
+def _type_key(punk: Any) -> tuple[Any, Any]:
+    # A key for the default interface of an object, that is cheaper to get
+    # than the interface itself: its CLSID, or the GUID and version of its
+    # dispatch type.  Returned with the type info the key was read from.
+    clsid = punk.__dict__.get("__clsid")
+    if clsid is not None and clsid != "None":
+        return GUID(clsid), None
+    tinfo = _type_info(punk)
+    if tinfo is None:
+        return None, None
+    ta = tinfo.GetTypeAttr()
+    if ta.typekind == typeinfo.TKIND_COCLASS:
+        return ta.guid, tinfo
+    return (ta.guid, ta.wMajorVerNum, ta.wMinorVerNum), tinfo
+
+
+def _get_best_interface(punk: Any) -> Any:
     logger.debug("GetBestInterface(%s)", punk)
-    try:
+    key, tinfo = _type_key(punk)
+    if key is None:
+        interface = _find_best_interface(punk, tinfo)
+    else:
         try:
-            pci = punk.QueryInterface(typeinfo.IProvideClassInfo)
-            logger.debug("Does implement IProvideClassInfo")
-        except COMError:
-            # Some COM objects support IProvideClassInfo2, but not IProvideClassInfo.
-            # These objects are broken, but we support them anyway.
-            logger.debug(
-                "Does NOT implement IProvideClassInfo, trying IProvideClassInfo2"
-            )
-            pci = punk.QueryInterface(typeinfo.IProvideClassInfo2)
-            logger.debug("Does implement IProvideClassInfo2")
-        tinfo = pci.GetClassInfo()  # TypeInfo for the CoClass
-        # find the interface marked as default
-        ta = tinfo.GetTypeAttr()
-        for index in range(ta.cImplTypes):
-            if tinfo.GetImplTypeFlags(index) == 1:
-                break
+            interface = _best_interfaces[key]
+        except KeyError:
+            interface = _find_best_interface(punk, tinfo)
+            interface = _best_interfaces.setdefault(key, interface)
         else:
-            if ta.cImplTypes != 1:
-                # Hm, should we use dynamic now?
-                raise TypeError("No default interface found")
-            # Only one interface implemented, use that (even if
-            # not marked as default).
-            index = 0
-        href = tinfo.GetRefTypeOfImplType(index)
-        tinfo = tinfo.GetRefTypeInfo(href)
+            logger.debug("Default interface of %s is cached: %s", key, interface)
+    if interface is not None:
+        # QI for this interface
+        # XXX
+        # What to do if this fails?
+        # In the following example the engine.Eval() call returns
+        # such an object.
+        #
+        # engine = CreateObject("MsScriptControl.ScriptControl")
+        # engine.Language = "JScript"
+        # engine.Eval("[1, 2, 3]")
+        result = punk.QueryInterface(interface)
+        logger.debug("Final result is %s", result)
+        return result
+    try:
+        pdisp = punk.QueryInterface(automation.IDispatch)
+    except COMError:
+        logger.debug("No Dispatch interface: %s", punk)
+        return punk
+    logger.debug("Returning dynamic object")
+    return comtypes.client.dynamic.Dispatch(pdisp)
+
+
+def _provide_class_info(punk: Any) -> Any:
+    try:
+        pci = punk.QueryInterface(typeinfo.IProvideClassInfo)
+        logger.debug("Does implement IProvideClassInfo")
+    except COMError:
+        # Some COM objects support IProvideClassInfo2, but not IProvideClassInfo.
+        # These objects are broken, but we support them anyway.
+        logger.debug("Does NOT implement IProvideClassInfo, trying IProvideClassInfo2")
+        pci = punk.QueryInterface(typeinfo.IProvideClassInfo2)
+        logger.debug("Does implement IProvideClassInfo2")
+    return pci
+
+
+def _type_info(punk: Any) -> Any:
+    # The TypeInfo for the CoClass of the object, or else for its dispatch
+    # interface, or None.
+    try:
+        return _provide_class_info(punk).GetClassInfo()
     except COMError:
         logger.debug("Does NOT implement IProvideClassInfo/IProvideClassInfo2")
+    return _dispatch_type_info(punk)
+
+
+def _dispatch_type_info(punk: Any) -> Any:
+    try:
+        pdisp = punk.QueryInterface(automation.IDispatch)
+    except COMError:
+        return None
+    try:
+        return pdisp.GetTypeInfo(0)
+    except COMError:
+        logger.debug("IDispatch.GetTypeInfo(0) failed: %s" % pdisp)
+        return None
+
+
+def _default_interface(tinfo: Any, ta: Any) -> Any:
+    # find the interface marked as default
+    for index in range(ta.cImplTypes):
+        if tinfo.GetImplTypeFlags(index) == 1:
+            break
+    else:
+        if ta.cImplTypes != 1:
+            # Hm, should we use dynamic now?
+            raise TypeError("No default interface found")
+        # Only one interface implemented, use that (even if
+        # not marked as default).
+        index = 0
+    href = tinfo.GetRefTypeOfImplType(index)
+    return tinfo.GetRefTypeInfo(href)
+
+
+def _find_best_interface(punk: Any, tinfo: Any = None) -> Optional[type[IUnknown]]:
+    # Returns the Python class of the default interface of the object, or
+    # None to use dynamic dispatch.  'tinfo' is the TypeInfo of the object
+    # from `_type_info`, if it is already known.
+    if tinfo is None:
+        tinfo = _type_info(punk)
+        if tinfo is None:
+            return None
+    typeattr = tinfo.GetTypeAttr()
+    if typeattr.typekind == typeinfo.TKIND_COCLASS:
         try:
-            pdisp = punk.QueryInterface(automation.IDispatch)
-        except COMError:
-            logger.debug("No Dispatch interface: %s", punk)
-            return punk
-        try:
-            tinfo = pdisp.GetTypeInfo(0)
+            tinfo = _default_interface(tinfo, typeattr)
         except COMError:
-            pdisp = comtypes.client.dynamic.Dispatch(pdisp)
-            logger.debug("IDispatch.GetTypeInfo(0) failed: %s" % pdisp)
-            return pdisp
-    typeattr = tinfo.GetTypeAttr()
+            tinfo = _dispatch_type_info(punk)
+            if tinfo is None:
+                return None
+        typeattr = tinfo.GetTypeAttr()
     logger.debug("Default interface is %s", typeattr.guid)
     try:
         punk.QueryInterface(IUnknown, typeattr.guid)
     except COMError:
-        logger.debug("Does not implement default interface, returning dynamic object")
-        return comtypes.client.dynamic.Dispatch(punk)
+        logger.debug("Does not implement default interface")
+        return None
 
+    # find the typelib and the interface name
     itf_name = tinfo.GetDocumentation(-1)[0]  # interface name
     tlib = tinfo.GetContainingTypeLib()[0]  # typelib
 
@@ -88,21 +252,7 @@ def GetBestInterface(punk: Any) -> Any:
     # Python interface class
     interface = getattr(mod, itf_name)
     logger.debug("Implements default interface from typeinfo %s", interface)
-    # QI for this interface
-    # XXX
-    # What to do if this fails?
-    # In the following example the engine.Eval() call returns
-    # such an object.
-    #
-    # engine = CreateObject("MsScriptControl.ScriptControl")
-    # engine.Language = "JScript"
-    # engine.Eval("[1, 2, 3]")
-    #
-    # Could the above code, as an optimization, check that QI works,
-    # *before* generating the wrapper module?
-    result = punk.QueryInterface(interface)
-    logger.debug("Final result is %s", result)
-    return result
+    return interface
 
 
 def _manage(
@@ -0,0 +1,348 @@
+import logging
+import threading
+import time
+from _ctypes import COMError
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from ctypes import WinDLL
+from ctypes.wintypes import BOOL, DWORD, HANDLE, UINT
+from typing import Any, Optional
+
+from comtypes import IUnknown, automation
+
+logger = logging.getLogger(__name__)
+
+_kernel32 = WinDLL("kernel32")
+
+_OpenProcess = _kernel32.OpenProcess
+_OpenProcess.argtypes = [DWORD, BOOL, DWORD]
+_OpenProcess.restype = HANDLE
+
+_TerminateProcess = _kernel32.TerminateProcess
+_TerminateProcess.argtypes = [HANDLE, UINT]
+_TerminateProcess.restype = BOOL
+
+_CloseHandle = _kernel32.CloseHandle
+_CloseHandle.argtypes = [HANDLE]
+_CloseHandle.restype = BOOL
+
+PROCESS_TERMINATE = 0x0001
+
+
+def _terminate_process(pid: int) -> None:
+    handle = _OpenProcess(PROCESS_TERMINATE, False, pid)
+    if not handle:
+        logger.warning("Could not open process %d", pid)
+        return
+    try:
+        if not _TerminateProcess(handle, 1):
+            logger.warning("Could not terminate process %d", pid)
+    finally:
+        _CloseHandle(handle)
+
+
+def _get_type_info_count(obj: Any) -> None:
+    # one round trip to the server, without side effects.
+    if not isinstance(obj, automation.IDispatch):
+        obj = obj.QueryInterface(automation.IDispatch)
+    obj.GetTypeInfoCount()
+
+
+class _Entry:
+    __slots__ = ("ref", "created", "uses", "pid", "terminated")
+
+    def __init__(self, ref: Any, pid: Optional[int]) -> None:
+        # the object, or its cookie in the global interface table.
+        self.ref = ref
+        self.created = time.monotonic()
+        self.uses = 0
+        self.pid = pid
+        self.terminated = False
+
+
+class ObjectPool:
+    """A pool of warm instances of expensive COM servers, like the
+    automation servers of office applications.
+
+    'create' is called without arguments to start a new instance, for
+    example 'lambda: CreateObject("Excel.Application")'.  At most 'size'
+    instances are alive at the same time.
+
+    'probe' is called with an instance before it is checked out, the
+    default calls IDispatch::GetTypeInfoCount; 'reset' is called when an
+    instance is checked in.  Instances for which one of them raises a
+    COMError or OSError are evicted, as are instances older than 'max_age'
+    seconds or used 'max_uses' times.  'close' is called with the evicted
+    instances that still respond, for example 'lambda xl: xl.Quit()'.
+
+    If 'process_id' is given, it is called with new instances and returns
+    the id of the server process, which is terminated when the instance
+    fails the probe or the reset, or does not return from them within
+    'hook_timeout' seconds.  A hung call returns when the process is gone.
+
+    With 'marshal=True', the instances are kept in the global interface
+    table, so that they can be checked out by any apartment; 'create' must
+    then return COM pointers, and the instances are checked out as pointers
+    to 'interface' passed to 'wrap', by default 'GetBestInterface', also
+    the first time.  With 'marshal=False', the pool may only be used by
+    one apartment.
+    """
+
+    def __init__(
+        self,
+        create: Callable[[], Any],
+        size: int = 4,
+        max_age: Optional[float] = None,
+        max_uses: Optional[int] = None,
+        probe: Optional[Callable[[Any], Any]] = _get_type_info_count,
+        reset: Optional[Callable[[Any], Any]] = None,
+        close: Optional[Callable[[Any], Any]] = None,
+        process_id: Optional[Callable[[Any], int]] = None,
+        hook_timeout: Optional[float] = 30.0,
+        interface: type[IUnknown] = automation.IDispatch,
+        marshal: bool = True,
+        wrap: Optional[Callable[[Any], Any]] = None,
+    ) -> None:
+        self.create = create
+        self.size = size
+        self.max_age = max_age
+        self.max_uses = max_uses
+        self.probe = probe
+        self.reset = reset
+        self.close = close
+        self.process_id = process_id
+        self.hook_timeout = hook_timeout
+        self.interface = interface
+        self.marshal = marshal
+        if wrap is None:
+            from comtypes.client import GetBestInterface as wrap
+        self.wrap = wrap
+        self._cond = threading.Condition()
+        self._idle: list[_Entry] = []
+        self._busy: dict[int, tuple[Any, _Entry]] = {}
+        self._count = 0  # idle, busy and starting instances
+        self._closed = False
+        self.hits = 0
+        self.spawns = 0
+        self.evictions = 0
+        self.terminations = 0
+
+    def stats(self) -> dict[str, int]:
+        """Return the counters of the pool."""
+        with self._cond:
+            return {
+                "hits": self.hits,
+                "spawns": self.spawns,
+                "evictions": self.evictions,
+                "terminations": self.terminations,
+                "idle": len(self._idle),
+                "busy": len(self._busy),
+            }
+
+    def checkout(self, timeout: Optional[float] = None) -> Any:
+        """Return an instance for exclusive use by the calling thread,
+        until it is passed to 'checkin'.  Waits up to 'timeout' seconds
+        for a free instance, and raises TimeoutError after that.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._cond:
+                entry = self._take(deadline)
+            if entry is None:
+                return self._spawn()
+            try:
+                obj = self._unmarshal(entry)
+            except (COMError, OSError):
+                logger.warning("Instance %r is gone", entry.ref, exc_info=True)
+                self._evict(entry, None)
+                continue
+            except BaseException:
+                self._evict(entry, None)
+                raise
+            if self._is_expired(entry):
+                self._evict(entry, obj, healthy=True)
+                continue
+            try:
+                healthy = self._call(self.probe, obj, entry)
+            except BaseException:
+                self._evict(entry, obj)
+                raise
+            if not healthy:
+                self._evict(entry, obj)
+                continue
+            with self._cond:
+                self.hits += 1
+                entry.uses += 1
+                self._busy[id(obj)] = (obj, entry)
+            return obj
+
+    def _take(self, deadline: Optional[float]) -> Optional[_Entry]:
+        # Returns an idle entry, or None after reserving room for a new one.
+        while True:
+            if self._closed:
+                raise RuntimeError("the pool is closed")
+            if self._idle:
+                return self._idle.pop()
+            if self._count < self.size:
+                self._count += 1
+                return None
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise TimeoutError("no instance became available")
+            self._cond.wait(remaining)
+
+    def _spawn(self) -> Any:
+        entry = None
+        try:
+            obj = self.create()
+            pid = None if self.process_id is None else self.process_id(obj)
+            if self.marshal:
+                from comtypes import git
+
+                entry = _Entry(git.RegisterInterfaceInGlobal(obj, self.interface), pid)
+                # checked out like the instances that are reused.
+                obj = self._unmarshal(entry)
+            else:
+                entry = _Entry(obj, pid)
+        except BaseException:
+            if entry is not None:
+                self._evict(entry, None)
+            else:
+                with self._cond:
+                    self._count -= 1
+                    self._cond.notify()
+            raise
+        logger.debug("Started instance %r", obj)
+        with self._cond:
+            self.spawns += 1
+            entry.uses += 1
+            self._busy[id(obj)] = (obj, entry)
+        return obj
+
+    def checkin(self, obj: Any, discard: bool = False) -> None:
+        """Return an instance to the pool after calling 'reset' on it, or
+        evict it if 'discard' is true.  This must be called by the thread
+        that checked out the instance.
+        """
+        with self._cond:
+            try:
+                _, entry = self._busy.pop(id(obj))
+            except KeyError:
+                raise ValueError(f"{obj!r} is not checked out from this pool") from None
+        if discard or self._closed:
+            self._evict(entry, obj, healthy=True)
+            return
+        try:
+            healthy = self._call(self.reset, obj, entry)
+        except BaseException:
+            self._evict(entry, obj)
+            raise
+        if not healthy:
+            self._evict(entry, obj)
+            return
+        if self._is_expired(entry) or (
+            self.max_uses is not None and entry.uses >= self.max_uses
+        ):
+            self._evict(entry, obj, healthy=True)
+            return
+        with self._cond:
+            self._idle.append(entry)
+            self._cond.notify()
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """Context manager that checks out an instance, and checks it in
+        again on exit; instances are discarded when the block raises a
+        COMError."""
+        obj = self.checkout(timeout)
+        discard = False
+        try:
+            yield obj
+        except COMError:
+            discard = True
+            raise
+        finally:
+            self.checkin(obj, discard)
+
+    def shutdown(self) -> None:
+        """Evict the idle instances, and the busy ones when they are
+        checked in."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for entry in idle:
+            try:
+                obj = self._unmarshal(entry)
+            except (COMError, OSError):
+                logger.warning("Instance %r is gone", entry.ref, exc_info=True)
+                self._evict(entry, None)
+            else:
+                self._evict(entry, obj, healthy=True)
+
+    def _unmarshal(self, entry: _Entry) -> Any:
+        if not self.marshal:
+            return entry.ref
+        from comtypes import git
+
+        return self.wrap(git.GetInterfaceFromGlobal(entry.ref, self.interface))
+
+    def _is_expired(self, entry: _Entry) -> bool:
+        return (
+            self.max_age is not None and time.monotonic() - entry.created > self.max_age
+        )
+
+    def _call(
+        self, hook: Optional[Callable[[Any], Any]], obj: Any, entry: _Entry
+    ) -> bool:
+        # Returns False if the instance failed or hung in the hook; other
+        # exceptions than COMError and OSError are raised.
+        if hook is None:
+            return True
+        watchdog = None
+        if entry.pid is not None and self.hook_timeout is not None:
+            watchdog = threading.Timer(self.hook_timeout, self._terminate, (entry,))
+            watchdog.daemon = True
+            watchdog.start()
+        try:
+            hook(obj)
+        except (COMError, OSError):
+            logger.warning("Instance %r failed", obj, exc_info=True)
+            self._terminate(entry)
+            return False
+        finally:
+            if watchdog is not None:
+                watchdog.cancel()
+        with self._cond:
+            # the watchdog may have fired while the call returned.
+            return not entry.terminated
+
+    def _terminate(self, entry: _Entry) -> None:
+        # Called by the watchdog thread, or after a failed call.
+        with self._cond:
+            if entry.pid is None or entry.terminated:
+                return
+            entry.terminated = True
+            self.terminations += 1
+        logger.warning("Terminating process %d", entry.pid)
+        _terminate_process(entry.pid)
+
+    def _evict(self, entry: _Entry, obj: Any, healthy: bool = False) -> None:
+        logger.debug("Evicting instance %r", obj)
+        if self.marshal:
+            from comtypes import git
+
+            try:
+                git.RevokeInterfaceFromGlobal(entry.ref)
+            except (COMError, OSError):
+                logger.warning("Could not revoke instance %r", obj, exc_info=True)
+        if healthy and obj is not None and self.close is not None:
+            try:
+                self.close(obj)
+            except (COMError, OSError):
+                logger.warning("Could not close instance %r", obj, exc_info=True)
+        entry.ref = None
+        with self._cond:
+            self.evictions += 1
+            self._count -= 1
+            self._cond.notify()
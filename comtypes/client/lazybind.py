@@ -29,6 +29,9 @@ _all_slice = slice(None, None, None)
 
 
 class NamedProperty:
+    # Created on every access of a property with arguments, so keep it small.
+    __slots__ = ("get", "put", "putref", "disp")
+
     def __init__(self, disp, get, put, putref):
         self.get = get
         self.put = put
@@ -36,13 +39,15 @@ class NamedProperty:
         self.disp = disp
 
     def __getitem__(self, arg):
-        if self.get is None:
+        get = self.get
+        if get is None:
             raise TypeError("unsubscriptable object")
+        invoke = self.disp._comobj._invoke
         if isinstance(arg, tuple):
-            return self.disp._comobj._invoke(self.get.memid, self.get.invkind, 0, *arg)
-        elif arg == _all_slice:
-            return self.disp._comobj._invoke(self.get.memid, self.get.invkind, 0)
-        return self.disp._comobj._invoke(self.get.memid, self.get.invkind, 0, *[arg])
+            return invoke(get.memid, get.invkind, 0, *arg)
+        elif type(arg) is slice and arg == _all_slice:
+            return invoke(get.memid, get.invkind, 0)
+        return invoke(get.memid, get.invkind, 0, arg)
 
     def __call__(self, *args):
         if self.get is None:
@@ -57,12 +62,13 @@ class NamedProperty:
             descr = self.putref or self.put
         else:
             descr = self.put or self.putref
+        invoke = self.disp._comobj._invoke
         if isinstance(name, tuple):
-            self.disp._comobj._invoke(descr.memid, descr.invkind, 0, *(name + (value,)))
-        elif name == _all_slice:
-            self.disp._comobj._invoke(descr.memid, descr.invkind, 0, value)
+            invoke(descr.memid, descr.invkind, 0, *name, value)
+        elif type(name) is slice and name == _all_slice:
+            invoke(descr.memid, descr.invkind, 0, value)
         else:
-            self.disp._comobj._invoke(descr.memid, descr.invkind, 0, name, value)
+            invoke(descr.memid, descr.invkind, 0, name, value)
 
     def __iter__(self):
         """Explicitly disallow iteration."""
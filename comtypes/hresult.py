@@ -20,7 +20,9 @@ E_OUTOFMEMORY = -2147024882  # 0x8007000EL
 CLASS_E_NOAGGREGATION = -2147221232  # 0x80040110L
 CLASS_E_CLASSNOTAVAILABLE = -2147221231  # 0x80040111L
 
+CO_S_NOTALLINTERFACES = 524306  # 0x00080012L
 CO_E_CLASSSTRING = -2147221005  # 0x800401F3L
+CO_E_OBJNOTCONNECTED = -2147220995  # 0x800401FDL
 
 # connection point error codes
 CONNECT_E_CANNOTCONNECT = -2147220990
@@ -55,6 +57,7 @@ DISP_E_UNKNOWNINTERFACE = -2147352575  # 0x80020001
 RPC_E_CHANGED_MODE = -2147417850  # 0x80010106
 RPC_E_SERVERFAULT = -2147417851  # 0x80010105
 
+RPC_E_DISCONNECTED = -2147417848  # 0x80010108
 RPC_E_NO_SYNC = -2147417824  # 0x80010120
 RPC_S_CALLPENDING = -2147417835  # 0x80010115
 
@@ -16,11 +16,17 @@ GetMessage = _user32.GetMessageA
 GetMessage.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint, ctypes.c_uint]
 TranslateMessage = _user32.TranslateMessage
 DispatchMessage = _user32.DispatchMessageA
+GetQueueStatus = _user32.GetQueueStatus
+GetQueueStatus.argtypes = [ctypes.c_uint]
+GetQueueStatus.restype = ctypes.c_uint
+
+QS_ALLINPUT = 0x04FF
 
 
 class _MessageLoop:
     def __init__(self) -> None:
         self._filters: list["_FilterCallable"] = []
+        self._idle_handlers: list["Callable[[], Any]"] = []
 
     def insert_filter(self, obj: "_FilterCallable", index: SupportsIndex = -1) -> None:
         self._filters.insert(index, obj)
@@ -28,10 +34,23 @@ class _MessageLoop:
     def remove_filter(self, obj: "_FilterCallable") -> None:
         self._filters.remove(obj)
 
+    # Idle handlers are called by 'run' of this loop, whenever the message
+    # queue of the thread is empty; the module level functions below add
+    # them to the loop of 'comtypes.messageloop.run' only.
+    def insert_idle_handler(self, obj: "Callable[[], Any]") -> None:
+        self._idle_handlers.append(obj)
+
+    def remove_idle_handler(self, obj: "Callable[[], Any]") -> None:
+        self._idle_handlers.remove(obj)
+
     def run(self) -> None:
         msg = MSG()
         lpmsg = byref(msg)
         while 1:
+            if self._idle_handlers and not GetQueueStatus(QS_ALLINPUT) >> 16:
+                # no messages are waiting
+                for handler in list(self._idle_handlers):
+                    handler()
             ret = GetMessage(lpmsg, 0, 0, 0)
             if ret == -1:
                 raise WinError()
@@ -50,5 +69,13 @@ _messageloop = _MessageLoop()
 run = _messageloop.run
 insert_filter = _messageloop.insert_filter
 remove_filter = _messageloop.remove_filter
+insert_idle_handler = _messageloop.insert_idle_handler
+remove_idle_handler = _messageloop.remove_idle_handler
 
-__all__ = ["run", "insert_filter", "remove_filter"]
+__all__ = [
+    "run",
+    "insert_filter",
+    "remove_filter",
+    "insert_idle_handler",
+    "remove_idle_handler",
+]
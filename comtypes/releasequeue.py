@@ -0,0 +1,170 @@
+"""Deferred, batched Release() calls for COM interface pointers.
+
+By default, the finalizer of a COM pointer calls Release() as soon as the
+pointer is garbage collected.  For proxies of out-of-process or
+cross-apartment objects that is a blocking round trip, at whatever point
+the collection happens.  A `ReleaseQueue` that is installed in a thread
+collects the pointers owned by this thread when they are finalized instead,
+and releases them in batches at safe points in the thread:
+
+- when `flush` is called,
+- when the number of pending pointers reaches `threshold`, unless a garbage
+  collection is in progress,
+- when the message loop of the thread has no messages to process, which is
+  the loop of `comtypes.messageloop.run` unless another one is passed,
+- when the queue is uninstalled, and before CoUninitialize is called at
+  exit.
+
+    with ReleaseQueue(threshold=100) as queue:
+        ...
+        queue.flush()
+
+COM pointers must be released in the apartment where they were obtained.
+While queues are installed, COM pointers record the thread that creates
+them, also with `ctypes.cast`, and they are queued for that thread even
+when the garbage collector finalizes them in another one.  Pointers that
+are owned by threads without a queue, that were created before any queue
+was installed, or that ctypes creates without calling their class (results
+of foreign functions, `from_address`), are released immediately, as before.
+"""
+
+import gc
+import logging
+import threading
+from collections import deque
+from ctypes import WINFUNCTYPE, c_ulong, c_void_p
+from time import perf_counter
+from typing import Any, Optional
+
+from comtypes import messageloop
+from comtypes._post_coinit.unknwn import _record_owners, _release_queues
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["ReleaseQueue"]
+
+# IUnknown::Release, the third entry of the vtable.
+_Release = WINFUNCTYPE(c_ulong)(2, "Release")
+
+_collecting = False
+
+
+def _gc_callback(phase: str, info: dict[str, Any]) -> None:
+    global _collecting
+    _collecting = phase == "start"
+
+
+_lock = threading.Lock()
+
+
+def _track_collections() -> None:
+    # The callback is installed by the first queue.
+    if _gc_callback not in gc.callbacks:
+        gc.callbacks.append(_gc_callback)
+
+
+class ReleaseQueue:
+    """Defers the Release() calls of the COM pointers owned by the thread
+    that installs the queue.
+
+    `loop` is the message loop whose idle handlers flush the queue, by
+    default the loop of `comtypes.messageloop.run`; any object with
+    `insert_idle_handler` and `remove_idle_handler` methods can be passed.
+
+    `flushes`, `released`, `flush_time` and `max_flush_time` record the
+    batches that have been released, and their latencies in seconds.
+    """
+
+    def __init__(self, threshold: int = 100, loop: Any = None) -> None:
+        self.threshold = threshold
+        self.loop = messageloop._messageloop if loop is None else loop
+        # Appended to by finalizers in any thread, and drained by 'flush'.
+        self._pending: deque[c_void_p] = deque()
+        self._thread: Optional[int] = None
+        self._flushing = False
+        self.flushes = 0
+        self.released = 0
+        self.flush_time = 0.0
+        self.max_flush_time = 0.0
+
+    @property
+    def pending(self) -> int:
+        """The number of pointers waiting to be released."""
+        return len(self._pending)
+
+    def install(self) -> None:
+        """Defer the releases of the pointers owned by this thread."""
+        thread = threading.get_ident()
+        with _lock:
+            if _release_queues.get(thread, self) is not self:
+                raise RuntimeError("a ReleaseQueue is already installed in this thread")
+            _track_collections()
+            if not _release_queues:
+                _record_owners(True)
+            self._thread = thread
+            _release_queues[thread] = self
+        self.loop.insert_idle_handler(self.flush)
+
+    def uninstall(self) -> None:
+        """Release the pending pointers, and stop deferring releases."""
+        if self._thread is None:
+            return
+        self.flush()
+        self.loop.remove_idle_handler(self.flush)
+        with _lock:
+            del _release_queues[self._thread]
+            if not _release_queues:
+                _record_owners(False)
+        self._thread = None
+
+    def __enter__(self) -> "ReleaseQueue":
+        self.install()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.uninstall()
+
+    def defer(self, ptr: c_void_p) -> None:
+        # Called from the finalizer of 'ptr', which hands over its reference,
+        # in any thread; 'flush' only releases in the thread of the queue.
+        self._pending.append(c_void_p(c_void_p.from_buffer(ptr).value))
+        if len(self._pending) >= self.threshold and not _collecting:
+            self.flush()
+
+    def flush(self) -> int:
+        """Release the pending pointers, and return how many."""
+        if not self._pending or self._flushing:
+            return 0
+        if threading.get_ident() != self._thread:
+            return 0
+        self._flushing = True
+        start = perf_counter()
+        count = 0
+        try:
+            # Releasing an object may finalize more pointers.
+            pending = self._pending
+            while pending:
+                _Release(pending.popleft())
+                count += 1
+        finally:
+            self._flushing = False
+        elapsed = perf_counter() - start
+        self.flushes += 1
+        self.released += count
+        self.flush_time += elapsed
+        self.max_flush_time = max(self.max_flush_time, elapsed)
+        logger.debug("Released %d pointers in %.6f seconds", count, elapsed)
+        return count
+
+    def _shutdown(self) -> None:
+        # Called before CoUninitialize at exit.
+        if threading.get_ident() == self._thread:
+            self.flush()
+        elif self._pending:
+            # The apartment of the thread is gone, or is still in use by a
+            # daemon thread; the pointers cannot be released from here.
+            dropped = 0
+            while self._pending:
+                self._pending.popleft()
+                dropped += 1
+            logger.debug("Dropped %d pending releases", dropped)
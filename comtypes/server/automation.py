@@ -1,27 +1,105 @@
 import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Sequence
 from ctypes import *
+from typing import Any
 
 from comtypes import COMObject, IUnknown
-from comtypes.automation import IDispatch, IEnumVARIANT
+from comtypes.automation import VARIANT, IDispatch, IEnumVARIANT, _VariantCopy
 from comtypes.hresult import *
 
 logger = logging.getLogger(__name__)
 
 # XXX When the COMCollection class is ready, insert it into __all__
-__all__ = ["VARIANTEnumerator"]
+__all__ = ["PagedCOMCollection", "VARIANTEnumerator"]
+
+
+def _variant_value(item: Any) -> Any:
+    # COM objects are passed as IDispatch, everything else as a value that
+    # the VARIANT can hold.
+    if hasattr(item, "QueryInterface"):
+        return item.QueryInterface(IDispatch)
+    return item
+
+
+class _EnumItems:
+    """The items of a VARIANTEnumerator, shared by the enumerator and its
+    clones.
+
+    Items of sequences are retrieved by index.  Items of other iterables,
+    generators for example, are retrieved on demand and kept, so that
+    enumerators can be reset and cloned.
+    """
+
+    def __init__(self, items: Iterable[Any], cache: bool) -> None:
+        self.items = items
+        if isinstance(items, Sequence):
+            self._seq = items
+            self._iter = None
+        else:
+            self._seq = []
+            self._iter = iter(items)
+            self._lock = threading.Lock()
+        self.cache = cache
+        # VARIANTs of the items, converted once, when `cache` is set.
+        self._variants: list[VARIANT] = []
+
+    def _fill(self, stop: int) -> None:
+        with self._lock:
+            if self._iter is None:
+                return
+            seq = self._seq
+            if len(seq) >= stop:
+                return
+            for item in self._iter:
+                seq.append(item)
+                if len(seq) >= stop:
+                    return
+            self._iter = None
+
+    def count(self, start: int, count: int) -> int:
+        """Return how many of `count` items from `start` on are available."""
+        stop = start + count
+        if self._iter is not None and len(self._seq) < stop:
+            self._fill(stop)
+        return max(0, min(len(self._seq), stop) - start)
+
+    def values(self, start: int, count: int) -> list[Any]:
+        stop = start + self.count(start, count)
+        if isinstance(self._seq, (list, tuple)):
+            return self._seq[start:stop]
+        return [self._seq[i] for i in range(start, stop)]
+
+    def variants(self, start: int, count: int) -> list[VARIANT]:
+        stop = start + self.count(start, count)
+        variants = self._variants
+        if len(variants) < stop:
+            for item in self.values(len(variants), stop - len(variants)):
+                variants.append(VARIANT(_variant_value(item)))
+        return variants[start:stop]
 
 
 class VARIANTEnumerator(COMObject):
     """A universal VARIANTEnumerator class.  Instantiate it with a
-    collection of items that support the IDispatch interface."""
+    collection of items that support the IDispatch interface, or of values
+    that a VARIANT can hold.
+
+    `items` may be a sequence, or any other iterable like a generator,
+    which is then consumed lazily.  Set `cache` for sequences that do not
+    change to convert every item into a VARIANT only once.
+    """
 
     _com_interfaces_ = [IEnumVARIANT]
 
-    def __init__(self, items):
-        self.items = (
-            items  # keep, so that we can restore our iterator (in Reset, and Clone).
-        )
-        self.seq = iter(self.items)
+    def __init__(self, items: Iterable[Any], cache: bool = False) -> None:
+        if isinstance(items, _EnumItems):
+            # the shared items of a clone, or of a PagedCOMCollection
+            self._items = items
+        else:
+            self._items = _EnumItems(items, cache)
+        self.items = self._items.items
+        self._pos = 0
         super().__init__()
 
     def Next(self, this, celt, rgVar, pCeltFetched):
@@ -30,37 +108,142 @@ class VARIANTEnumerator(COMObject):
         if not pCeltFetched:
             pCeltFetched = [None]
         pCeltFetched[0] = 0
-        try:
-            for index in range(celt):
-                item = next(self.seq)
-                p = item.QueryInterface(IDispatch)
-                rgVar[index].value = p
-                pCeltFetched[0] += 1
-        except StopIteration:
-            pass
-        # except:
-        #     # ReportException? return E_FAIL?
-        #     import traceback
-        #     traceback.print_exc()
-
-        if pCeltFetched[0] == celt:
+        if self._items.cache:
+            variants = self._items.variants(self._pos, celt)
+            for index, v in enumerate(variants):
+                _VariantCopy(rgVar[index], v)
+            fetched = len(variants)
+        else:
+            values = self._items.values(self._pos, celt)
+            for index, item in enumerate(values):
+                rgVar[index].value = _variant_value(item)
+            fetched = len(values)
+        self._pos += fetched
+        pCeltFetched[0] = fetched
+        if fetched == celt:
             return S_OK
         return S_FALSE
 
     def Skip(self, this, celt):
         # skip some elements.
-        try:
-            for _ in range(celt):
-                next(self.seq)
-        except StopIteration:
-            return S_FALSE
-        return S_OK
+        skipped = self._items.count(self._pos, celt)
+        self._pos += skipped
+        if skipped == celt:
+            return S_OK
+        return S_FALSE
 
     def Reset(self, this):
-        self.seq = iter(self.items)
+        self._pos = 0
         return S_OK
 
-    # Clone not implemented
+    def Clone(self, this, ppenum):
+        if not ppenum:
+            return E_POINTER
+        # The clone shares the items, but has its own position.
+        enum = VARIANTEnumerator(self._items)
+        enum._pos = self._pos
+        return enum.IUnknown_QueryInterface(None, pointer(IEnumVARIANT._iid_), ppenum)
+
+
+class _PagedItems(_EnumItems):
+    """Items that are retrieved in pages of `page_size` items by calling
+    `fetch(offset, count)`.  The VARIANTs of the most recently used
+    `max_pages` pages are kept.
+    """
+
+    cache = True
+
+    def __init__(
+        self,
+        fetch: Callable[[int, int], Sequence[Any]],
+        length: int,
+        page_size: int,
+        max_pages: int,
+    ) -> None:
+        self.items = fetch
+        self.length = length
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self._pages: OrderedDict[int, list[VARIANT]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _page(self, number: int) -> list[VARIANT]:
+        with self._lock:
+            try:
+                self._pages.move_to_end(number)
+                return self._pages[number]
+            except KeyError:
+                pass
+        offset = number * self.page_size
+        items = self.items(offset, min(self.page_size, self.length - offset))
+        page = [VARIANT(_variant_value(item)) for item in items]
+        with self._lock:
+            self._pages[number] = page
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+        return page
+
+    def count(self, start: int, count: int) -> int:
+        return max(0, min(self.length, start + count) - start)
+
+    def variants(self, start: int, count: int) -> list[VARIANT]:
+        stop = start + self.count(start, count)
+        result = []
+        while start < stop:
+            number, offset = divmod(start, self.page_size)
+            page = self._page(number)[offset : offset + stop - start]
+            if not page:
+                break  # the result set has shrunk
+            result.extend(page)
+            start += len(page)
+        return result
+
+    def values(self, start: int, count: int) -> list[Any]:
+        return [v.value for v in self.variants(start, count)]
+
+
+class PagedCOMCollection(COMObject):
+    """Base class which implements Count, Item, and _NewEnum for
+    collections that are too large to hold them in memory.
+
+    `fetch(offset, count)` must return a sequence with the `count` items
+    from the zero-based `offset` on, `count` is the total number of items.
+    Items are retrieved in pages of `page_size` items, the VARIANTs of the
+    `max_pages` most recently used pages are kept.  Enumerators retrieve the
+    pages on demand, too.
+    """
+
+    page_size = 1000
+    max_pages = 16
+
+    def __init__(self, fetch: Callable[[int, int], Sequence[Any]], count: int):
+        self._items = _PagedItems(fetch, count, self.page_size, self.max_pages)
+        super().__init__()
+
+    def _get_Item(self, this, index, pitem):
+        if not pitem:
+            return E_POINTER
+        if isinstance(index, VARIANT):
+            index = index.value
+        if not 0 <= index < self._items.length:
+            return DISP_E_BADINDEX
+        variants = self._items.variants(index, 1)
+        if not variants:
+            return DISP_E_BADINDEX
+        pitem[0] = variants[0]
+        return S_OK
+
+    def _get_Count(self, this, pcount):
+        if not pcount:
+            return E_POINTER
+        pcount[0] = self._items.length
+        return S_OK
+
+    def _get__NewEnum(self, this, penum):
+        if not penum:
+            return E_POINTER
+        penum[0] = VARIANTEnumerator(self._items).QueryInterface(IUnknown)
+        return S_OK
 
 
 ################################################################
@@ -1,14 +1,20 @@
 import functools
+import itertools
 import logging
+import threading
+import time
+import weakref
 from _ctypes import COMError
-from collections.abc import Callable, Iterator
-from ctypes import c_void_p, pointer
+from collections import OrderedDict, deque
+from collections.abc import Callable, Hashable, Iterator
+from ctypes import HRESULT, POINTER, OleDLL, byref, c_int, c_void_p, pointer
 from ctypes.wintypes import DWORD
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Optional
 from typing import Union as _UnionT
 
+import comtypes
 from comtypes import GUID, COMObject, IUnknown
-from comtypes.automation import IDispatch
+from comtypes.automation import DISPATCH_METHOD, IDispatch, _make_dispparams
 from comtypes.connectionpoints import IConnectionPoint
 from comtypes.hresult import *
 from comtypes.typeinfo import ITypeInfo, LoadRegTypeLib
@@ -21,7 +27,19 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
-__all__ = ["ConnectableObjectMixin"]
+__all__ = [
+    "BLOCK",
+    "COALESCE",
+    "DROP_OLDEST",
+    "ConnectableObjectMixin",
+    "EventDispatcher",
+    "EventQueue",
+]
+
+# HRESULTs of calls to sinks whose client process or object is gone.
+_DEAD_SINK_HRESULTS = frozenset(
+    [RPC_S_SERVER_UNAVAILABLE, RPC_E_DISCONNECTED, CO_E_OBJNOTCONNECTED]
+)
 
 
 class ConnectionPointImpl(COMObject):
@@ -33,10 +51,17 @@ class ConnectionPointImpl(COMObject):
         self, sink_interface: type[IUnknown], sink_typeinfo: ITypeInfo
     ) -> None:
         super().__init__()
+        # Guards the connections, which the worker thread of the event
+        # dispatcher removes when their sinks are dead.
+        self._lock = threading.Lock()
         self._connections: dict[int, IUnknown] = {}
         self._cookie = 0
         self._sink_interface = sink_interface
         self._typeinfo = sink_typeinfo
+        # maps event names to the DISPIDs of the sink interface.
+        self._dispids: dict[str, int] = {}
+        # The queue of asynchronously fired events, if any.
+        self.event_queue: Optional[EventQueue] = None
 
     # per MSDN, all interface methods *must* be implemented, E_NOTIMPL
     # is no allowed return value
@@ -51,18 +76,36 @@ class ConnectionPointImpl(COMObject):
             ptr = pUnk.QueryInterface(self._sink_interface)
         except COMError:
             return CONNECT_E_CANNOTCONNECT
-        pdwCookie[0] = self._cookie = self._cookie + 1
-        self._connections[self._cookie] = ptr
+        with self._lock:
+            cookie = self._cookie + 1
+            if self.event_queue is not None:
+                # The worker thread of the event dispatcher gets the sink
+                # from the global interface table.
+                try:
+                    self.event_queue.register(cookie, ptr)
+                except (COMError, OSError):
+                    logger.warning("Cannot register sink", exc_info=True)
+                    return CONNECT_E_CANNOTCONNECT
+            pdwCookie[0] = self._cookie = cookie
+            self._connections[cookie] = ptr
         return S_OK
 
     def IConnectionPoint_Unadvise(self, this: Any, dwCookie: int) -> "hints.Hresult":
         logger.debug("Unadvise %s", dwCookie)
-        try:
-            del self._connections[dwCookie]
-        except KeyError:
+        if not self._remove_connection(dwCookie):
             return CONNECT_E_NOCONNECTION
         return S_OK
 
+    def _remove_connection(self, key: int) -> bool:
+        with self._lock:
+            try:
+                del self._connections[key]
+            except KeyError:
+                return False  # connection already gone
+            if self.event_queue is not None:
+                self.event_queue.revoke(key)
+        return True
+
     def IConnectionPoint_GetConnectionPointContainer(
         self, this: Any, ppCPC: c_void_p
     ) -> "hints.Hresult":
@@ -74,42 +117,464 @@ class ConnectionPointImpl(COMObject):
         return E_NOTIMPL
 
     def _call_sinks(self, name: str, *args: Any, **kw: Any) -> list[Any]:
-        results = []
         logger.debug("_call_sinks(%s, %s, *%s, **%s)", self, name, args, kw)
+        with self._lock:
+            connections = dict(self._connections)
+        return self._fire(connections, name, args, kw)
+
+    def _fire(
+        self,
+        connections: dict[int, IUnknown],
+        name: str,
+        args: tuple[Any, ...],
+        kw: dict[str, Any],
+    ) -> list[Any]:
+        # Calls the 'connections' sinks, which are the pointers passed to
+        # Advise, or their proxies in the worker thread of the dispatcher.
+        results = []
         # Is it an IDispatch derived interface?  Then, events have to be delivered
         # via Invoke calls (even if it is a dual interface).
         if hasattr(self._sink_interface, "Invoke"):
-            # for better performance, we could cache the dispids.
-            dispid = self._typeinfo.GetIDsOfNames(name)[0]
-            for key, p in self._connections.items():
-                mth = functools.partial(p.Invoke, dispid)  # type: ignore
-                results.extend(self._call_sink(name, key, mth, *args, **kw))
+            try:
+                dispid = self._dispids[name]
+            except KeyError:
+                dispid = self._dispids[name] = self._typeinfo.GetIDsOfNames(name)[0]
+            if kw:
+                raise ValueError("named parameters not yet implemented")
+            # The arguments are converted once, all sinks receive the same
+            # DISPPARAMS.
+            dp = _make_dispparams(DISPATCH_METHOD, args)
+            for key, p in connections.items():
+                mth = functools.partial(
+                    p._invoke_dispparams,  # type: ignore
+                    dispid,
+                    dp,
+                    DISPATCH_METHOD,
+                    0,
+                )
+                results.extend(self._call_sink(name, key, mth, args, kw))
         else:
-            for key, p in self._connections.items():
-                mth = getattr(p, name)
-                results.extend(self._call_sink(name, key, mth, *args, **kw))
+            for key, p in connections.items():
+                mth = functools.partial(getattr(p, name), *args, **kw)
+                results.extend(self._call_sink(name, key, mth, args, kw))
         return results
 
     def _call_sink(
-        self, name: str, key: int, mth: Callable[..., Any], *args: Any, **kw: Any
+        self,
+        name: str,
+        key: int,
+        mth: Callable[[], Any],
+        args: tuple[Any, ...],
+        kw: dict[str, Any],
     ) -> Iterator[Any]:
+        # Failures are logged, so that the other sinks still get the event.
         try:
-            result = mth(*args, **kw)
+            result = mth()
         except COMError as details:
-            if details.hresult == RPC_S_SERVER_UNAVAILABLE:
+            if details.hresult in _DEAD_SINK_HRESULTS:
                 warn_msg = "_call_sinks(%s, %s, *%s, **%s) failed; removing connection"
                 logger.warning(warn_msg, self, name, args, kw, exc_info=True)
-                try:
-                    del self._connections[key]
-                except KeyError:
-                    pass  # connection already gone
+                self._remove_connection(key)
             else:
                 warn_msg = "_call_sinks(%s, %s, *%s, **%s)"
                 logger.warning(warn_msg, self, name, args, kw, exc_info=True)
+        except Exception:
+            warn_msg = "_call_sinks(%s, %s, *%s, **%s)"
+            logger.warning(warn_msg, self, name, args, kw, exc_info=True)
         else:
             yield result
 
 
+# What an EventQueue does with an event when it is full:
+BLOCK = "block"  # wait until the worker thread has made room.
+DROP_OLDEST = "drop-oldest"  # discard the oldest pending event.
+# replace a pending event with the same coalescing key, else discard the
+# oldest.
+COALESCE = "coalesce"
+
+# The types of apartments returned by CoGetApartmentType.
+APTTYPE_STA = 0
+APTTYPE_MTA = 1
+APTTYPE_NA = 2
+APTTYPE_MAINSTA = 3
+
+_ole32 = OleDLL("ole32")
+
+_CoGetApartmentType = _ole32.CoGetApartmentType
+_CoGetApartmentType.argtypes = [POINTER(c_int), POINTER(c_int)]
+_CoGetApartmentType.restype = HRESULT
+
+
+def _apartment_type() -> int:
+    apttype, qualifier = c_int(), c_int()
+    try:
+        _CoGetApartmentType(byref(apttype), byref(qualifier))
+    except OSError:
+        # COM is not initialized; the thread is in the implicit MTA.
+        return APTTYPE_MTA
+    return apttype.value
+
+
+def _current_apartment() -> Hashable:
+    # Identifies the apartment of the calling thread.
+    apttype = _apartment_type()
+    if apttype in (APTTYPE_STA, APTTYPE_MAINSTA):
+        return threading.get_ident()
+    # all threads of the MTA, or of the NA, share it.
+    return apttype
+
+
+def _in_sta() -> bool:
+    return _apartment_type() in (APTTYPE_STA, APTTYPE_MAINSTA)
+
+
+_pumps = threading.local()
+
+
+def _get_pump() -> Any:
+    # The EventPump of the calling thread, created once like the one of
+    # 'PumpEvents'.
+    try:
+        return _pumps.pump
+    except AttributeError:
+        from comtypes.client._events import EventPump
+
+        pump = _pumps.pump = EventPump()
+        return pump
+
+
+def _event_name(name: str, args: tuple[Any, ...], kw: dict[str, Any]) -> Hashable:
+    return name
+
+
+class EventQueue:
+    """A bounded queue of the events of a connection point, which the
+    worker thread of an `EventDispatcher` delivers to the sinks.
+
+    `depth` is the number of pending events, `dropped` counts the events
+    discarded because the queue was full, and `coalesced` the pending events
+    replaced by a newer event with the same coalescing key.
+    """
+
+    def __init__(
+        self,
+        worker: "_Worker",
+        connection_point: ConnectionPointImpl,
+        maxsize: int,
+        policy: str,
+        coalesce_key: Callable[[str, tuple, dict], Hashable] = _event_name,
+    ) -> None:
+        if policy not in (BLOCK, DROP_OLDEST, COALESCE):
+            raise ValueError(f"unknown policy {policy!r}")
+        self.connection_point = connection_point
+        self.maxsize = maxsize
+        self.policy = policy
+        self.coalesce_key = coalesce_key
+        self.dropped = 0
+        self.coalesced = 0
+        self._worker = worker
+        self._dispatcher = worker.dispatcher
+        # Pending events in firing order.  With COALESCE, they are keyed by
+        # the coalescing key, otherwise by a sequence number.
+        self._pending: OrderedDict[Hashable, tuple[str, tuple, dict]] = OrderedDict()
+        self._keys = itertools.count()
+        self._scheduled = False
+        # Maps the cookies of the connections to the cookies of their sinks
+        # in the global interface table.
+        self._git_cookies: dict[int, int] = {}
+        finalizer = weakref.finalize(
+            connection_point, _revoke_all, worker, self._git_cookies
+        )
+        # COM may be uninitialized at exit.
+        finalizer.atexit = False
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    def register(self, key: int, sink: IUnknown) -> None:
+        """Register the sink of connection `key` in the global interface
+        table, to be called from the worker thread."""
+        from comtypes import git
+
+        self._git_cookies[key] = git.RegisterInterfaceInGlobal(
+            sink, self.connection_point._sink_interface
+        )
+
+    def revoke(self, key: int) -> None:
+        """Revoke the sink of connection `key` from the global interface
+        table."""
+        git_cookie = self._git_cookies.pop(key, None)
+        if git_cookie is not None:
+            self._worker.release(git_cookie)
+
+    def put(self, name: str, args: tuple[Any, ...], kw: dict[str, Any]) -> None:
+        """Queue the event `name` with arguments `args` and `kw`."""
+        dispatcher = self._dispatcher
+        pending = self._pending
+        if self.policy == COALESCE:
+            key = self.coalesce_key(name, args, kw)
+        else:
+            key = None
+        with dispatcher._cond:
+            if dispatcher._closed:
+                raise RuntimeError("the event dispatcher is shut down")
+            if key is not None and key in pending:
+                del pending[key]
+                self.coalesced += 1
+            elif len(pending) >= self.maxsize:
+                if self.policy != BLOCK:
+                    pending.popitem(last=False)
+                    self.dropped += 1
+                # A sink that fires events from a worker thread must not
+                # wait for it, the queue grows beyond `maxsize` then.
+                elif not dispatcher._in_worker():
+                    dispatcher._wait_for(
+                        lambda: len(pending) < self.maxsize or dispatcher._closed
+                    )
+                    if dispatcher._closed:
+                        raise RuntimeError("the event dispatcher is shut down")
+            if key is None:
+                key = next(self._keys)
+            pending[key] = (name, args, kw)
+            self._worker.schedule(self)
+
+
+def _revoke_all(worker: "_Worker", git_cookies: dict[int, int]) -> None:
+    # Called when a connection point is gone, with its sinks still connected.
+    while git_cookies:
+        worker.release(git_cookies.popitem()[1])
+
+
+class _Worker:
+    """The thread that delivers the events of the connection points of one
+    apartment.  It runs in the multithreaded apartment, and calls proxies of
+    the sinks, which it gets from the global interface table.
+    """
+
+    def __init__(self, dispatcher: "EventDispatcher") -> None:
+        self.dispatcher = dispatcher
+        self._cond = dispatcher._cond
+        self._ready: deque[EventQueue] = deque()  # queues with pending events
+        self._delivering = False
+        self.stopped = False
+        # Proxies of the sinks, by their cookies in the global interface
+        # table; only used by the thread.
+        self._proxies: dict[int, IUnknown] = {}
+        # The cookies revoked since, whose proxies the thread releases.
+        self._released: list[int] = []
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    @property
+    def idle(self) -> bool:
+        return not self._ready and not self._delivering
+
+    def schedule(self, queue: EventQueue) -> None:
+        # called with the condition acquired.
+        if not queue._scheduled:
+            queue._scheduled = True
+            self._ready.append(queue)
+        self.dispatcher._notify()
+
+    def release(self, git_cookie: int) -> None:
+        # Revokes a sink; its proxy is released by the thread.
+        from comtypes import git
+
+        try:
+            git.RevokeInterfaceFromGlobal(git_cookie)
+        except (COMError, OSError):
+            logger.warning("Cannot revoke sink %d", git_cookie, exc_info=True)
+        with self._cond:
+            self._released.append(git_cookie)
+            self.dispatcher._notify()
+
+    def _run(self) -> None:
+        comtypes.CoInitializeEx(comtypes.COINIT_MULTITHREADED)
+        try:
+            while True:
+                queue = None
+                with self._cond:
+                    while (
+                        not self._ready
+                        and not self._released
+                        and not self.dispatcher._closed
+                    ):
+                        self._cond.wait()
+                    released, self._released = self._released, []
+                    if self._ready:
+                        queue = self._ready.popleft()
+                        _, (name, args, kw) = queue._pending.popitem(last=False)
+                        if queue._pending:
+                            self._ready.append(queue)
+                        else:
+                            queue._scheduled = False
+                        self._delivering = True
+                        self.dispatcher._notify()
+                for git_cookie in released:
+                    self._proxies.pop(git_cookie, None)
+                if queue is None:
+                    if released:
+                        continue
+                    return
+                try:
+                    self._deliver(queue, name, args, kw)
+                except Exception:
+                    logger.exception("Delivering event %s failed", name)
+                finally:
+                    with self._cond:
+                        self._delivering = False
+                        self.dispatcher._notify()
+        finally:
+            self._proxies.clear()
+            comtypes.CoUninitialize()
+            with self._cond:
+                self.stopped = True
+                self.dispatcher._notify()
+
+    def _deliver(
+        self, queue: EventQueue, name: str, args: tuple, kw: dict[str, Any]
+    ) -> None:
+        from comtypes import git
+
+        cp = queue.connection_point
+        sinks = {}
+        with cp._lock:
+            git_cookies = list(queue._git_cookies.items())
+        for key, git_cookie in git_cookies:
+            try:
+                sinks[key] = self._proxies[git_cookie]
+            except KeyError:
+                try:
+                    proxy = git.GetInterfaceFromGlobal(git_cookie, cp._sink_interface)
+                except (COMError, OSError):
+                    # unadvised in the meantime.
+                    logger.debug("Sink %d is gone", git_cookie, exc_info=True)
+                    continue
+                sinks[key] = self._proxies[git_cookie] = proxy
+        cp._fire(sinks, name, args, kw)
+
+
+class EventDispatcher:
+    """Delivers the events of connection points from worker threads, so
+    that slow sinks do not block the code that fires the events.
+
+    Assign an instance to the `_event_dispatcher_` attribute of a
+    ConnectableObjectMixin subclass; every connection point then gets an
+    `EventQueue` of `maxsize` events with the given policy.  There is one
+    worker thread for each apartment in which connection points are
+    created, so that slow sinks of one apartment do not delay the events of
+    another.  The worker threads join the multithreaded apartment; the
+    sinks are registered in the global interface table by Advise, and the
+    workers call them through proxies from there.
+
+    With the COALESCE policy, `coalesce_key(name, args, kw)` returns the
+    key of an event; a pending event is replaced by a newer one with the
+    same key.  By default the key is the event name, so that events with
+    the same name are merged whatever their arguments are; pass a key that
+    includes the arguments that matter, like the DISPID of a changed
+    property.
+
+    A thread of a single-threaded apartment dispatches incoming calls while
+    it waits in `flush`, `shutdown` or for room in a full BLOCK queue,
+    since the worker may be calling a sink that lives in its apartment.
+
+    Ordering: a sink receives the events of a connection point in the order
+    in which they were fired.  The DROP_OLDEST and COALESCE policies remove
+    events, but never reorder the remaining ones; a coalesced event takes the
+    place of the newest event.  Events of different connection points are
+    delivered in turns, without any order between them.
+
+    `shutdown` delivers the pending events and stops the worker threads.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1000,
+        policy: str = BLOCK,
+        coalesce_key: Optional[Callable[[str, tuple, dict], Hashable]] = None,
+    ) -> None:
+        self.maxsize = maxsize
+        self.policy = policy
+        self.coalesce_key = _event_name if coalesce_key is None else coalesce_key
+        self._cond = threading.Condition()
+        self._workers: dict[Hashable, _Worker] = {}  # by apartment
+        self._closed = False
+        # The pumps of the STA threads that wait for the workers.
+        self._pumps: list[Any] = []
+
+    def queue(self, connection_point: ConnectionPointImpl) -> EventQueue:
+        """Return a new event queue for `connection_point`, which belongs
+        to the apartment of the calling thread."""
+        apartment = _current_apartment()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("the event dispatcher is shut down")
+            worker = self._workers.get(apartment)
+            if worker is None:
+                worker = self._workers[apartment] = _Worker(self)
+        return EventQueue(
+            worker, connection_point, self.maxsize, self.policy, self.coalesce_key
+        )
+
+    def _in_worker(self) -> bool:
+        thread = threading.current_thread()
+        return any(w.thread is thread for w in self._workers.values())
+
+    def _notify(self) -> None:
+        # Called with the condition acquired.
+        self._cond.notify_all()
+        for pump in self._pumps:
+            pump.wakeup()
+
+    def _wait_for(
+        self, predicate: Callable[[], bool], timeout: Optional[float] = None
+    ) -> bool:
+        # Like Condition.wait_for.  A thread of an STA must dispatch the
+        # calls to its sinks, which a worker may be waiting for.
+        if not _in_sta():
+            return self._cond.wait_for(predicate, timeout)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        pump = _get_pump()
+        self._pumps.append(pump)
+        try:
+            while not predicate():
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                self._cond.release()
+                try:
+                    pump.pump(remaining)
+                finally:
+                    self._cond.acquire()
+            return True
+        finally:
+            self._pumps.remove(pump)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all pending events are delivered.  Return False if
+        `timeout` seconds elapsed before.
+        """
+        with self._cond:
+            return self._wait_for(
+                lambda: all(w.idle for w in self._workers.values()), timeout
+            )
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """Deliver the pending events and stop the worker threads, waiting
+        up to `timeout` seconds for them.  Events can no longer be queued
+        afterwards.
+        """
+        thread = threading.current_thread()
+        with self._cond:
+            self._closed = True
+            self._notify()
+            workers = [w for w in self._workers.values() if w.thread is not thread]
+            self._wait_for(lambda: all(w.stopped for w in workers), timeout)
+
+
 class ConnectableObjectMixin:
     """Mixin which implements IConnectionPointContainer.
 
@@ -122,6 +587,9 @@ class ConnectableObjectMixin:
         _outgoing_interfaces_: ClassVar[list[type[IDispatch]]]
         _reg_typelib_: ClassVar[tuple[str, int, int]]
 
+    # Events are fired synchronously, unless this is an EventDispatcher.
+    _event_dispatcher_: "ClassVar[Optional[EventDispatcher]]" = None
+
     def __init__(self) -> None:
         super().__init__()
         self.__connections: dict[type[IDispatch], ConnectionPointImpl] = {}
@@ -129,7 +597,10 @@ class ConnectableObjectMixin:
         tlib = LoadRegTypeLib(*self._reg_typelib_)
         for itf in self._outgoing_interfaces_:
             typeinfo = tlib.GetTypeInfoOfGuid(itf._iid_)
-            self.__connections[itf] = ConnectionPointImpl(itf, typeinfo)
+            conn = ConnectionPointImpl(itf, typeinfo)
+            if self._event_dispatcher_ is not None:
+                conn.event_queue = self._event_dispatcher_.queue(conn)
+            self.__connections[itf] = conn
 
     def IConnectionPointContainer_EnumConnectionPoints(
         self, this: Any, ppEnum: c_void_p
@@ -166,8 +637,13 @@ class ConnectableObjectMixin:
     ) -> Any:
         # Fire event 'name' with arguments *args and **kw.
         # Accepts either an interface index or an interface as first argument.
-        # Returns a list of results.
+        # Returns a list of results, which is empty when the event is queued
+        # for the event dispatcher.
         logger.debug("Fire_Event(%s, %s, *%s, **%s)", itf, name, args, kw)
         if isinstance(itf, int):
             itf = self._outgoing_interfaces_[itf]
-        return self.__connections[itf]._call_sinks(name, *args, **kw)
+        conn = self.__connections[itf]
+        if conn.event_queue is not None:
+            conn.event_queue.put(name, args, kw)
+            return []
+        return conn._call_sinks(name, *args, **kw)
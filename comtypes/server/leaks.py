@@ -0,0 +1,134 @@
+"""Lifetime diagnostics for COMObject servers.
+
+Tracking is opt-in; assign a `LeakTracker` instance to the
+`_com_leak_tracker_` attribute of a COMObject subclass, or of COMObject
+itself to track the instances of all classes:
+
+    COMObject._com_leak_tracker_ = tracker = LeakTracker()
+    tracker.report_at_exit()
+
+The tracker records the class and the creation traceback of each instance,
+without keeping it alive.  `report` lists the instances that still have a
+COM reference count, grouped by the place where they were created; these are
+the objects that keep a local server from exiting.  Classes without a
+tracker only pay for one attribute lookup per instance.
+"""
+
+import atexit
+import logging
+import sys
+import threading
+import traceback
+import weakref
+from collections import defaultdict
+from types import FrameType
+from typing import TYPE_CHECKING, Optional, TextIO
+
+if TYPE_CHECKING:
+    from comtypes._comobject import COMObject
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["LeakTracker"]
+
+
+class _Allocation:
+    __slots__ = ("class_name", "stack")
+
+    def __init__(self, class_name: str, stack: traceback.StackSummary) -> None:
+        self.class_name = class_name
+        self.stack = stack
+
+    @property
+    def site(self) -> tuple[tuple[str, Optional[int], str], ...]:
+        return tuple((f.filename, f.lineno, f.name) for f in self.stack)
+
+
+class LeakTracker:
+    """Records the creation tracebacks of COMObject instances and reports
+    the instances that are still alive.
+
+    `stack_depth` is the number of frames that are recorded per instance.
+    """
+
+    def __init__(self, stack_depth: int = 10) -> None:
+        self.stack_depth = stack_depth
+        self._lock = threading.Lock()
+        self._allocations: "weakref.WeakKeyDictionary[COMObject, _Allocation]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._exit_hook_installed = False
+
+    def track(self, obj: "COMObject", frame: Optional[FrameType] = None) -> None:
+        """Start tracking `obj`, which was created by the code running in
+        `frame`, the caller of this method by default.
+        """
+        if frame is None:
+            frame = sys._getframe(1)
+        stack = traceback.StackSummary.extract(
+            traceback.walk_stack(frame), limit=self.stack_depth, lookup_lines=False
+        )
+        stack.reverse()
+        allocation = _Allocation(type(obj).__qualname__, stack)
+        with self._lock:
+            self._allocations[obj] = allocation
+
+    def survivors(
+        self, include_unreferenced: bool = False
+    ) -> list[tuple["COMObject", int, traceback.StackSummary]]:
+        """Return (object, COM reference count, creation stack) tuples for
+        the tracked objects that are alive.  Objects that are only referenced
+        from Python code are left out unless `include_unreferenced` is true.
+        """
+        with self._lock:
+            items = list(self._allocations.items())
+        result = []
+        for obj, allocation in items:
+            refcnt = obj._refcnt.value
+            if refcnt or include_unreferenced:
+                result.append((obj, refcnt, allocation.stack))
+        return result
+
+    def report(self, include_unreferenced: bool = False) -> str:
+        """Return a description of the surviving objects, grouped by their
+        allocation sites, the sites with the most objects first.
+        """
+        with self._lock:
+            items = list(self._allocations.items())
+        groups: dict[tuple, list[tuple[_Allocation, int]]] = defaultdict(list)
+        for obj, allocation in items:
+            refcnt = obj._refcnt.value
+            if refcnt or include_unreferenced:
+                groups[allocation.site].append((allocation, refcnt))
+        if not groups:
+            return ""
+        total = sum(len(group) for group in groups.values())
+        lines = [f"{total} live COM objects from {len(groups)} allocation sites"]
+        for group in sorted(groups.values(), key=len, reverse=True):
+            names = sorted({allocation.class_name for allocation, _ in group})
+            refcounts = sorted(refcnt for _, refcnt in group)
+            lines.append(
+                f"{len(group)} x {', '.join(names)} (reference counts: {refcounts})"
+            )
+            stack = group[0][0].stack
+            lines.extend(line.rstrip("\n") for line in stack.format())
+        return "\n".join(lines)
+
+    def report_at_exit(self, file: Optional[TextIO] = None) -> None:
+        """Write the report of the objects that are alive when the
+        interpreter exits to `file`, or log it as a warning.
+        """
+        if self._exit_hook_installed:
+            return
+        self._exit_hook_installed = True
+
+        def dump():
+            text = self.report()
+            if not text:
+                return
+            if file is None:
+                logger.warning("%s", text)
+            else:
+                print(text, file=file)
+
+        atexit.register(dump)
@@ -0,0 +1,167 @@
+"""Per-method call metrics for COMObject servers.
+
+Metrics are opt-in per class; assign a `MethodMetrics` instance to the
+`_com_metrics_` attribute of a COMObject subclass before its first instance
+is created:
+
+    class MyObject(COMObject):
+        _com_interfaces_ = [IMyInterface]
+        _com_metrics_ = MethodMetrics()
+
+Calls through the virtual function tables and through IDispatch::Invoke are
+recorded per (interface, method).  Classes without metrics call their
+implementations directly, so there is no overhead when disabled.
+"""
+
+import collections
+import json
+import logging
+import os
+import threading
+from collections.abc import Callable
+from time import perf_counter
+from typing import Any, Optional
+
+from comtypes import hresult
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["MethodMetrics"]
+
+
+class _MethodStats:
+    __slots__ = ("calls", "errors", "total_time", "samples", "hresults")
+
+    def __init__(self, max_samples: int) -> None:
+        # the most recent latencies, for the percentiles.
+        self.samples: collections.deque[float] = collections.deque(maxlen=max_samples)
+        # failure HRESULTs and their counts.
+        self.hresults: collections.Counter[int] = collections.Counter()
+        self.clear()
+
+    def clear(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.samples.clear()
+        self.hresults.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        samples = sorted(self.samples)
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_time": self.total_time,
+            "p50": _percentile(samples, 50),
+            "p90": _percentile(samples, 90),
+            "p99": _percentile(samples, 99),
+            "max": samples[-1] if samples else None,
+            "hresults": {
+                f"0x{hr & 0xFFFFFFFF:08X}": n for hr, n in self.hresults.items()
+            },
+        }
+
+
+def _percentile(samples: list[float], percent: int) -> Optional[float]:
+    if not samples:
+        return None
+    # nearest-rank method
+    index = max(0, -(-len(samples) * percent // 100) - 1)
+    return samples[index]
+
+
+class MethodMetrics:
+    """Records call counts, latencies and failure HRESULTs of the methods
+    of COMObject implementations.
+
+    Percentiles are computed from the latest `max_samples` calls of each
+    method; the counts and the total time cover all calls since creation or
+    the last `reset`.
+    """
+
+    def __init__(self, max_samples: int = 1000) -> None:
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._stats: dict[str, _MethodStats] = {}
+        self._dumper: Optional[threading.Thread] = None
+        self._stop_dumping = threading.Event()
+
+    def wrap(
+        self, impl: Callable[..., Any], interface_name: str, method_name: str
+    ) -> Callable[..., Any]:
+        """Return a function that calls the `impl` of a COM method and
+        records the elapsed time and the result.
+        """
+        name = f"{interface_name}.{method_name}"
+        with self._lock:
+            stats = self._stats.setdefault(name, _MethodStats(self.max_samples))
+        lock = self._lock
+
+        def call_with_metrics(*args, **kw):
+            hr = hresult.E_FAIL
+            start = perf_counter()
+            try:
+                hr = impl(*args, **kw)
+                return hr
+            finally:
+                elapsed = perf_counter() - start
+                with lock:
+                    stats.calls += 1
+                    stats.total_time += elapsed
+                    stats.samples.append(elapsed)
+                    # AddRef and Release return reference counts, which are
+                    # never negative.
+                    if isinstance(hr, int) and hr < 0:
+                        stats.errors += 1
+                        stats.hresults[hr] += 1
+
+        call_with_metrics.__dict__.update(impl.__dict__)  # 'has_outargs', ...
+        return call_with_metrics
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Return the metrics as a dictionary that maps 'Interface.Method'
+        names to dictionaries with 'calls', 'errors', 'total_time', 'p50',
+        'p90', 'p99' and 'max' latencies in seconds, and 'hresults' counts of
+        the failure codes.
+        """
+        with self._lock:
+            return {name: stats.as_dict() for name, stats in self._stats.items()}
+
+    def reset(self) -> None:
+        """Forget all recorded calls."""
+        with self._lock:
+            for stats in self._stats.values():
+                stats.clear()
+
+    def dump(self, path: str) -> None:
+        """Write the snapshot to the JSON file `path`."""
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as ofi:
+            json.dump(self.snapshot(), ofi, indent=2, sort_keys=True)
+        os.replace(tmp, path)
+
+    def start_dumping(self, path: str, interval: float) -> None:
+        """Dump the snapshot to `path` every `interval` seconds from a
+        daemon thread, until `stop_dumping` is called.
+        """
+        if self._dumper is not None:
+            raise RuntimeError("metrics are already dumped")
+        self._stop_dumping.clear()
+
+        def run():
+            while not self._stop_dumping.wait(interval):
+                try:
+                    self.dump(path)
+                except OSError:
+                    logger.exception("Could not dump metrics to %s", path)
+
+        self._dumper = threading.Thread(target=run, daemon=True)
+        self._dumper.start()
+
+    def stop_dumping(self) -> None:
+        """Stop the periodic dumps started by `start_dumping`."""
+        if self._dumper is None:
+            return
+        self._stop_dumping.set()
+        self._dumper.join()
+        self._dumper = None
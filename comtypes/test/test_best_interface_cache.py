@@ -0,0 +1,135 @@
+import unittest as ut
+from unittest import mock
+
+from comtypes import GUID, COMError, COMObject, IPersist, IUnknown, typeinfo
+from comtypes.automation import IDispatch
+from comtypes.client import GetBestInterface, _managing, clear_interface_cache
+from comtypes.client.dynamic import _Dispatch
+
+CLSID = GUID.create_new()
+
+
+class Persist(COMObject):
+    _com_interfaces_ = [IPersist]
+
+    def IPersist_GetClassID(self):
+        return CLSID
+
+
+class Unknown(COMObject):
+    _com_interfaces_ = [IUnknown]
+
+
+class Dispatch(COMObject):
+    _com_interfaces_ = [IDispatch]
+
+
+def dispatch_type_info(iid):
+    # the TypeInfo of a dispatch interface in a type library.
+    tinfo = mock.Mock()
+    tinfo.GetTypeAttr.return_value = mock.Mock(
+        guid=iid, wMajorVerNum=1, wMinorVerNum=0, typekind=typeinfo.TKIND_DISPATCH
+    )
+    tinfo.GetDocumentation.return_value = ("IPersist", None, None, None)
+    tinfo.GetContainingTypeLib.return_value = (mock.sentinel.tlib, 0)
+    return tinfo
+
+
+class Test_BestInterfaceCache(ut.TestCase):
+    def setUp(self):
+        clear_interface_cache()
+        self.addCleanup(clear_interface_cache)
+        patcher = mock.patch.object(
+            _managing, "_find_best_interface", return_value=IPersist
+        )
+        self.find = patcher.start()
+        self.addCleanup(patcher.stop)
+        # the objects do not provide their class info, only a dispatch type.
+        self.tinfo = dispatch_type_info(GUID.create_new())
+        patcher = mock.patch.object(
+            _managing, "_dispatch_type_info", return_value=self.tinfo
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_dispatch_type(self):
+        for _ in range(10):
+            obj = GetBestInterface(Persist().QueryInterface(IUnknown))
+            self.assertIsInstance(obj, IPersist)
+        self.assertEqual(self.find.call_count, 1)
+        self.find.assert_called_with(mock.ANY, self.tinfo)
+
+    def test_clsid(self):
+        # objects created by comtypes.client.CreateObject know their CLSID.
+        clsid = GUID.create_new()
+        self.find.return_value = IUnknown
+        for _ in range(10):
+            punk = Unknown().QueryInterface(IUnknown)
+            punk.__dict__["__clsid"] = str(clsid)
+            self.assertIsInstance(GetBestInterface(punk), IUnknown)
+        self.assertEqual(self.find.call_count, 1)
+
+    def test_negative(self):
+        self.find.return_value = None
+        for _ in range(10):
+            punk = Persist().QueryInterface(IUnknown)
+            self.assertIs(GetBestInterface(punk), punk)
+        self.assertEqual(self.find.call_count, 1)
+
+    def test_no_type_information(self):
+        _managing._dispatch_type_info.return_value = None
+        self.find.return_value = None
+        for _ in range(3):
+            punk = Unknown().QueryInterface(IUnknown)
+            self.assertIs(GetBestInterface(punk), punk)
+        self.assertEqual(self.find.call_count, 3)
+
+    def test_query_interface_fails(self):
+        self.find.return_value = IDispatch
+        with self.assertRaises(COMError):
+            GetBestInterface(Persist().QueryInterface(IUnknown))
+
+    def test_clear(self):
+        GetBestInterface(Persist().QueryInterface(IUnknown))
+        clear_interface_cache()
+        GetBestInterface(Persist().QueryInterface(IUnknown))
+        self.assertEqual(self.find.call_count, 2)
+
+
+class Test_FindBestInterface(ut.TestCase):
+    def setUp(self):
+        clear_interface_cache()
+        self.addCleanup(clear_interface_cache)
+        patcher = mock.patch.object(_managing, "_dispatch_type_info")
+        self.dispatch_type_info = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(
+            _managing, "GetModule", return_value=mock.Mock(IPersist=IPersist)
+        )
+        self.get_module = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_type_library_is_read_once(self):
+        # neither IProvideClassInfo nor IPersist are needed for the cache.
+        tinfo = dispatch_type_info(IPersist._iid_)
+        self.dispatch_type_info.return_value = tinfo
+        for _ in range(2):
+            obj = GetBestInterface(Persist().QueryInterface(IUnknown))
+            self.assertIsInstance(obj, IPersist)
+        self.assertEqual(self.dispatch_type_info.call_count, 2)
+        self.assertEqual(tinfo.GetTypeAttr.call_count, 3)
+        tinfo.GetContainingTypeLib.assert_called_once_with()
+        self.get_module.assert_called_once_with(mock.sentinel.tlib)
+
+    def test_default_interface_not_implemented(self):
+        # such objects are wrapped for dynamic dispatch, also when they are
+        # passed as IUnknown pointers.
+        self.dispatch_type_info.return_value = dispatch_type_info(GUID.create_new())
+        for _ in range(2):
+            obj = GetBestInterface(Dispatch().QueryInterface(IUnknown))
+            self.assertIsInstance(obj, _Dispatch)
+        self.get_module.assert_not_called()
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -1,5 +1,8 @@
 import unittest
+from ctypes import HRESULT, POINTER, c_int
+from unittest import mock
 
+from comtypes import COMMETHOD, GUID, IUnknown
 from comtypes.client import GetModule
 
 iem = GetModule("shdocvw.dll")
@@ -38,5 +41,59 @@ class TestCase(unittest.TestCase):
             self.assertTrue(name in iem.IWebBrowser2.__map_case__, f"{name} missing")
 
 
+class ICaseInsensitive(IUnknown):
+    _case_insensitive_ = True
+    _iid_ = GUID.create_new()
+    _methods_ = [
+        COMMETHOD(["propget"], HRESULT, "Value", (["out", "retval"], POINTER(c_int))),
+        COMMETHOD(["propput"], HRESULT, "Value", (["in"], c_int)),
+    ]
+
+
+class SetAttrTest(unittest.TestCase):
+    def test_any_spelling(self):
+        ptr = POINTER(ICaseInsensitive)()
+        with mock.patch.object(
+            ICaseInsensitive, "Value", new_callable=mock.PropertyMock
+        ) as prop:
+            ptr.Value = 1
+            ptr.value = 2
+            ptr.VALUE = 3
+        self.assertEqual(
+            prop.call_args_list, [mock.call(1), mock.call(2), mock.call(3)]
+        )
+        self.assertNotIn("value", ptr.__dict__)
+        self.assertNotIn("VALUE", ptr.__dict__)
+
+    def test_member_spellings_are_cached(self):
+        ptr = POINTER(ICaseInsensitive)()
+        with mock.patch.object(
+            ICaseInsensitive, "Value", new_callable=mock.PropertyMock
+        ):
+            ptr.vAlUe = 1
+        self.assertEqual(ICaseInsensitive.__map_spelling__["vAlUe"], "Value")
+        ptr.someAttribute = 42
+        self.assertEqual(ptr.__dict__["someAttribute"], 42)
+        self.assertNotIn("someAttribute", ICaseInsensitive.__map_spelling__)
+
+    def test_cache_is_cleared_when_members_change(self):
+        class IDerived(ICaseInsensitive):
+            _case_insensitive_ = True
+            _iid_ = GUID.create_new()
+            _methods_ = []
+
+        ptr = POINTER(IDerived)()
+        with mock.patch.object(IDerived, "Value", new_callable=mock.PropertyMock):
+            ptr.vALUE = 1
+        spellings = IDerived.__dict__["__map_spelling__"]
+        self.assertEqual(spellings, {"vALUE": "Value"})
+        self.assertNotIn("vALUE", ICaseInsensitive.__map_spelling__)
+        IDerived._methods_ = [
+            COMMETHOD(["propput"], HRESULT, "Other", (["in"], c_int)),
+        ]
+        self.assertEqual(spellings, {})
+        self.assertEqual(IDerived.__map_case__["other"], "Other")
+
+
 if __name__ == "__main__":
     unittest.main()
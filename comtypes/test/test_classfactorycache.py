@@ -0,0 +1,127 @@
+import threading
+import unittest as ut
+from unittest import mock
+
+import comtypes
+import comtypes.client
+from comtypes import CLSCTX_INPROC_SERVER, GUID, COMObject, IPersist
+from comtypes.client import ClassFactoryCache
+from comtypes.server import IClassFactory
+from comtypes.server.inprocserver import ClassFactory
+
+
+class Persist(COMObject):
+    _com_interfaces_ = [IPersist]
+
+
+class CountingFactory(ClassFactory):
+    # a stand-in for the class factory of an in-process server.
+    def __init__(self, cls):
+        super().__init__(cls)
+        self.created = 0
+        self.locks = []
+
+    def IClassFactory_CreateInstance(self, this, punkOuter, riid, ppv):
+        self.created += 1
+        return super().IClassFactory_CreateInstance(this, punkOuter, riid, ppv)
+
+    def IClassFactory_LockServer(self, this, fLock):
+        self.locks.append(bool(fLock))
+        return comtypes.hresult.S_OK
+
+
+CLSID = GUID.create_new()
+
+
+class Test_ClassFactoryCache(ut.TestCase):
+    def setUp(self):
+        self.factory = CountingFactory(Persist)
+        # the server keeps its class factory alive.
+        self.keep = self.factory.QueryInterface(IClassFactory)
+
+        def get_class_object(clsid, clsctx=None, pServerInfo=None, interface=None):
+            self.assertEqual(clsid, CLSID)
+            return self.factory.QueryInterface(IClassFactory)
+
+        patcher = mock.patch.object(
+            comtypes, "CoGetClassObject", side_effect=get_class_object
+        )
+        self.get_class_object = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_create_object(self):
+        cache = ClassFactoryCache()
+        for _ in range(100):
+            obj = cache.CreateObject(CLSID, interface=IPersist)
+            self.assertIsInstance(obj, IPersist)
+        self.assertEqual(self.get_class_object.call_count, 1)
+        self.assertEqual(self.factory.created, 100)
+
+    def test_compared_with_create_object(self):
+        # Every comtypes.client.CreateObject call goes through the whole
+        # activation path, which is stood in by the factory.
+        def co_create_instance(clsid, interface=None, clsctx=None):
+            factory = comtypes.CoGetClassObject(clsid, clsctx)
+            return factory.CreateInstance(interface=interface)
+
+        with mock.patch.object(
+            comtypes, "CoCreateInstance", side_effect=co_create_instance
+        ):
+            for _ in range(100):
+                comtypes.client.CreateObject(CLSID, interface=IPersist)
+        self.assertEqual(self.get_class_object.call_count, 100)
+        self.get_class_object.reset_mock()
+        cache = ClassFactoryCache()
+        for _ in range(100):
+            cache.CreateObject(CLSID, interface=IPersist)
+        self.assertEqual(self.get_class_object.call_count, 1)
+        self.assertEqual(self.factory.created, 200)
+
+    def test_clsctx(self):
+        cache = ClassFactoryCache()
+        first = cache.GetClassObject(CLSID)
+        self.assertIs(cache.GetClassObject(CLSID), first)
+        cache.GetClassObject(CLSID, CLSCTX_INPROC_SERVER)
+        self.assertEqual(self.get_class_object.call_count, 2)
+        cache.evict(CLSID, CLSCTX_INPROC_SERVER)
+        self.assertIs(cache.GetClassObject(CLSID), first)
+        self.assertEqual(self.get_class_object.call_count, 2)
+
+    def test_evict(self):
+        cache = ClassFactoryCache()
+        cache.GetClassObject(CLSID)
+        cache.evict(GUID.create_new())
+        cache.GetClassObject(CLSID)
+        self.assertEqual(self.get_class_object.call_count, 1)
+        cache.evict()
+        self.assertEqual(self.factory._refcnt.value, 1)
+        cache.GetClassObject(CLSID)
+        self.assertEqual(self.get_class_object.call_count, 2)
+
+    def test_lock_server(self):
+        cache = ClassFactoryCache(lock_server=True)
+        cache.CreateObject(CLSID, interface=IPersist)
+        cache.CreateObject(CLSID, interface=IPersist)
+        self.assertEqual(self.factory.locks, [True])
+        cache.evict(CLSID)
+        self.assertEqual(self.factory.locks, [True, False])
+
+    def test_thread_affinity(self):
+        cache = ClassFactoryCache()
+        errors = []
+
+        def create():
+            try:
+                cache.CreateObject(CLSID, interface=IPersist)
+            except RuntimeError as e:
+                errors.append(e)
+
+        t = threading.Thread(target=create)
+        t.start()
+        t.join()
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(self.get_class_object.call_count, 0)
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -0,0 +1,165 @@
+import asyncio
+import threading
+import unittest as ut
+from ctypes import pointer
+from unittest import mock
+
+from comtypes import (
+    DISPMETHOD,
+    GUID,
+    COMError,
+    COMObject,
+    IPersist,
+    dispid,
+    hresult,
+)
+from comtypes.automation import IDispatch
+from comtypes.client import AsyncApartment
+from comtypes.client._apartment import AsyncProxy
+from comtypes.connectionpoints import IConnectionPoint, IConnectionPointContainer
+from comtypes.server.connectionpoints import ConnectionPointImpl
+
+
+class IEvents(IDispatch):
+    _iid_ = GUID.create_new()
+    _methods_ = []
+    _disp_methods_ = [
+        DISPMETHOD([dispid(1)], None, "Fired", ([], int, "a"), ([], int, "b")),
+    ]
+
+
+class Source(COMObject):
+    # a stand-in for an object that fires events in its apartment.
+    _com_interfaces_ = [IConnectionPointContainer]
+
+    def __init__(self):
+        super().__init__()
+        typeinfo = mock.Mock()
+        typeinfo.GetIDsOfNames.return_value = [1]
+        self.cp = ConnectionPointImpl(IEvents, typeinfo)
+
+    def IConnectionPointContainer_FindConnectionPoint(self, this, refiid, ppcp):
+        return self.cp.IUnknown_QueryInterface(
+            None, pointer(IConnectionPoint._iid_), ppcp
+        )
+
+    def fire(self, a, b):
+        self.cp._call_sinks("Fired", a, b)
+
+
+class Persist(COMObject):
+    _com_interfaces_ = [IPersist]
+    _reg_clsid_ = GUID.create_new()
+
+    def __init__(self):
+        super().__init__()
+        self.threads = set()
+
+    def IPersist_GetClassID(self):
+        self.threads.add(threading.get_ident())
+        return self._reg_clsid_
+
+
+class Handler:
+    def __init__(self):
+        self.received = []
+        self.event = asyncio.Event()
+
+    async def Fired(self, a, b):
+        self.received.append((a, b))
+        self.event.set()
+
+
+class Test_AsyncApartment(ut.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.apartment = AsyncApartment()
+        await self.apartment.start()
+
+    async def asyncTearDown(self):
+        await self.apartment.shutdown()
+
+    async def test_run(self):
+        ident = await self.apartment.run(threading.get_ident)
+        self.assertNotEqual(ident, threading.get_ident())
+        self.assertEqual(await self.apartment.run(threading.get_ident), ident)
+
+        def fail():
+            raise COMError(hresult.E_FAIL, None, None)
+
+        with self.assertRaises(COMError):
+            await self.apartment.run(fail)
+
+    async def test_proxy(self):
+        persist = await self.apartment.run(Persist)
+        proxy = await self.apartment.run(persist.QueryInterface, IPersist)
+        self.assertIsInstance(proxy, AsyncProxy)
+        self.assertEqual(await proxy.GetClassID(), Persist._reg_clsid_)
+        self.assertNotIn(threading.get_ident(), persist.threads)
+        del proxy
+        # the object is released by the apartment.
+        await self.apartment.run(lambda: None)
+        self.assertEqual(persist._refcnt.value, 0)
+
+    async def test_coroutine_handler(self):
+        source = await self.apartment.run(Source)
+        handler = Handler()
+        await self.apartment.subscribe(source, handler, IEvents)
+        await self.apartment.run(source.fire, 1, 2)
+        await asyncio.wait_for(handler.event.wait(), 10)
+        self.assertEqual(handler.received, [(1, 2)])
+
+    async def test_queue(self):
+        source = await self.apartment.run(Source)
+        events = asyncio.Queue()
+        conn = await self.apartment.subscribe(source, events, IEvents)
+        await self.apartment.run(source.fire, 1, 2)
+        await self.apartment.run(source.fire, 3, 4)
+        self.assertEqual(await asyncio.wait_for(events.get(), 10), ("Fired", (1, 2)))
+        self.assertEqual(await asyncio.wait_for(events.get(), 10), ("Fired", (3, 4)))
+        await conn.disconnect()
+        self.assertEqual(source.cp._connections, {})
+        await self.apartment.run(source.fire, 5, 6)
+        await asyncio.sleep(0.01)
+        self.assertTrue(events.empty())
+
+    async def test_cancel(self):
+        started, resume = threading.Event(), threading.Event()
+        calls = []
+
+        def block():
+            started.set()
+            resume.wait(10)
+
+        blocking = asyncio.ensure_future(self.apartment.run(block))
+        pending = asyncio.ensure_future(self.apartment.run(calls.append, 1))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 10)
+        pending.cancel()
+        resume.set()
+        await blocking
+        await self.apartment.run(calls.append, 2)
+        self.assertEqual(calls, [2])
+        self.assertTrue(pending.cancelled())
+
+    async def test_shutdown(self):
+        source = await self.apartment.run(Source)
+        cancelled = []
+
+        class SlowHandler:
+            async def Fired(self, a, b):
+                try:
+                    await asyncio.sleep(3600)
+                except asyncio.CancelledError:
+                    cancelled.append((a, b))
+                    raise
+
+        await self.apartment.subscribe(source, SlowHandler(), IEvents)
+        await self.apartment.run(source.fire, 1, 2)
+        await self.apartment.shutdown()
+        self.assertEqual(source.cp._connections, {})
+        self.assertEqual(cancelled, [(1, 2)])
+        with self.assertRaises(RuntimeError):
+            await self.apartment.run(threading.get_ident)
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -0,0 +1,172 @@
+import gc
+import unittest as ut
+import weakref
+from ctypes import c_int
+from unittest import mock
+
+from comtypes import COMMETHOD, DISPMETHOD, GUID, HRESULT, IUnknown, dispid
+from comtypes.automation import IDispatch
+from comtypes.client import _events
+from comtypes.client._events import CreateEventReceiver, FindOutgoingInterface
+
+
+class IEvents(IDispatch):
+    _iid_ = GUID.create_new()
+    _methods_ = []
+    _disp_methods_ = [
+        DISPMETHOD([dispid(1)], None, "Fired", ([], int, "a"), ([], int, "b")),
+    ]
+
+
+class ICustomEvents(IUnknown):
+    _iid_ = GUID.create_new()
+    _methods_ = [
+        COMMETHOD([], HRESULT, "Changed", (["in"], c_int, "value")),
+    ]
+
+
+class Handler:
+    def __init__(self):
+        self.received = []
+
+    def Fired(self, a, b):
+        self.received.append((a, b))
+
+    def Changed(self, this, value):
+        self.received.append(value)
+
+
+class DynamicHandler:
+    def __init__(self):
+        self.received = []
+
+    def __getattr__(self, name):
+        if name != "Fired":
+            raise AttributeError(name)
+        return self.dynamic
+
+    def dynamic(self, a, b):
+        self.received.append(("dynamic", a, b))
+
+
+class Test_CreateEventReceiver(ut.TestCase):
+    def test_shared_sink_class(self):
+        handlers = [Handler() for _ in range(1000)]
+        sinks = [CreateEventReceiver(IEvents, h) for h in handlers]
+        self.assertEqual(len({type(sink) for sink in sinks}), 1)
+        for i, sink in enumerate(sinks[:10]):
+            sink.QueryInterface(IEvents).Invoke(1, i, -i)
+        self.assertEqual(
+            [h.received for h in handlers[:10]], [[(i, -i)] for i in range(10)]
+        )
+        self.assertEqual(handlers[10].received, [])
+
+    def test_handler_classes(self):
+        class Other(Handler):
+            pass
+
+        sink = CreateEventReceiver(IEvents, Handler())
+        other = CreateEventReceiver(IEvents, Other())
+        self.assertIsNot(type(sink), type(other))
+        self.assertIs(type(CreateEventReceiver(IEvents, Other())), type(other))
+
+    def test_custom_interface(self):
+        handler = Handler()
+        sink = CreateEventReceiver(ICustomEvents, handler)
+        sink.QueryInterface(ICustomEvents).Changed(42)
+        self.assertEqual(handler.received, [42])
+        self.assertIs(type(CreateEventReceiver(ICustomEvents, Handler())), type(sink))
+
+    def test_instance_attribute(self):
+        handler = Handler()
+        handler.Fired = DynamicHandler().dynamic
+        sink = CreateEventReceiver(IEvents, handler)
+        self.assertIsNot(type(sink), type(CreateEventReceiver(IEvents, Handler())))
+        sink.QueryInterface(IEvents).Invoke(1, 1, 2)
+        self.assertEqual(handler.received, [])
+        self.assertEqual(handler.Fired.__self__.received, [("dynamic", 1, 2)])
+
+    def test_dynamic_handler(self):
+        handler = DynamicHandler()
+        sink = CreateEventReceiver(IEvents, handler)
+        self.assertIsNot(type(sink), type(CreateEventReceiver(IEvents, handler)))
+        sink.QueryInterface(IEvents).Invoke(1, 1, 2)
+        self.assertEqual(handler.received, [("dynamic", 1, 2)])
+
+    def test_handler_class_is_collected(self):
+        class Other(Handler):
+            def Fired(self, a, b):
+                super().Fired(a, b)
+
+        handler = Other()
+        sink = CreateEventReceiver(IEvents, handler)
+        sink.QueryInterface(IEvents).Invoke(1, 1, 2)
+        self.assertEqual(handler.received, [(1, 2)])
+        ref = weakref.ref(Other)
+        del Other, handler, sink
+        gc.collect()
+        self.assertIsNone(ref())
+
+    def test_handler_class_is_not_changed(self):
+        class Frozen(type):
+            def __setattr__(cls, name, value):
+                raise AttributeError(name)
+
+        class Slotted(metaclass=Frozen):
+            __slots__ = ("received",)
+
+            def __init__(self):
+                self.received = []
+
+            def Fired(self, a, b):
+                self.received.append((a, b))
+
+        attrs = dict(vars(Slotted))
+        handler = Slotted()
+        sink = CreateEventReceiver(IEvents, handler)
+        # the sink class is shared all the same.
+        self.assertIs(type(CreateEventReceiver(IEvents, Slotted())), type(sink))
+        sink.QueryInterface(IEvents).Invoke(1, 1, 2)
+        self.assertEqual(handler.received, [(1, 2)])
+        self.assertEqual(dict(vars(Slotted)), attrs)
+
+
+class Test_FindOutgoingInterface(ut.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(
+            _events, "_find_outgoing_interface", return_value=IEvents
+        )
+        self.find = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(_events._outgoing_interfaces.clear)
+
+    def source(self, clsid):
+        punk = Handler()  # anything with a __dict__ will do.
+        if clsid is not None:
+            punk.__dict__["__clsid"] = str(clsid)
+        return punk
+
+    def test_cached_per_clsid(self):
+        clsid = GUID.create_new()
+        for _ in range(10):
+            self.assertIs(FindOutgoingInterface(self.source(clsid)), IEvents)
+        self.assertEqual(self.find.call_count, 1)
+        FindOutgoingInterface(self.source(GUID.create_new()))
+        self.assertEqual(self.find.call_count, 2)
+
+    def test_unknown_clsid(self):
+        for _ in range(3):
+            self.assertIs(FindOutgoingInterface(self.source(None)), IEvents)
+        self.assertEqual(self.find.call_count, 3)
+
+    def test_errors_are_not_cached(self):
+        clsid = GUID.create_new()
+        self.find.side_effect = TypeError
+        with self.assertRaises(TypeError):
+            FindOutgoingInterface(self.source(clsid))
+        self.find.side_effect = None
+        self.assertIs(FindOutgoingInterface(self.source(clsid)), IEvents)
+
+
+if __name__ == "__main__":
+    ut.main()
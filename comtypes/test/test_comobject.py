@@ -1,13 +1,37 @@
 import ctypes
+import gc
 import unittest as ut
-from ctypes import POINTER, byref, pointer
+import weakref
+from ctypes import POINTER, byref, c_uint, pointer
 from unittest import mock
 
 import comtypes.client
-from comtypes import CLSCTX_SERVER, COMObject, IPersist, IUnknown, hresult
+import comtypes.client.dynamic
+from comtypes import (
+    CLSCTX_SERVER,
+    DISPMETHOD,
+    DISPPROPERTY,
+    GUID,
+    COMError,
+    COMObject,
+    IPersist,
+    IUnknown,
+    _vtbl,
+    dispid,
+    hresult,
+)
 from comtypes._post_coinit.misc import _CoCreateInstance
-from comtypes.automation import IDispatch
-from comtypes.typeinfo import GUIDKIND_DEFAULT_SOURCE_DISP_IID
+from comtypes.automation import (
+    DISPATCH_METHOD,
+    DISPATCH_PROPERTYGET,
+    DISPATCH_PROPERTYPUT,
+    DISPID,
+    DISPID_PROPERTYPUT,
+    DISPPARAMS,
+    VARIANT,
+    IDispatch,
+)
+from comtypes.typeinfo import GUIDKIND_DEFAULT_SOURCE_DISP_IID, TKIND_DISPATCH
 
 comtypes.client.GetModule("UIAutomationCore.dll")
 comtypes.client.GetModule("scrrun.dll")
@@ -79,6 +103,34 @@ class Test_IUnknown_QueryInterface(ut.TestCase):
         self.assertEqual(dic.Release(), 1)  # type: ignore
         self.assertEqual(dic.GetTypeInfoCount(), 1)  # type: ignore
 
+    def test_null_iid(self):
+        hr = scrrun.Dictionary().IUnknown_QueryInterface(
+            None, POINTER(GUID)(), ctypes.c_void_p()
+        )
+        self.assertEqual(hr, hresult.E_POINTER)
+
+    def test_iid_slots_shared_by_instances(self):
+        first, second = scrrun.Dictionary(), scrrun.Dictionary()
+        self.assertIs(first._COMObject__iid_slots, second._COMObject__iid_slots)
+        self.assertIsNot(
+            first._COMObject__interface_pointers,
+            second._COMObject__interface_pointers,
+        )
+        for iid, ptr in first._com_pointers_.items():
+            slot = first._COMObject__iid_slots[bytes(iid)]
+            self.assertIs(first._COMObject__interface_pointers[slot], ptr)
+
+    def test_after_final_release(self):
+        obj = scrrun.Dictionary()
+        obj.IUnknown_AddRef(None)
+        obj.IUnknown_Release(None)
+        dic = POINTER(IDispatch)()
+        hr = obj.IUnknown_QueryInterface(
+            None, pointer(scrrun.IDictionary._iid_), byref(dic)
+        )
+        self.assertEqual(hr, hresult.E_NOINTERFACE)
+        self.assertFalse(dic)
+
 
 class Test_IUnknown_AddRef_IUnknown_Release(ut.TestCase):
     def test(self):
@@ -157,3 +209,270 @@ class Test_Vtbl(ut.TestCase):
         self.assertNotIn(IDispatch._iid_, cuia._com_pointers_)
         self.assertIn(stdole.IPictureDisp._iid_, stdpic._com_pointers_)
         self.assertIn(uiac.IUIAutomation._iid_, cuia._com_pointers_)
+
+
+class _Persist(COMObject):
+    _com_interfaces_ = [IPersist]
+
+    def __init__(self, clsid):
+        self.clsid = clsid
+
+    def IPersist_GetClassID(self):
+        return self.clsid
+
+
+class Test_SharedVtbl(ut.TestCase):
+    def _vtbl_address(self, obj):
+        return ctypes.addressof(obj._com_pointers_[IPersist._iid_].contents.contents)
+
+    def test_shared_by_instances(self):
+        with mock.patch.object(
+            _vtbl, "create_vtbl_mapping", wraps=_vtbl.create_vtbl_mapping
+        ) as create:
+
+            class Persist(_Persist):
+                pass
+
+            objs = [Persist(GUID.create_new()) for _ in range(10)]
+        # once for each of IPersist and ISupportErrorInfo
+        self.assertEqual(create.call_count, 2)
+        self.assertEqual(len({self._vtbl_address(o) for o in objs}), 1)
+
+    def test_dispatch_through_this(self):
+        first, second = GUID.create_new(), GUID.create_new()
+        ptr1 = _Persist(first).QueryInterface(IPersist)
+        ptr2 = _Persist(second).QueryInterface(IPersist)
+        self.assertEqual(ptr1.GetClassID(), first)
+        self.assertEqual(ptr2.GetClassID(), second)
+
+    def test_custom_method_finder(self):
+        class Persist(_Persist):
+            def _get_method_finder_(self, itf):
+                return _vtbl._MethodFinder(self)
+
+        clsid = GUID.create_new()
+        obj = Persist(clsid)
+        self.assertNotEqual(self._vtbl_address(obj), self._vtbl_address(Persist(clsid)))
+        self.assertEqual(obj.QueryInterface(IPersist).GetClassID(), clsid)
+
+    def test_staticmethod_impl(self):
+        clsid = GUID.create_new()
+
+        class Persist(COMObject):
+            _com_interfaces_ = [IPersist]
+
+            @staticmethod
+            def IPersist_GetClassID():
+                return clsid
+
+        self.assertIsNone(_vtbl.get_vtbl_template(Persist, IPersist))
+        self.assertEqual(Persist().QueryInterface(IPersist).GetClassID(), clsid)
+
+    def test_class_is_collected(self):
+        class Persist(_Persist):
+            def IPersist_GetClassID(self):
+                return super().IPersist_GetClassID()
+
+        clsid = GUID.create_new()
+        self.assertEqual(Persist(clsid).QueryInterface(IPersist).GetClassID(), clsid)
+        self.assertIsNotNone(_vtbl.get_vtbl_template(Persist, IPersist))
+        ref = weakref.ref(Persist)
+        del Persist
+        gc.collect()
+        self.assertIsNone(ref())
+
+    def test_unregistered_on_deletion(self):
+        obj = _Persist(GUID.create_new())
+        address = ctypes.addressof(obj._com_pointers_[IPersist._iid_].contents)
+        self.assertIs(_vtbl._this_registry.lookup(address), obj)
+        del obj
+        with self.assertRaises(KeyError):
+            _vtbl._this_registry.lookup(address)
+
+
+class IHarness(IDispatch):
+    _iid_ = GUID.create_new()
+    _methods_ = []
+    _disp_methods_ = [
+        DISPMETHOD(
+            [dispid(1)],
+            VARIANT,
+            "Add",
+            ([], VARIANT, "a"),
+            ([], VARIANT, "b"),
+            (["in", "optional"], VARIANT, "c", 100),
+        ),
+        DISPMETHOD([dispid(2), "propget"], VARIANT, "Item", ([], VARIANT, "index")),
+        DISPMETHOD(
+            [dispid(2), "propput"],
+            None,
+            "Item",
+            ([], VARIANT, "index"),
+            ([], VARIANT, "value"),
+        ),
+        DISPPROPERTY([dispid(3)], VARIANT, "Name"),
+    ]
+
+
+class Harness(COMObject):
+    _com_interfaces_ = [IHarness]
+
+    def __init__(self):
+        self.items = {}
+        self.Name = "harness"
+
+    def Add(self, a, b, c):
+        return a + b + c
+
+    def _get_Item(self, index):
+        return self.items[index]
+
+    def _set_Item(self, index, value):
+        self.items[index] = value
+
+
+def _dispparams(*args, named=()):
+    # `args` in the order of the rgvarg array, i.e. reversed.
+    dp = DISPPARAMS()
+    dp.cArgs = len(args)
+    dp.rgvarg = (VARIANT * len(args))(*map(VARIANT, args))
+    dp.cNamedArgs = len(named)
+    if named:
+        dp.rgdispidNamedArgs = (DISPID * len(named))(*named)
+    return dp
+
+
+class Test_IDispatch_Invoke(ut.TestCase):
+    def setUp(self):
+        self.obj = Harness()
+
+    def invoke(self, memid, invkind, dp):
+        result = VARIANT()
+        argerr = c_uint(42)
+        hr = self.obj.IDispatch_Invoke(
+            None,
+            memid,
+            None,
+            0,
+            invkind,
+            pointer(dp),
+            pointer(result),
+            None,
+            pointer(argerr),
+        )
+        return hr, result.value, argerr.value
+
+    def test_round_trip(self):
+        ptr = self.obj.QueryInterface(IHarness)
+        self.assertEqual(ptr.Add(1, 2), 103)
+        self.assertEqual(ptr.Add(1, 2, 3), 6)
+        ptr.Item[3] = "spam"
+        self.assertEqual(self.obj.items, {3: "spam"})
+        self.assertEqual(ptr.Item[3], "spam")
+        self.assertEqual(ptr.Name, "harness")
+        ptr.Name = "ham"
+        self.assertEqual(self.obj.Name, "ham")
+
+    def test_named_args(self):
+        # Add(1, c=10, b=7)
+        dp = _dispparams(10, 7, 1, named=(2, 1))
+        self.assertEqual(self.invoke(1, DISPATCH_METHOD, dp), (hresult.S_OK, 18, 42))
+        # Add(a=1, c=10)
+        dp = _dispparams(10, 1, named=(2, 0))
+        self.assertEqual(
+            self.invoke(1, DISPATCH_METHOD, dp)[0], hresult.DISP_E_PARAMNOTOPTIONAL
+        )
+
+    def test_unknown_named_arg(self):
+        dp = _dispparams(3, 2, 1, named=(5,))
+        self.assertEqual(
+            self.invoke(1, DISPATCH_METHOD, dp), (hresult.DISP_E_PARAMNOTFOUND, None, 0)
+        )
+
+    def test_too_many_args(self):
+        dp = _dispparams(4, 3, 2, 1)
+        self.assertEqual(
+            self.invoke(1, DISPATCH_METHOD, dp)[0], hresult.DISP_E_BADPARAMCOUNT
+        )
+
+    def test_missing_optional_arg(self):
+        dp = _dispparams(VARIANT.missing, 2, 1)
+        self.assertEqual(self.invoke(1, DISPATCH_METHOD, dp)[:2], (hresult.S_OK, 103))
+
+    def test_args_are_not_compared(self):
+        class Uncomparable:
+            def __eq__(self, other):
+                raise ValueError("ambiguous")
+
+        arg = Uncomparable()
+        unpack = _vtbl.compile_dispparams([(1, "a")], DISPATCH_METHOD)
+        with mock.patch.object(
+            VARIANT, "value", new_callable=mock.PropertyMock, return_value=arg
+        ):
+            args = unpack(_dispparams(1))
+        self.assertEqual(len(args), 1)
+        self.assertIs(args[0], arg)
+
+    def test_propput_with_index(self):
+        dp = _dispparams("spam", 3, named=(DISPID_PROPERTYPUT,))
+        self.assertEqual(self.invoke(2, DISPATCH_PROPERTYPUT, dp)[0], hresult.S_OK)
+        self.assertEqual(self.obj.items, {3: "spam"})
+        self.assertEqual(
+            self.invoke(2, DISPATCH_PROPERTYGET, _dispparams(3))[:2],
+            (hresult.S_OK, "spam"),
+        )
+
+    def test_propput_without_named_arg(self):
+        dp = _dispparams("spam", 3)
+        self.assertEqual(
+            self.invoke(2, DISPATCH_PROPERTYPUT, dp)[0], hresult.DISP_E_PARAMNOTFOUND
+        )
+        self.assertEqual(self.obj.items, {})
+
+    def test_no_result(self):
+        dp = _dispparams(2, 1)
+        hr = self.obj.IDispatch_Invoke(
+            None, 1, None, 0, DISPATCH_METHOD, pointer(dp), None, None, None
+        )
+        self.assertEqual(hr, hresult.S_OK)
+
+
+class Test_IDispatch_WithoutTypelib(ut.TestCase):
+    def setUp(self):
+        self.disp = Harness().QueryInterface(IDispatch)
+
+    def test_get_ids_of_names(self):
+        self.assertEqual(self.disp.GetIDsOfNames("Add"), [1])
+        self.assertEqual(self.disp.GetIDsOfNames("ADD", "c", "a"), [1, 2, 0])
+        self.assertEqual(self.disp.GetIDsOfNames("item"), [2])
+        self.assertEqual(self.disp.GetIDsOfNames("Name"), [3])
+        with self.assertRaises(COMError) as cm:
+            self.disp.GetIDsOfNames("Subtract")
+        self.assertEqual(cm.exception.hresult, hresult.DISP_E_UNKNOWNNAME)
+        with self.assertRaises(COMError) as cm:
+            self.disp.GetIDsOfNames("Add", "d")
+        self.assertEqual(cm.exception.hresult, hresult.DISP_E_UNKNOWNNAME)
+
+    def test_invoke(self):
+        (memid,) = self.disp.GetIDsOfNames("Add")
+        self.assertEqual(self.disp.Invoke(memid, 1, 2), 103)
+        (memid,) = self.disp.GetIDsOfNames("Name")
+        self.disp.Invoke(memid, 42, _invkind=DISPATCH_PROPERTYPUT)
+        self.assertEqual(self.disp.Invoke(memid, _invkind=DISPATCH_PROPERTYGET), 42)
+
+    def test_type_info(self):
+        self.assertEqual(self.disp.GetTypeInfoCount(), 1)
+        tinfo = self.disp.GetTypeInfo(0)
+        ta = tinfo.GetTypeAttr()
+        self.assertEqual(ta.guid, IHarness._iid_)
+        self.assertEqual(ta.typekind, TKIND_DISPATCH)
+        # 'Add', and the getters and setters of 'Item' and 'Name'.
+        self.assertEqual(ta.cFuncs, 5)
+        self.assertEqual(tinfo.GetNames(1, 4), ["Add", "a", "b", "c"])
+        self.assertEqual(tinfo.GetDocumentation(3)[0], "Name")
+
+    def test_dynamic_dispatch(self):
+        obj = comtypes.client.dynamic.Dispatch(self.disp)
+        self.assertEqual(obj.Add(1, 2, 3), 6)
+        obj.Name = "python"
+        self.assertEqual(obj.Name, "python")
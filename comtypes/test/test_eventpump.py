@@ -0,0 +1,139 @@
+import ctypes
+import threading
+import unittest as ut
+from unittest import mock
+
+from comtypes import hresult
+from comtypes.client import EventPump, PumpEvents, _events
+
+
+class Waiter:
+    # a stand-in for CoWaitForMultipleHandles and the event functions,
+    # with integers as handles.
+    def __init__(self):
+        self.created = []
+        self.closed = []
+        self.signaled = set()
+        self.routines = []
+        self.calls = []
+        self.during = None
+
+    def create_event(self, lpEventAttributes, bManualReset, bInitialState, lpName):
+        self.created.append(100 + len(self.created))
+        return self.created[-1]
+
+    def set_event(self, hEvent):
+        self.signaled.add(hEvent)
+        return 1
+
+    def set_console_ctrl_handler(self, HandlerRoutine, Add):
+        if Add:
+            self.routines.append(HandlerRoutine)
+        else:
+            self.routines.remove(HandlerRoutine)
+        return 1
+
+    def __call__(self, dwFlags, dwTimeout, cHandles, pHandles, lpdwindex):
+        handles = list(pHandles[:cHandles])
+        self.calls.append((dwFlags, dwTimeout, handles))
+        if self.during is not None:
+            self.during()
+        for i, handle in enumerate(handles):
+            if handle in self.signaled:
+                self.signaled.discard(handle)
+                lpdwindex._obj.value = i
+                return hresult.S_OK
+        raise ctypes.WinError(hresult.RPC_S_CALLPENDING)
+
+
+class Test_EventPump(ut.TestCase):
+    def setUp(self):
+        self.waiter = Waiter()
+        patcher = mock.patch.multiple(
+            _events,
+            _CreateEventA=self.waiter.create_event,
+            _SetEvent=self.waiter.set_event,
+            _SetConsoleCtrlHandler=self.waiter.set_console_ctrl_handler,
+            _CloseHandle=self.waiter.closed.append,
+            _CoWaitForMultipleHandles=self.waiter,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_timeout(self):
+        with EventPump() as pump:
+            for _ in range(3):
+                self.assertIsNone(pump.pump(0.01))
+            self.assertIsNone(pump.pump(None))
+        self.assertEqual(len(self.waiter.created), 2)
+        self.assertEqual(
+            self.waiter.calls,
+            [(_events.COWAIT_DEFAULT, 10, [100, 101])] * 3
+            + [(_events.COWAIT_DEFAULT, _events.INFINITE, [100, 101])],
+        )
+
+    def test_close(self):
+        pump = EventPump()
+        self.assertEqual(len(self.waiter.routines), 1)
+        pump.close()
+        pump.close()
+        self.assertEqual(self.waiter.routines, [])
+        self.assertEqual(self.waiter.closed, [100, 101])
+        with self.assertRaises(RuntimeError):
+            pump.pump(0)
+
+    def test_handles(self):
+        with EventPump([7], wait=self.waiter) as pump:
+            pump.add_handle(8)
+            self.assertEqual(pump.handles, [7, 8])
+            self.waiter.signaled.add(8)
+            self.assertEqual(pump.pump(1), 8)
+            pump.remove_handle(7)
+            self.assertEqual(pump.handles, [8])
+            self.assertIsNone(pump.pump(1))
+        self.assertEqual(self.waiter.calls[-1][2], [100, 101, 8])
+        self.assertEqual(self.waiter.closed, [100, 101])
+
+    def test_wakeup(self):
+        with EventPump() as pump:
+            pump.wakeup()
+            self.assertEqual(pump.pump(1), pump.wakeup_handle)
+            self.assertIsNone(pump.pump(1))
+            self.waiter.during = pump.wakeup
+            self.assertEqual(pump.pump(1), pump.wakeup_handle)
+
+    def test_ctrl_c(self):
+        with EventPump() as pump:
+            (routine,) = self.waiter.routines
+            # not swallowed between waits
+            self.assertEqual(routine(_events.CTRL_C_EVENT), 0)
+            self.assertEqual(self.waiter.signaled, set())
+            self.waiter.during = lambda: self.assertEqual(
+                routine(_events.CTRL_C_EVENT), 1
+            )
+            with self.assertRaises(KeyboardInterrupt):
+                pump.pump(1)
+            self.waiter.during = lambda: self.assertEqual(
+                routine(_events.CTRL_BREAK_EVENT), 0
+            )
+            self.assertIsNone(pump.pump(1))
+
+    def test_error(self):
+        def wait(*args):
+            raise ctypes.WinError(hresult.E_INVALIDARG)
+
+        with EventPump(wait=wait) as pump:
+            with self.assertRaises(OSError):
+                pump.pump(1)
+
+    @mock.patch.object(_events, "_pumps", threading.local())
+    def test_pump_events(self):
+        for _ in range(3):
+            PumpEvents(0.05)
+        self.assertEqual(len(self.waiter.created), 2)
+        self.assertEqual(len(self.waiter.routines), 1)
+        self.assertEqual(len(self.waiter.calls), 3)
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -0,0 +1,60 @@
+import gc
+import unittest as ut
+
+from comtypes import COMObject, IPersist, IUnknown
+from comtypes.client import GetBestInterface, enable_identity_map, wrap_outparam
+
+
+class Persist(COMObject):
+    _com_interfaces_ = [IPersist]
+
+
+class Test_IdentityMap(ut.TestCase):
+    def setUp(self):
+        enable_identity_map()
+        self.obj = Persist()
+
+    def tearDown(self):
+        enable_identity_map(False)
+
+    def test_wrap_outparam(self):
+        first = wrap_outparam(self.obj.QueryInterface(IPersist))
+        second = wrap_outparam(self.obj.QueryInterface(IPersist))
+        self.assertIs(first, second)
+        self.assertEqual(first, second)
+        first.attribute = 42
+        self.assertEqual(wrap_outparam(self.obj.QueryInterface(IPersist)).attribute, 42)
+        # the duplicates have released their references.
+        gc.collect()
+        self.assertEqual(self.obj._refcnt.value, 1)
+
+    def test_interfaces_are_not_mixed(self):
+        persist = wrap_outparam(self.obj.QueryInterface(IPersist))
+        unknown = wrap_outparam(self.obj.QueryInterface(IUnknown))
+        self.assertIsNot(persist, unknown)
+        self.assertIs(wrap_outparam(self.obj.QueryInterface(IUnknown)), unknown)
+
+    def test_objects_are_not_mixed(self):
+        other = Persist()
+        first = wrap_outparam(self.obj.QueryInterface(IPersist))
+        self.assertIsNot(wrap_outparam(other.QueryInterface(IPersist)), first)
+
+    def test_get_best_interface(self):
+        first = GetBestInterface(self.obj.QueryInterface(IPersist))
+        self.assertIs(GetBestInterface(self.obj.QueryInterface(IUnknown)), first)
+
+    def test_wrappers_are_weakly_referenced(self):
+        wrap_outparam(self.obj.QueryInterface(IPersist))
+        gc.collect()
+        self.assertEqual(self.obj._refcnt.value, 0)
+
+    def test_disabled(self):
+        enable_identity_map(False)
+        first = wrap_outparam(self.obj.QueryInterface(IPersist))
+        second = wrap_outparam(self.obj.QueryInterface(IPersist))
+        self.assertIsNot(first, second)
+        self.assertEqual(first, second)
+
+
+if __name__ == "__main__":
+    ut.main()
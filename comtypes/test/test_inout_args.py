@@ -2,11 +2,12 @@ import unittest as ut
 from collections.abc import Callable
 from ctypes import HRESULT, POINTER, Structure, c_int, c_ulong, c_wchar_p, pointer
 from typing import TYPE_CHECKING, Any, NamedTuple
+from unittest import mock
 from unittest.mock import MagicMock
 
 import comtypes
-from comtypes import IUnknown
-from comtypes._memberspec import _fix_inout_args
+from comtypes import IUnknown, _memberspec
+from comtypes._memberspec import _compile_inout_params, _fix_inout_args
 
 if TYPE_CHECKING:
     from comtypes import hints  # type: ignore
@@ -266,6 +267,46 @@ class Test_ArgsKwargsCombinations(ut.TestCase):
         )
 
 
+class Test_CompiledParams(ut.TestCase):
+    def setUp(self):
+        # a memberspec of `PortableDeviceApiLib.IPortableDeviceContent`
+        self.spec = comtypes.COMMETHOD(
+            [],
+            HRESULT,
+            "CreateObjectWithPropertiesAndData",
+            (["in"], POINTER(IUnknown), "pValues"),  # IPortableDeviceValues
+            (["out"], POINTER(POINTER(IUnknown)), "ppData"),  # IStream
+            (["in", "out"], POINTER(c_ulong), "pdwOptimalWriteBufferSize"),
+            (["in", "out"], POINTER(WSTRING), "ppszCookie"),
+        )
+
+    def test_compile(self):
+        inouts, num_outs = _compile_inout_params(
+            self.spec.argtypes, self.spec.paramflags
+        )
+        self.assertEqual(num_outs, 3)
+        self.assertEqual(
+            [(p.param_index, p.name, p.outnum, p.atyp) for p in inouts],
+            [
+                (1, "pdwOptimalWriteBufferSize", 1, c_ulong),
+                (2, "ppszCookie", 2, WSTRING),
+            ],
+        )
+
+    def test_converters_are_created_once(self):
+        orig = MagicMock(return_value=(POINTER(IUnknown)(), ..., ...))
+        with mock.patch.object(
+            _memberspec,
+            "_parameter_converter",
+            wraps=_memberspec._parameter_converter,
+        ) as converter:
+            fixed = _fix_inout_args(orig, self.spec.argtypes, self.spec.paramflags)
+            self.assertEqual(converter.call_count, 2)
+            for i in range(10):
+                fixed(MagicMock(name="Self"), None, i, str(i))
+            self.assertEqual(converter.call_count, 2)
+
+
 class PermutedArgspecTestingParams(NamedTuple):
     argspec: "_ArgSpecType"
     args: tuple[Any, Any, Any]
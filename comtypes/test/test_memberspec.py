@@ -0,0 +1,102 @@
+import ctypes
+import unittest as ut
+from ctypes import HRESULT, POINTER, c_int
+from unittest import mock
+
+from comtypes import COMMETHOD, GUID, IUnknown
+from comtypes._memberspec import lazy_instancemethod, lazy_property, named_property
+
+
+def _create_interface(name, nmethods):
+    methods = []
+    for i in range(nmethods):
+        methods.append(COMMETHOD([], HRESULT, f"Method{i}", (["in"], c_int, "x")))
+        methods.append(
+            COMMETHOD(
+                ["propget"], HRESULT, f"Prop{i}", (["out", "retval"], POINTER(c_int))
+            )
+        )
+    namespace = {"_iid_": GUID.create_new(), "_methods_": methods}
+    return type(IUnknown)(name, (IUnknown,), namespace)
+
+
+class Test_LazyMaterialization(ut.TestCase):
+    def test_no_prototype_created_at_class_creation(self):
+        with mock.patch.object(
+            ctypes, "WINFUNCTYPE", wraps=ctypes.WINFUNCTYPE
+        ) as winfunctype:
+            itfs = [_create_interface(f"ILazy{i}", 50) for i in range(100)]
+            winfunctype.assert_not_called()
+        for itf in itfs:
+            self.assertIsInstance(itf.__dict__["Method0"], lazy_instancemethod)
+            self.assertIsInstance(
+                itf.__dict__[f"_{itf.__name__}__com_Method0"], lazy_instancemethod
+            )
+            self.assertIsInstance(itf.__dict__["Prop0"], lazy_property)
+
+    def test_method_is_cached_on_class(self):
+        itf = _create_interface("ILazyMethod", 1)
+        with mock.patch.object(
+            ctypes, "WINFUNCTYPE", wraps=ctypes.WINFUNCTYPE
+        ) as winfunctype:
+            func = itf.Method0
+            winfunctype.assert_called_once_with(HRESULT, c_int)
+            self.assertNotIsInstance(itf.__dict__["Method0"], lazy_instancemethod)
+            self.assertIs(itf.Method0, func)
+            self.assertEqual(func.__name__, "Method0")
+            # the low level function shares the prototype of the high level one.
+            raw_func = getattr(itf, "_ILazyMethod__com_Method0")
+            self.assertIs(type(raw_func), type(func))
+            winfunctype.assert_called_once()
+
+    def test_method_of_base_interface_is_cached_on_base(self):
+        base = _create_interface("ILazyBase", 1)
+        derived = type(type(base))(
+            "ILazyDerived", (base,), {"_iid_": GUID.create_new(), "_methods_": []}
+        )
+        POINTER(derived).Method0
+        self.assertNotIsInstance(base.__dict__["Method0"], lazy_instancemethod)
+        self.assertNotIn("Method0", derived.__dict__)
+
+    def test_property_is_cached_on_class(self):
+        itf = _create_interface("ILazyProp", 1)
+        prop = itf.Prop0
+        self.assertIsInstance(prop, property)
+        self.assertIs(itf.__dict__["Prop0"], prop)
+        self.assertEqual(prop.fget.__name__, "_get_Prop0")
+
+
+class Test_NamedProperty(ut.TestCase):
+    def setUp(self):
+        self.fget = mock.Mock(return_value=42)
+        self.fset = mock.Mock()
+        self.prop = named_property("Cells", self.fget, self.fset)
+        self.inst = object()
+
+    def test_bound_has_no_dict(self):
+        bound = self.prop.__get__(self.inst)
+        self.assertFalse(hasattr(bound, "__dict__"))
+
+    def test_getitem(self):
+        bound = self.prop.__get__(self.inst)
+        self.assertEqual(bound[1, 2], 42)
+        self.fget.assert_called_with(self.inst, 1, 2)
+        self.assertEqual(bound["A1"], 42)
+        self.fget.assert_called_with(self.inst, "A1")
+        self.assertEqual(bound[:], 42)
+        self.fget.assert_called_with(self.inst)
+        self.assertEqual(bound[1:2], 42)
+        self.fget.assert_called_with(self.inst, slice(1, 2))
+
+    def test_setitem(self):
+        bound = self.prop.__get__(self.inst)
+        bound[1, 2] = "x"
+        self.fset.assert_called_with(self.inst, 1, 2, "x")
+        bound["A1"] = "y"
+        self.fset.assert_called_with(self.inst, "A1", "y")
+        bound[:] = "z"
+        self.fset.assert_called_with(self.inst, "z")
+
+
+if __name__ == "__main__":
+    ut.main()
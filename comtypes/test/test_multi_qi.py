@@ -0,0 +1,118 @@
+import unittest as ut
+from ctypes import POINTER, c_void_p, cast, pointer
+from unittest import mock
+
+import comtypes
+import comtypes.client
+from comtypes import (
+    CLSCTX_LOCAL_SERVER,
+    CLSCTX_REMOTE_SERVER,
+    CLSCTX_SERVER,
+    COSERVERINFO,
+    GUID,
+    COMObject,
+    IPersist,
+    IUnknown,
+    hresult,
+)
+from comtypes._post_coinit import misc
+from comtypes.errorinfo import ISupportErrorInfo
+
+
+class IMissing(IUnknown):
+    _iid_ = GUID.create_new()
+
+
+class Persist(COMObject):
+    _com_interfaces_ = [IPersist]
+
+
+CLSID = GUID.create_new()
+
+
+class Test_MultiQI(ut.TestCase):
+    def setUp(self):
+        self.calls = []
+        patcher = mock.patch.object(
+            misc, "_CoCreateInstanceEx", side_effect=self.co_create_instance_ex
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def co_create_instance_ex(self, rclsid, punkOuter, clsctx, pServerInfo, cmq, mqi):
+        # a stand-in for the activation, that queries a new object for all
+        # requested interfaces.
+        self.calls.append((clsctx, pServerInfo, cmq))
+        obj = Persist()
+        found = 0
+        for i in range(cmq):
+            p = c_void_p()
+            mqi[i].hr = obj.IUnknown_QueryInterface(None, mqi[i].pIID, pointer(p))
+            if mqi[i].hr == hresult.S_OK:
+                mqi[i].pItf = cast(p, POINTER(c_void_p))
+                found += 1
+        if not found:
+            raise OSError(hresult.E_NOINTERFACE)
+        return hresult.S_OK if found == cmq else hresult.CO_S_NOTALLINTERFACES
+
+    def test_create_object(self):
+        persist, errorinfo = comtypes.client.CreateObject(
+            CLSID, interfaces=[IPersist, ISupportErrorInfo]
+        )
+        self.assertEqual(self.calls, [(CLSCTX_SERVER, None, 2)])
+        self.assertIsInstance(persist, IPersist)
+        self.assertIsInstance(errorinfo, ISupportErrorInfo)
+        self.assertEqual(
+            persist.QueryInterface(IUnknown), errorinfo.QueryInterface(IUnknown)
+        )
+        self.assertEqual(persist.__dict__["__clsid"], str(CLSID))
+
+    def test_unsupported_interface(self):
+        persist, missing = comtypes.client.CreateObject(
+            CLSID, interfaces=[IPersist, IMissing]
+        )
+        self.assertIsInstance(persist, IPersist)
+        self.assertIsNone(missing)
+        with self.assertRaises(OSError):
+            comtypes.client.CreateObject(CLSID, interfaces=[IMissing])
+
+    def test_hresults(self):
+        results = comtypes.CoCreateInstanceMultiQI(CLSID, [IMissing, IPersist])
+        self.assertEqual(self.calls[0][0], CLSCTX_LOCAL_SERVER | CLSCTX_REMOTE_SERVER)
+        self.assertEqual([hr for _, hr in results], [hresult.E_NOINTERFACE, 0])
+        self.assertIsNone(results[0][0])
+        self.assertIsInstance(results[1][0], IPersist)
+
+    def test_server_info(self):
+        serverinfo = COSERVERINFO()
+        comtypes.client.CreateObject(
+            CLSID, pServerInfo=serverinfo, interfaces=[IPersist, IUnknown]
+        )
+        clsctx, pServerInfo, cmq = self.calls[0]
+        self.assertEqual(clsctx, CLSCTX_LOCAL_SERVER | CLSCTX_REMOTE_SERVER)
+        self.assertIs(pServerInfo, serverinfo)
+        self.assertEqual(cmq, 2)
+        comtypes.client.CreateObject(CLSID, machine="host", interfaces=[IPersist])
+        self.assertIsNotNone(self.calls[1][1])
+        with self.assertRaises(ValueError):
+            comtypes.client.CreateObject(
+                CLSID, machine="host", pServerInfo=serverinfo, interfaces=[IPersist]
+            )
+
+    def test_mutually_exclusive(self):
+        with self.assertRaises(ValueError):
+            comtypes.client.CreateObject(
+                CLSID, interface=IPersist, interfaces=[IPersist]
+            )
+        with self.assertRaises(ValueError):
+            comtypes.client.CreateObject(CLSID, dynamic=True, interfaces=[IPersist])
+        self.assertEqual(self.calls, [])
+
+    def test_single_interface(self):
+        persist = comtypes.CoCreateInstanceEx(CLSID, IPersist)
+        self.assertIsInstance(persist, IPersist)
+        self.assertEqual(self.calls[0][2], 1)
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -0,0 +1,271 @@
+import threading
+import time
+import unittest as ut
+from unittest import mock
+
+import comtypes.git
+from comtypes import GUID, COMError, COMObject, hresult
+from comtypes.automation import IDispatch
+from comtypes.client import ObjectPool, _pool
+
+
+class IServer(IDispatch):
+    _iid_ = GUID.create_new()
+    _methods_ = []
+    _disp_methods_ = []
+
+
+class Server(COMObject):
+    # a stand-in for an out-of-process automation server.
+    _com_interfaces_ = [IServer]
+
+    def __init__(self):
+        self.hung = False
+        self.probes = 0
+
+    def IDispatch_GetTypeInfoCount(self):
+        self.probes += 1
+        if self.hung:
+            raise COMError(hresult.RPC_E_SERVERFAULT, None, None)
+        return super().IDispatch_GetTypeInfoCount()
+
+
+class ServerFactory:
+    def __init__(self):
+        self.servers = []
+
+    def __call__(self):
+        server = Server()
+        self.servers.append(server)
+        return server.QueryInterface(IDispatch)
+
+
+class Test_ObjectPool(ut.TestCase):
+    def setUp(self):
+        self.factory = ServerFactory()
+
+    def pool(self, **kw):
+        kw.setdefault("marshal", False)
+        return ObjectPool(self.factory, **kw)
+
+    def test_checkout_checkin(self):
+        pool = self.pool(size=2)
+        first = pool.checkout()
+        second = pool.checkout()
+        self.assertNotEqual(first, second)
+        pool.checkin(first)
+        self.assertIs(pool.checkout(), first)
+        self.assertEqual(len(self.factory.servers), 2)
+        self.assertEqual(self.factory.servers[0].probes, 1)
+        self.assertEqual(
+            pool.stats(),
+            {
+                "hits": 1,
+                "spawns": 2,
+                "evictions": 0,
+                "terminations": 0,
+                "idle": 0,
+                "busy": 2,
+            },
+        )
+
+    def test_lease(self):
+        pool = self.pool(size=1)
+        with pool.lease() as obj:
+            pass
+        with pool.lease() as again:
+            self.assertIs(again, obj)
+        with self.assertRaises(COMError):
+            with pool.lease():
+                raise COMError(hresult.E_FAIL, None, None)
+        self.assertEqual(pool.stats()["evictions"], 1)
+
+    def test_timeout(self):
+        pool = self.pool(size=1)
+        obj = pool.checkout()
+        with self.assertRaises(TimeoutError):
+            pool.checkout(timeout=0.01)
+        threading.Timer(0.05, pool.checkin, (obj,)).start()
+        self.assertIs(pool.checkout(timeout=5), obj)
+
+    def test_reset(self):
+        resets = []
+        pool = self.pool(size=1, reset=resets.append)
+        obj = pool.checkout()
+        pool.checkin(obj)
+        self.assertEqual(resets, [obj])
+
+        def fail(obj):
+            raise COMError(hresult.E_FAIL, None, None)
+
+        pool.reset = fail
+        pool.checkin(pool.checkout())
+        self.assertEqual(pool.stats()["evictions"], 1)
+        self.assertIsNot(pool.checkout(), obj)
+
+    def test_max_uses(self):
+        closed = []
+        pool = self.pool(size=1, max_uses=2, close=closed.append)
+        obj = pool.checkout()
+        pool.checkin(obj)
+        pool.checkin(pool.checkout())
+        self.assertEqual(closed, [obj])
+        self.assertIsNot(pool.checkout(), obj)
+        self.assertEqual(pool.stats()["spawns"], 2)
+
+    def test_max_age(self):
+        pool = self.pool(size=1, max_age=0.01)
+        obj = pool.checkout()
+        pool.checkin(obj)
+        time.sleep(0.02)
+        self.assertIsNot(pool.checkout(), obj)
+        self.assertEqual(pool.stats()["evictions"], 1)
+
+    def test_hung_instance(self):
+        closed = []
+        pool = self.pool(size=1, close=closed.append, process_id=lambda obj: 1234)
+        obj = pool.checkout()
+        pool.checkin(obj)
+        self.factory.servers[0].hung = True
+        with mock.patch.object(_pool, "_terminate_process") as terminate:
+            self.assertIsNot(pool.checkout(), obj)
+        terminate.assert_called_once_with(1234)
+        self.assertEqual(closed, [])
+        stats = pool.stats()
+        self.assertEqual((stats["evictions"], stats["terminations"]), (1, 1))
+
+    def test_hook_timeout(self):
+        died = threading.Event()
+
+        def probe(obj):
+            # the call returns when the server process is terminated.
+            if not died.wait(5):
+                self.fail("the probe was not interrupted")
+            raise COMError(hresult.RPC_E_DISCONNECTED, None, None)
+
+        pool = self.pool(size=1, process_id=lambda obj: 1234, hook_timeout=0.01)
+        obj = pool.checkout()
+        pool.checkin(obj)
+        pool.probe = probe
+        with mock.patch.object(_pool, "_terminate_process") as terminate:
+            terminate.side_effect = lambda pid: died.set()
+            self.assertIsNot(pool.checkout(), obj)
+        terminate.assert_called_once_with(1234)
+        stats = pool.stats()
+        self.assertEqual((stats["evictions"], stats["terminations"]), (1, 1))
+
+    def test_hook_error(self):
+        pool = self.pool(size=1)
+        obj = pool.checkout()
+        pool.checkin(obj)
+        pool.probe = mock.Mock(side_effect=ValueError)
+        with self.assertRaises(ValueError):
+            pool.checkout()
+        pool.probe = None
+        pool.reset = mock.Mock(side_effect=ValueError)
+        with self.assertRaises(ValueError):
+            pool.checkin(pool.checkout(timeout=1))
+        self.assertIsNot(pool.checkout(timeout=1), obj)
+        stats = pool.stats()
+        self.assertEqual((stats["evictions"], stats["busy"]), (2, 1))
+
+    def test_shutdown(self):
+        closed = []
+        pool = self.pool(size=2, close=closed.append)
+        first, second = pool.checkout(), pool.checkout()
+        pool.checkin(first)
+        pool.shutdown()
+        self.assertEqual(closed, [first])
+        pool.checkin(second)
+        self.assertEqual(closed, [first, second])
+        with self.assertRaises(RuntimeError):
+            pool.checkout()
+
+    def test_checkin_unknown(self):
+        pool = self.pool(size=1)
+        with self.assertRaises(ValueError):
+            pool.checkin(self.factory())
+        obj = pool.checkout()
+        pool.checkin(obj)
+        with self.assertRaises(ValueError):
+            pool.checkin(obj)
+
+    def test_marshal(self):
+        cookies = {}
+
+        def register(obj, interface):
+            cookies[len(cookies) + 1] = obj
+            return len(cookies)
+
+        def get(cookie, interface):
+            return cookies[cookie].QueryInterface(interface)
+
+        with mock.patch.multiple(
+            comtypes.git,
+            RegisterInterfaceInGlobal=mock.Mock(side_effect=register),
+            GetInterfaceFromGlobal=mock.Mock(side_effect=get),
+            RevokeInterfaceFromGlobal=mock.Mock(side_effect=cookies.pop),
+        ):
+            pool = self.pool(size=1, marshal=True)
+            obj = pool.checkout()
+            pool.checkin(obj)
+            again = pool.checkout()
+            self.assertIs(type(again), type(obj))
+            self.assertEqual(pool.stats()["hits"], 1)
+            self.assertEqual(len(self.factory.servers), 1)
+            pool.checkin(again, discard=True)
+            self.assertEqual(cookies, {})
+
+            # instances that cannot be unmarshaled are evicted.
+            comtypes.git.GetInterfaceFromGlobal.side_effect = OSError
+            with self.assertRaises(OSError):
+                pool.checkout()
+            self.assertEqual(cookies, {})
+            comtypes.git.GetInterfaceFromGlobal.side_effect = get
+            obj = pool.checkout(timeout=1)
+            pool.checkin(obj)
+
+            def gone_once(cookie, interface):
+                comtypes.git.GetInterfaceFromGlobal.side_effect = get
+                raise OSError
+
+            comtypes.git.GetInterfaceFromGlobal.side_effect = gone_once
+            self.assertIsNot(pool.checkout(timeout=1), obj)
+            self.assertEqual(len(cookies), 1)
+
+    def test_shutdown_with_dead_instance(self):
+        cookies = {}
+        dead = set()
+        closed = []
+
+        def register(obj, interface):
+            cookies[len(cookies) + 1] = obj
+            return len(cookies)
+
+        def get(cookie, interface):
+            if cookie in dead:
+                raise COMError(hresult.RPC_E_DISCONNECTED, None, None)
+            return cookies[cookie].QueryInterface(interface)
+
+        with mock.patch.multiple(
+            comtypes.git,
+            RegisterInterfaceInGlobal=mock.Mock(side_effect=register),
+            GetInterfaceFromGlobal=mock.Mock(side_effect=get),
+            RevokeInterfaceFromGlobal=mock.Mock(side_effect=cookies.pop),
+        ):
+            pool = self.pool(size=3, marshal=True, close=closed.append)
+            objs = [pool.checkout() for _ in range(3)]
+            for obj in objs:
+                pool.checkin(obj)
+            dead.add(1)
+            with self.assertLogs("comtypes.client._pool", "WARNING"):
+                pool.shutdown()
+        self.assertEqual(cookies, {})
+        self.assertEqual(len(closed), 2)
+        stats = pool.stats()
+        self.assertEqual((stats["evictions"], stats["idle"]), (3, 0))
+        self.assertEqual(pool._count, 0)
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -0,0 +1,78 @@
+import gc
+import unittest as ut
+
+from comtypes import (
+    GUID,
+    COMError,
+    COMObject,
+    IPersist,
+    IUnknown,
+    enable_qi_cache,
+    hresult,
+)
+from comtypes.errorinfo import ISupportErrorInfo
+
+
+class IMissing(IUnknown):
+    _iid_ = GUID.create_new()
+
+
+class CountingObject(COMObject):
+    # a stand-in that counts the QueryInterface calls it receives.
+    _com_interfaces_ = [IPersist]
+
+    def __init__(self):
+        self.queries = 0
+
+    def IUnknown_QueryInterface(self, this, riid, ppvObj):
+        self.queries += 1
+        return super().IUnknown_QueryInterface(this, riid, ppvObj)
+
+
+class Test_QueryInterfaceCache(ut.TestCase):
+    def setUp(self):
+        self.obj = CountingObject()
+        self.ptr = self.obj.QueryInterface(IUnknown)
+        self.obj.queries = 0
+
+    def test_uncached(self):
+        for _ in range(10):
+            self.ptr.QueryInterface(IPersist)
+        self.assertEqual(self.obj.queries, 10)
+
+    def test_cached(self):
+        enable_qi_cache(self.ptr)
+        results = [self.ptr.QueryInterface(IPersist) for _ in range(10)]
+        self.assertEqual(self.obj.queries, 1)
+        self.assertTrue(all(p is results[0] for p in results))
+        self.ptr.QueryInterface(ISupportErrorInfo)
+        self.ptr.QueryInterface(ISupportErrorInfo)
+        self.assertEqual(self.obj.queries, 2)
+        # one reference for 'self.ptr', one per cached interface.
+        self.assertEqual(self.obj._refcnt.value, 3)
+
+    def test_identity(self):
+        enable_qi_cache(self.ptr)
+        punk = self.ptr.QueryInterface(IPersist).QueryInterface(IUnknown)
+        self.assertEqual(punk, self.ptr.QueryInterface(IUnknown))
+
+    def test_failures_are_not_cached(self):
+        enable_qi_cache(self.ptr)
+        for _ in range(2):
+            with self.assertRaises(COMError) as cm:
+                self.ptr.QueryInterface(IMissing)
+            self.assertEqual(cm.exception.hresult, hresult.E_NOINTERFACE)
+        self.assertEqual(self.obj.queries, 2)
+
+    def test_release(self):
+        enable_qi_cache(self.ptr)
+        self.ptr.QueryInterface(IPersist)
+        self.ptr.QueryInterface(ISupportErrorInfo)
+        del self.ptr
+        gc.collect()
+        self.assertEqual(self.obj._refcnt.value, 0)
+        self.assertNotIn(self.obj, COMObject._instances_)
+
+
+if __name__ == "__main__":
+    ut.main()
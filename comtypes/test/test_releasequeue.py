@@ -0,0 +1,156 @@
+import gc
+import threading
+import unittest as ut
+from ctypes import POINTER, cast
+
+from comtypes import COMObject, IPersist, messageloop, releasequeue
+from comtypes._post_coinit.unknwn import _compointer_base, _release_queues
+from comtypes.releasequeue import ReleaseQueue
+
+
+class Persist(COMObject):
+    _com_interfaces_ = [IPersist]
+
+
+class Test_ReleaseQueue(ut.TestCase):
+    def setUp(self):
+        self.obj = Persist()
+
+    def test_deferred(self):
+        with ReleaseQueue() as queue:
+            ptr = self.obj.QueryInterface(IPersist)
+            ptr.QueryInterface(IPersist)  # the result is dropped
+            self.assertEqual(self.obj._refcnt.value, 2)
+            self.assertEqual(queue.pending, 1)
+            del ptr
+            self.assertEqual(self.obj._refcnt.value, 2)
+            self.assertEqual(queue.flush(), 2)
+            self.assertEqual(self.obj._refcnt.value, 0)
+        self.assertEqual((queue.flushes, queue.released), (1, 2))
+        self.assertGreaterEqual(queue.max_flush_time, 0)
+        self.assertLessEqual(queue.max_flush_time, queue.flush_time)
+
+    def test_threshold(self):
+        with ReleaseQueue(threshold=3) as queue:
+            ptrs = [self.obj.QueryInterface(IPersist) for _ in range(5)]
+            del ptrs[:2]
+            self.assertEqual(queue.pending, 2)
+            del ptrs[0]
+            self.assertEqual(queue.pending, 0)
+            self.assertEqual(self.obj._refcnt.value, 2)
+            self.assertEqual(queue.released, 3)
+
+    def test_uninstall(self):
+        queue = ReleaseQueue()
+        queue.install()
+        self.assertIs(_release_queues[threading.get_ident()], queue)
+        self.assertIn(queue.flush, messageloop._messageloop._idle_handlers)
+        with self.assertRaises(RuntimeError):
+            ReleaseQueue().install()
+        ptr = self.obj.QueryInterface(IPersist)
+        ptr.QueryInterface(IPersist)
+        queue.uninstall()
+        self.assertEqual(self.obj._refcnt.value, 1)
+        self.assertNotIn(threading.get_ident(), _release_queues)
+        self.assertNotIn(queue.flush, messageloop._messageloop._idle_handlers)
+        # releases are no longer deferred
+        del ptr
+        self.assertEqual(queue.pending, 0)
+        self.assertEqual(self.obj._refcnt.value, 0)
+
+    def test_other_threads(self):
+        with ReleaseQueue() as queue:
+            ptr = self.obj.QueryInterface(IPersist)
+            # the queue only releases in its own thread.
+            t = threading.Thread(target=queue.flush)
+            t.start()
+            t.join()
+            # pointers owned by other threads are released immediately.
+            t = threading.Thread(target=ptr.QueryInterface, args=(IPersist,))
+            t.start()
+            t.join()
+            self.assertEqual(self.obj._refcnt.value, 1)
+            del ptr
+            self.assertEqual(queue.pending, 1)
+        self.assertEqual(self.obj._refcnt.value, 0)
+
+    def test_finalized_in_other_thread(self):
+        with ReleaseQueue() as queue:
+            ptrs = [self.obj.QueryInterface(IPersist)]
+            # the pointer is queued for the thread that owns it.
+            t = threading.Thread(target=ptrs.clear)
+            t.start()
+            t.join()
+            self.assertEqual(queue.pending, 1)
+            self.assertEqual(self.obj._refcnt.value, 1)
+            self.assertEqual(queue.flush(), 1)
+        self.assertEqual(self.obj._refcnt.value, 0)
+
+    def test_cast(self):
+        with ReleaseQueue() as queue:
+            ptr = self.obj.QueryInterface(IPersist)
+            ptrs = [cast(ptr, POINTER(IPersist))]
+            ptrs[0].AddRef()  # cast does not
+            # cast makes a reference cycle between ptr and its result.
+            del ptr
+
+            def collect():
+                ptrs.clear()
+                gc.collect()
+
+            t = threading.Thread(target=collect)
+            t.start()
+            t.join()
+            self.assertEqual(queue.pending, 2)
+            self.assertEqual(self.obj._refcnt.value, 2)
+        self.assertEqual(self.obj._refcnt.value, 0)
+
+    def test_owners_only_recorded_while_installed(self):
+        self.assertNotIn("__init__", vars(_compointer_base))
+        with ReleaseQueue():
+            self.assertIn("__init__", vars(_compointer_base))
+            ptr = self.obj.QueryInterface(IPersist)
+            self.assertEqual(ptr.__dict__["__owner_thread"], threading.get_ident())
+        self.assertNotIn("__init__", vars(_compointer_base))
+        self.assertNotIn("__owner_thread", self.obj.QueryInterface(IPersist).__dict__)
+
+    def test_created_before_install(self):
+        ptr = self.obj.QueryInterface(IPersist)
+        with ReleaseQueue() as queue:
+            del ptr
+            self.assertEqual(queue.pending, 0)
+            self.assertEqual(self.obj._refcnt.value, 0)
+
+    def test_gc_callback(self):
+        if releasequeue._gc_callback in gc.callbacks:
+            gc.callbacks.remove(releasequeue._gc_callback)
+        queue = ReleaseQueue()
+        self.assertNotIn(releasequeue._gc_callback, gc.callbacks)
+        with queue:
+            self.assertIn(releasequeue._gc_callback, gc.callbacks)
+
+    def test_custom_loop(self):
+        loop = messageloop._MessageLoop()
+        with ReleaseQueue(loop=loop) as queue:
+            self.assertEqual(loop._idle_handlers, [queue.flush])
+            self.assertNotIn(queue.flush, messageloop._messageloop._idle_handlers)
+        self.assertEqual(loop._idle_handlers, [])
+
+    def test_shutdown(self):
+        with ReleaseQueue() as queue:
+            ptr = self.obj.QueryInterface(IPersist)
+            ptr.QueryInterface(IPersist)
+            # the pending releases are dropped in other threads.
+            t = threading.Thread(target=queue._shutdown)
+            t.start()
+            t.join()
+            self.assertEqual(queue.pending, 0)
+            self.assertEqual(self.obj._refcnt.value, 2)
+            ptr.QueryInterface(IPersist)
+            queue._shutdown()
+            self.assertEqual(self.obj._refcnt.value, 2)
+            self.obj._refcnt.value -= 1  # the dropped release
+
+
+if __name__ == "__main__":
+    ut.main()
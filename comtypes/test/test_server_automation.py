@@ -0,0 +1,138 @@
+import unittest as ut
+from ctypes import HRESULT, POINTER, c_int
+
+from comtypes import COMMETHOD, GUID, COMError, IUnknown, hresult
+from comtypes.automation import VARIANT, IEnumVARIANT
+from comtypes.server.automation import PagedCOMCollection, VARIANTEnumerator
+
+
+def _enum(items, cache=False):
+    return VARIANTEnumerator(items, cache=cache).QueryInterface(IEnumVARIANT)
+
+
+class Test_VARIANTEnumerator(ut.TestCase):
+    def test_iterate(self):
+        self.assertEqual(list(_enum([1, 2, 3])), [1, 2, 3])
+        self.assertEqual(list(_enum([])), [])
+
+    def test_next(self):
+        for cache in (False, True):
+            with self.subTest(cache=cache):
+                enum = _enum(range(250), cache)
+                self.assertEqual(enum.Next(100), list(range(100)))
+                self.assertEqual(enum.Next(100), list(range(100, 200)))
+                self.assertEqual(enum.Next(100), list(range(200, 250)))
+                self.assertEqual(enum.Next(100), [])
+
+    def test_skip_and_reset(self):
+        enum = _enum([10, 20, 30])
+        enum.Skip(2)
+        self.assertEqual(enum.Next(1), (30, 1))
+        enum.Reset()
+        self.assertEqual(list(enum), [10, 20, 30])
+
+    def test_clone(self):
+        for cache in (False, True):
+            with self.subTest(cache=cache):
+                enum = _enum([1, 2, 3, 4], cache)
+                enum.Next(1)
+                clone = enum.Clone()
+                self.assertIsInstance(clone, type(enum))
+                # the clone starts at the same position, and advances
+                # independently.
+                self.assertEqual(clone.Next(2), [2, 3])
+                self.assertEqual(enum.Next(3), [2, 3, 4])
+                self.assertEqual(list(clone), [4])
+
+    def test_generator(self):
+        consumed = []
+
+        def gen():
+            for i in range(10):
+                consumed.append(i)
+                yield i
+
+        enum = _enum(gen())
+        self.assertEqual(enum.Next(3), [0, 1, 2])
+        self.assertEqual(consumed, [0, 1, 2])
+        clone = enum.Clone()
+        self.assertEqual(list(enum), list(range(3, 10)))
+        self.assertEqual(list(clone), list(range(3, 10)))
+        enum.Reset()
+        self.assertEqual(enum.Next(100), list(range(10)))
+        self.assertEqual(consumed, list(range(10)))
+
+
+class ICollection(IUnknown):
+    _iid_ = GUID.create_new()
+    _methods_ = [
+        COMMETHOD(["propget"], HRESULT, "Count", (["out", "retval"], POINTER(c_int))),
+        COMMETHOD(
+            ["propget"],
+            HRESULT,
+            "Item",
+            (["in"], VARIANT, "index"),
+            (["out", "retval"], POINTER(VARIANT)),
+        ),
+        COMMETHOD(
+            ["propget"],
+            HRESULT,
+            "_NewEnum",
+            (["out", "retval"], POINTER(POINTER(IUnknown))),
+        ),
+    ]
+
+
+class Rows(PagedCOMCollection):
+    _com_interfaces_ = [ICollection]
+    page_size = 10
+    max_pages = 3
+
+
+class Test_PagedCOMCollection(ut.TestCase):
+    def setUp(self):
+        self.fetched = []
+
+    def fetch(self, offset, count):
+        self.fetched.append((offset, count))
+        return range(offset, offset + count)
+
+    def test_count(self):
+        coll = Rows(self.fetch, 10_000_000).QueryInterface(ICollection)
+        self.assertEqual(coll.Count, 10_000_000)
+        self.assertEqual(self.fetched, [])
+
+    def test_item(self):
+        coll = Rows(self.fetch, 95).QueryInterface(ICollection)
+        self.assertEqual(coll.Item[42], 42)
+        self.assertEqual(coll.Item[43], 43)
+        self.assertEqual(coll.Item[94], 94)
+        self.assertEqual(self.fetched, [(40, 10), (90, 5)])
+        with self.assertRaises(COMError) as cm:
+            coll.Item[95]
+        self.assertEqual(cm.exception.hresult, hresult.DISP_E_BADINDEX)
+
+    def test_enumerate(self):
+        coll = Rows(self.fetch, 95).QueryInterface(ICollection)
+        enum = coll._NewEnum.QueryInterface(IEnumVARIANT)
+        self.assertEqual(enum.Next(25), list(range(25)))
+        self.assertEqual(list(enum), list(range(25, 95)))
+        self.assertEqual(self.fetched, [(i, 10) for i in range(0, 90, 10)] + [(90, 5)])
+
+    def test_pages_are_evicted(self):
+        coll = Rows(self.fetch, 1000)
+        items = coll._items
+        for start in range(0, 1000, 7):
+            expected = list(range(start, min(start + 7, 1000)))
+            self.assertEqual(items.values(start, 7), expected)
+            self.assertLessEqual(len(items._pages), Rows.max_pages)
+        self.assertEqual(len(self.fetched), 100)
+        # the most recently used pages are kept.
+        self.assertEqual(list(items._pages), [97, 98, 99])
+        items.values(985, 1)
+        self.assertEqual(list(items._pages), [97, 99, 98])
+        self.assertEqual(len(self.fetched), 100)
+
+
+if __name__ == "__main__":
+    ut.main()
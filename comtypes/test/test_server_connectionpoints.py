@@ -0,0 +1,336 @@
+import itertools
+import threading
+import unittest as ut
+from ctypes import pointer
+from ctypes.wintypes import DWORD
+from unittest import mock
+
+import comtypes.git
+from comtypes import (
+    DISPMETHOD,
+    GUID,
+    COMObject,
+    IUnknown,
+    ReturnHRESULT,
+    dispid,
+    hresult,
+)
+from comtypes.automation import IDispatch
+from comtypes.server.connectionpoints import (
+    BLOCK,
+    COALESCE,
+    DROP_OLDEST,
+    ConnectableObjectMixin,
+    ConnectionPointImpl,
+    EventDispatcher,
+)
+
+
+class IEvents(IDispatch):
+    _iid_ = GUID.create_new()
+    _methods_ = []
+    _disp_methods_ = [
+        DISPMETHOD([dispid(1)], None, "Fired", ([], int, "a"), ([], int, "b")),
+    ]
+
+
+class Sink(COMObject):
+    _com_interfaces_ = [IEvents]
+
+    def __init__(self, hr=None):
+        super().__init__()
+        self.received = []
+        self.hr = hr
+
+    def Fired(self, a, b):
+        self.received.append((a, b))
+        if self.hr is not None:
+            raise ReturnHRESULT(self.hr, "failed")
+
+
+class Test_ConnectionPointImpl(ut.TestCase):
+    def setUp(self):
+        self.typeinfo = mock.Mock()
+        self.typeinfo.GetIDsOfNames.return_value = [1]
+        self.cp = ConnectionPointImpl(IEvents, self.typeinfo)
+
+    def advise(self, sink):
+        cookie = DWORD()
+        punk = sink.QueryInterface(IUnknown)
+        hr = self.cp.IConnectionPoint_Advise(None, punk, pointer(cookie))
+        self.assertEqual(hr, hresult.S_OK)
+        return cookie.value
+
+    def test_many_sinks(self):
+        sinks = [Sink() for _ in range(50)]
+        for sink in sinks:
+            self.advise(sink)
+        for i in range(10):
+            self.cp._call_sinks("Fired", i, -i)
+        for sink in sinks:
+            self.assertEqual(sink.received, [(i, -i) for i in range(10)])
+        self.typeinfo.GetIDsOfNames.assert_called_once_with("Fired")
+
+    def test_failing_sinks(self):
+        sinks = [
+            Sink(),
+            Sink(hresult.E_FAIL),
+            Sink(hresult.RPC_S_SERVER_UNAVAILABLE),
+            Sink(hresult.RPC_E_DISCONNECTED),
+            Sink(),
+        ]
+        for sink in sinks:
+            self.advise(sink)
+        with self.assertLogs("comtypes.server.connectionpoints", "WARNING"):
+            self.cp._call_sinks("Fired", 1, 2)
+        with self.assertLogs("comtypes.server.connectionpoints", "WARNING"):
+            self.cp._call_sinks("Fired", 3, 4)
+        self.assertEqual(sinks[0].received, [(1, 2), (3, 4)])
+        self.assertEqual(sinks[1].received, [(1, 2), (3, 4)])
+        # dead sinks are removed after the first failure.
+        self.assertEqual(sinks[2].received, [(1, 2)])
+        self.assertEqual(sinks[3].received, [(1, 2)])
+        self.assertEqual(sinks[4].received, [(1, 2), (3, 4)])
+        self.assertEqual(len(self.cp._connections), 3)
+
+    def test_unadvise(self):
+        first, second = Sink(), Sink()
+        cookie = self.advise(first)
+        self.advise(second)
+        self.assertEqual(self.cp.IConnectionPoint_Unadvise(None, cookie), hresult.S_OK)
+        self.cp._call_sinks("Fired", 1, 2)
+        self.assertEqual(first.received, [])
+        self.assertEqual(second.received, [(1, 2)])
+
+
+class FakeConnectionPoint:
+    """Records the delivered events; delivering the 'Hold' event blocks
+    until `release` is set.
+    """
+
+    _sink_interface = IEvents
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.delivered = []
+        self.threads = set()
+        self.holding = threading.Event()
+        self.release = threading.Event()
+
+    def _fire(self, connections, name, args, kw):
+        if name == "Hold":
+            self.holding.set()
+            self.release.wait(10)
+        self.delivered.append((name,) + args)
+        self.threads.add(threading.get_ident())
+        return []
+
+
+class Test_EventDispatcher(ut.TestCase):
+    def create(self, maxsize, policy):
+        dispatcher = EventDispatcher(maxsize, policy)
+        self.addCleanup(dispatcher.shutdown)
+        cp = FakeConnectionPoint()
+        self.addCleanup(cp.release.set)
+        return dispatcher, cp, dispatcher.queue(cp)
+
+    def hold(self, cp, queue):
+        queue.put("Hold", (), {})
+        self.assertTrue(cp.holding.wait(10))
+
+    def test_order(self):
+        dispatcher, cp, queue = self.create(10, BLOCK)
+        for i in range(1000):
+            queue.put("Changed", (i,), {})
+        self.assertTrue(dispatcher.flush(10))
+        self.assertEqual(cp.delivered, [("Changed", i) for i in range(1000)])
+        self.assertEqual((queue.depth, queue.dropped, queue.coalesced), (0, 0, 0))
+
+    def test_block(self):
+        dispatcher, cp, queue = self.create(2, BLOCK)
+        self.hold(cp, queue)
+        queue.put("A", (1,), {})
+        queue.put("A", (2,), {})
+        thread = threading.Thread(target=queue.put, args=("A", (3,), {}))
+        thread.start()
+        thread.join(0.1)
+        self.assertTrue(thread.is_alive())
+        self.assertEqual(queue.depth, 2)
+        cp.release.set()
+        thread.join(10)
+        self.assertTrue(dispatcher.flush(10))
+        self.assertEqual(cp.delivered, [("Hold",), ("A", 1), ("A", 2), ("A", 3)])
+
+    def test_drop_oldest(self):
+        dispatcher, cp, queue = self.create(2, DROP_OLDEST)
+        self.hold(cp, queue)
+        for i in range(5):
+            queue.put("A", (i,), {})
+        self.assertEqual((queue.depth, queue.dropped), (2, 3))
+        cp.release.set()
+        self.assertTrue(dispatcher.flush(10))
+        self.assertEqual(cp.delivered, [("Hold",), ("A", 3), ("A", 4)])
+
+    def test_coalesce(self):
+        dispatcher, cp, queue = self.create(2, COALESCE)
+        self.hold(cp, queue)
+        queue.put("Changed", (1,), {})
+        queue.put("Other", (), {})
+        queue.put("Changed", (2,), {})
+        queue.put("Changed", (3,), {})
+        self.assertEqual((queue.depth, queue.coalesced, queue.dropped), (2, 2, 0))
+        # a full queue drops the oldest event of another name.
+        queue.put("Third", (), {})
+        self.assertEqual((queue.depth, queue.dropped), (2, 1))
+        cp.release.set()
+        self.assertTrue(dispatcher.flush(10))
+        self.assertEqual(cp.delivered, [("Hold",), ("Changed", 3), ("Third",)])
+
+    def test_coalesce_key(self):
+        def by_target(name, args, kw):
+            return (name,) + args[:1]
+
+        dispatcher = EventDispatcher(10, COALESCE, by_target)
+        self.addCleanup(dispatcher.shutdown)
+        cp = FakeConnectionPoint()
+        self.addCleanup(cp.release.set)
+        queue = dispatcher.queue(cp)
+        self.hold(cp, queue)
+        queue.put("Changed", (1, "a"), {})
+        queue.put("Changed", (2, "b"), {})
+        queue.put("Changed", (1, "c"), {})
+        self.assertEqual((queue.depth, queue.coalesced), (2, 1))
+        cp.release.set()
+        self.assertTrue(dispatcher.flush(10))
+        self.assertEqual(
+            cp.delivered, [("Hold",), ("Changed", 2, "b"), ("Changed", 1, "c")]
+        )
+
+    def test_worker_per_apartment(self):
+        dispatcher = EventDispatcher()
+        self.addCleanup(dispatcher.shutdown)
+        cps = [FakeConnectionPoint() for _ in range(3)]
+        with mock.patch(
+            "comtypes.server.connectionpoints._current_apartment",
+            side_effect=[1, 2, 1],
+        ):
+            queues = [dispatcher.queue(cp) for cp in cps]
+        for queue in queues:
+            queue.put("A", (), {})
+        self.assertTrue(dispatcher.flush(10))
+        self.assertEqual(len(dispatcher._workers), 2)
+        self.assertEqual(cps[0].threads, cps[2].threads)
+        self.assertNotEqual(cps[0].threads, cps[1].threads)
+        self.assertNotIn(threading.get_ident(), cps[0].threads | cps[1].threads)
+
+    def test_shutdown(self):
+        dispatcher, cp, queue = self.create(100, BLOCK)
+        self.hold(cp, queue)
+        for i in range(10):
+            queue.put("A", (i,), {})
+        cp.release.set()
+        dispatcher.shutdown(10)
+        self.assertEqual(cp.delivered, [("Hold",)] + [("A", i) for i in range(10)])
+        with self.assertRaises(RuntimeError):
+            queue.put("A", (10,), {})
+
+    def test_sta_dispatches_calls_while_waiting(self):
+        # The sink lives in the apartment of the waiting thread, so the
+        # worker's call only returns when that thread pumps.
+        dispatcher, cp, queue = self.create(1, BLOCK)
+        pump = FakePump(cp.release)
+        with mock.patch.multiple(
+            "comtypes.server.connectionpoints",
+            _in_sta=mock.Mock(return_value=True),
+            _get_pump=mock.Mock(return_value=pump),
+        ):
+            self.hold(cp, queue)
+            queue.put("A", (1,), {})
+            # waits for room, dispatching the call in the meantime.
+            queue.put("A", (2,), {})
+            self.assertTrue(dispatcher.flush(10))
+            dispatcher.shutdown(10)
+        self.assertEqual(cp.delivered, [("Hold",), ("A", 1), ("A", 2)])
+        self.assertTrue(all(w.stopped for w in dispatcher._workers.values()))
+        self.assertGreater(pump.pumps, 0)
+        self.assertEqual(dispatcher._pumps, [])
+
+    def test_fire_event(self):
+        class Connectable(ConnectableObjectMixin):
+            _outgoing_interfaces_ = [IEvents]
+            _reg_typelib_ = ("{00000000-0000-0000-0000-000000000000}", 1, 0)
+            _event_dispatcher_ = EventDispatcher()
+
+        self.addCleanup(Connectable._event_dispatcher_.shutdown)
+        git = FakeGlobalInterfaceTable()
+        with mock.patch.multiple(
+            comtypes.git,
+            RegisterInterfaceInGlobal=git.register,
+            GetInterfaceFromGlobal=git.get,
+            RevokeInterfaceFromGlobal=git.revoke,
+        ):
+            with mock.patch(
+                "comtypes.server.connectionpoints.LoadRegTypeLib"
+            ) as LoadRegTypeLib:
+                typeinfo = LoadRegTypeLib.return_value.GetTypeInfoOfGuid.return_value
+                typeinfo.GetIDsOfNames.return_value = [1]
+                obj = Connectable()
+            sink = Sink()
+            cp = obj._ConnectableObjectMixin__connections[IEvents]
+            cookie = DWORD()
+            cp.IConnectionPoint_Advise(
+                None, sink.QueryInterface(IUnknown), pointer(cookie)
+            )
+            self.assertEqual(list(git.table), [1])
+            self.assertEqual(obj.Fire_Event(0, "Fired", 1, 2), [])
+            self.assertTrue(Connectable._event_dispatcher_.flush(10))
+            self.assertEqual(sink.received, [(1, 2)])
+            # the worker thread got the sink from the table.
+            self.assertEqual(len(git.threads), 1)
+            self.assertNotIn(threading.get_ident(), git.threads)
+            cp.IConnectionPoint_Unadvise(None, cookie.value)
+            self.assertEqual(git.table, {})
+            self.assertEqual(obj.Fire_Event(0, "Fired", 3, 4), [])
+            self.assertTrue(Connectable._event_dispatcher_.flush(10))
+        self.assertEqual(sink.received, [(1, 2)])
+
+
+class FakePump:
+    """An EventPump whose waits dispatch the call that sets `incoming`."""
+
+    def __init__(self, incoming):
+        self.incoming = incoming
+        self.pumps = 0
+        self._wakeup = threading.Event()
+
+    def pump(self, timeout):
+        self.pumps += 1
+        self.incoming.set()
+        self._wakeup.wait(timeout)
+        self._wakeup.clear()
+
+    def wakeup(self):
+        self._wakeup.set()
+
+
+class FakeGlobalInterfaceTable:
+    def __init__(self):
+        self.table = {}
+        self.threads = set()
+        self._cookies = itertools.count(1)
+
+    def register(self, obj, interface):
+        cookie = next(self._cookies)
+        self.table[cookie] = obj
+        return cookie
+
+    def get(self, cookie, interface):
+        self.threads.add(threading.get_ident())
+        return self.table[cookie].QueryInterface(interface)
+
+    def revoke(self, cookie):
+        del self.table[cookie]
+
+
+if __name__ == "__main__":
+    ut.main()
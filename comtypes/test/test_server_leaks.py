@@ -0,0 +1,75 @@
+import gc
+import io
+import unittest as ut
+from unittest import mock
+
+from comtypes import COMObject, IPersist
+from comtypes.server.leaks import LeakTracker
+
+tracker = LeakTracker()
+
+
+class Persist(COMObject):
+    _com_interfaces_ = [IPersist]
+    _com_leak_tracker_ = tracker
+
+
+def create_persist():
+    return Persist()
+
+
+class Test_LeakTracker(ut.TestCase):
+    def tearDown(self):
+        tracker._allocations.clear()
+
+    def test_untracked(self):
+        class Untracked(COMObject):
+            _com_interfaces_ = [IPersist]
+
+        Untracked()
+        self.assertEqual(tracker.survivors(include_unreferenced=True), [])
+
+    def test_survivors(self):
+        obj = create_persist()
+        self.assertEqual(tracker.survivors(), [])
+        ptr = obj.QueryInterface(IPersist)
+        ((survivor, refcnt, stack),) = tracker.survivors()
+        self.assertIs(survivor, obj)
+        self.assertEqual(refcnt, 1)
+        self.assertEqual(stack[-1].name, "create_persist")
+        self.assertEqual(stack[-2].name, "test_survivors")
+        del ptr
+        self.assertEqual(tracker.survivors(), [])
+        self.assertEqual(len(tracker.survivors(include_unreferenced=True)), 1)
+
+    def test_objects_are_not_kept_alive(self):
+        create_persist()
+        gc.collect()
+        self.assertEqual(tracker.survivors(include_unreferenced=True), [])
+
+    def test_report(self):
+        self.assertEqual(tracker.report(), "")
+        ptrs = [create_persist().QueryInterface(IPersist) for _ in range(3)]
+        ptrs.append(Persist().QueryInterface(IPersist))
+        ptrs.append(ptrs[-1].QueryInterface(IPersist))
+        lines = tracker.report().splitlines()
+        self.assertEqual(lines[0], "4 live COM objects from 2 allocation sites")
+        self.assertEqual(lines[1], "3 x Persist (reference counts: [1, 1, 1])")
+        self.assertIn("create_persist", tracker.report())
+        self.assertIn("1 x Persist (reference counts: [2])", lines)
+
+    def test_report_at_exit(self):
+        with mock.patch("atexit.register") as register:
+            output = io.StringIO()
+            tracker.report_at_exit(output)
+            tracker.report_at_exit(output)
+        self.assertEqual(register.call_count, 1)
+        (dump,) = register.call_args.args
+        ptr = create_persist().QueryInterface(IPersist)
+        dump()
+        self.assertTrue(output.getvalue().startswith("1 live COM objects"))
+        del ptr
+
+
+if __name__ == "__main__":
+    ut.main()
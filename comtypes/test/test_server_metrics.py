@@ -0,0 +1,163 @@
+import json
+import os
+import tempfile
+import time
+import unittest as ut
+from ctypes import pointer
+
+from comtypes import (
+    DISPMETHOD,
+    GUID,
+    COMError,
+    COMObject,
+    IPersist,
+    ReturnHRESULT,
+    dispid,
+    hresult,
+)
+from comtypes.automation import DISPATCH_METHOD, DISPPARAMS, VARIANT, IDispatch
+from comtypes.server.metrics import MethodMetrics
+
+
+class Test_MethodMetrics(ut.TestCase):
+    def test_wrap(self):
+        metrics = MethodMetrics()
+
+        def impl(this, value):
+            return value
+
+        impl.has_outargs = True
+        wrapped = metrics.wrap(impl, "IFoo", "Bar")
+        self.assertTrue(wrapped.has_outargs)
+        self.assertEqual(wrapped(None, hresult.S_OK), hresult.S_OK)
+        self.assertEqual(wrapped(None, hresult.E_NOTIMPL), hresult.E_NOTIMPL)
+        self.assertEqual(wrapped(None, hresult.E_NOTIMPL), hresult.E_NOTIMPL)
+        self.assertEqual(wrapped(None, 3), 3)  # a reference count
+        stats = metrics.snapshot()["IFoo.Bar"]
+        self.assertEqual(stats["calls"], 4)
+        self.assertEqual(stats["errors"], 2)
+        self.assertEqual(stats["hresults"], {"0x80004001": 2})
+        self.assertGreaterEqual(stats["total_time"], 0)
+        self.assertLessEqual(stats["p50"], stats["p90"])
+        self.assertLessEqual(stats["p90"], stats["p99"])
+        self.assertLessEqual(stats["p99"], stats["max"])
+
+    def test_uncalled(self):
+        metrics = MethodMetrics()
+        metrics.wrap(lambda: None, "IFoo", "Bar")
+        stats = metrics.snapshot()["IFoo.Bar"]
+        self.assertEqual(stats["calls"], 0)
+        self.assertIsNone(stats["p50"])
+        self.assertIsNone(stats["max"])
+
+    def test_percentiles_of_latest_samples(self):
+        metrics = MethodMetrics(max_samples=10)
+        wrapped = metrics.wrap(lambda: hresult.S_OK, "IFoo", "Bar")
+        for _ in range(100):
+            wrapped()
+        self.assertEqual(metrics.snapshot()["IFoo.Bar"]["calls"], 100)
+        self.assertEqual(len(metrics._stats["IFoo.Bar"].samples), 10)
+
+    def test_reset(self):
+        metrics = MethodMetrics()
+        wrapped = metrics.wrap(lambda: hresult.E_FAIL, "IFoo", "Bar")
+        wrapped()
+        metrics.reset()
+        stats = metrics.snapshot()["IFoo.Bar"]
+        self.assertEqual((stats["calls"], stats["errors"]), (0, 0))
+        self.assertEqual(stats["hresults"], {})
+
+    def test_dump(self):
+        metrics = MethodMetrics()
+        metrics.wrap(lambda: hresult.S_OK, "IFoo", "Bar")()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "metrics.json")
+            metrics.dump(path)
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(json.load(f), metrics.snapshot())
+
+    def test_start_dumping(self):
+        metrics = MethodMetrics()
+        metrics.wrap(lambda: hresult.S_OK, "IFoo", "Bar")()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "metrics.json")
+            metrics.start_dumping(path, 0.01)
+            try:
+                with self.assertRaises(RuntimeError):
+                    metrics.start_dumping(path, 0.01)
+                for _ in range(500):
+                    if os.path.exists(path):
+                        break
+                    time.sleep(0.01)
+            finally:
+                metrics.stop_dumping()
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(json.load(f)["IFoo.Bar"]["calls"], 1)
+
+
+class IAdder(IDispatch):
+    _iid_ = GUID.create_new()
+    _disp_methods_ = [
+        DISPMETHOD([dispid(1)], VARIANT, "Add", ([], VARIANT, "a"), ([], VARIANT, "b")),
+    ]
+
+
+class Test_COMObject(ut.TestCase):
+    def test_vtable_calls(self):
+        class Persist(COMObject):
+            _com_interfaces_ = [IPersist]
+            _com_metrics_ = MethodMetrics()
+            fail = False
+
+            def IPersist_GetClassID(self):
+                if self.fail:
+                    raise ReturnHRESULT(hresult.E_INVALIDARG, "failed")
+                return GUID()
+
+        obj = Persist()
+        ptr = obj.QueryInterface(IPersist)
+        ptr.GetClassID()
+        obj.fail = True
+        with self.assertRaises(COMError):
+            ptr.GetClassID()
+        snapshot = Persist._com_metrics_.snapshot()
+        stats = snapshot["IPersist.GetClassID"]
+        self.assertEqual((stats["calls"], stats["errors"]), (2, 1))
+        self.assertEqual(stats["hresults"], {"0x80070057": 1})
+        # QueryInterface has called AddRef through the vtable, too.
+        stats = snapshot["IUnknown.AddRef"]
+        self.assertEqual((stats["calls"], stats["errors"]), (1, 0))
+
+    def test_dispatch_calls(self):
+        class Adder(COMObject):
+            _com_interfaces_ = [IAdder]
+            _com_metrics_ = MethodMetrics()
+
+            def Add(self, a, b):
+                return a + b
+
+        dp = DISPPARAMS()
+        dp.cArgs = 2
+        dp.rgvarg = (VARIANT * 2)(VARIANT(2), VARIANT(1))
+        result = VARIANT()
+        hr = Adder().IDispatch_Invoke(
+            None, 1, None, 0, DISPATCH_METHOD, pointer(dp), pointer(result), None, None
+        )
+        self.assertEqual(hr, hresult.S_OK)
+        self.assertEqual(result.value, 3)
+        stats = Adder._com_metrics_.snapshot()["IAdder.Add"]
+        self.assertEqual((stats["calls"], stats["errors"]), (1, 0))
+
+    def test_disabled(self):
+        class Adder(COMObject):
+            _com_interfaces_ = [IAdder]
+
+            def Add(self, a, b):
+                return a + b
+
+        impl = Adder()._dispimpl_[(1, DISPATCH_METHOD)]
+        self.assertEqual(impl.__name__, "call_without_this")
+
+
+if __name__ == "__main__":
+    ut.main()